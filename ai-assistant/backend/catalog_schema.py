@@ -0,0 +1,169 @@
+"""
+Catalog Table Definitions
+Shared description of the rules, practices and templates tables
+
+@author: Dr. Sarah Chen - Senior Backend/Systems Architect
+@architecture: Single source of truth for catalog columns, sort keys and write defaults
+@business_logic: PostgreSQL and the offline SQLite store must expose identical rows and ordering
+@testing: Covered through DatabaseService and SQLiteCatalogStore unit tests
+@integration: Imported by database_service and sqlite_store
+"""
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+# Marks a write column that has no default and must be supplied
+REQUIRED = object()
+
+# Catalog table definitions shared by list, pagination, projection and bulk
+# write queries ('jsonb' lists the JSONB columns). Every sort key is ordered
+# DESC so keyset pagination can use a single row comparison; nullable keys
+# are COALESCEd so the comparison is total.
+CATALOG_TABLES: Dict[str, Dict[str, Any]] = {
+    'rules': {
+        'name': 'rules',
+        'table': 'rules r',
+        'alias': 'r',
+        'id': 'rule_id',
+        'columns': [
+            'rule_id', 'category', 'title', 'description', 'severity',
+            'enforcement', 'examples', 'anti_patterns', 'violations_consequence',
+            'created_by', 'created_at', 'updated_at', 'active', 'priority', 'status'
+        ],
+        'jsonb': ['examples', 'anti_patterns'],
+        'sort': [
+            ("-(CASE UPPER(r.severity) WHEN 'CRITICAL' THEN 1 WHEN 'ERROR' THEN 2 "
+             "WHEN 'WARNING' THEN 3 WHEN 'INFO' THEN 4 ELSE 5 END)", 'int'),
+            ("COALESCE(r.created_at, '-infinity'::timestamp)", 'timestamp'),
+            ("r.rule_id", 'text'),
+        ],
+        'write_columns': [
+            ('rule_id', REQUIRED), ('category', 'general'), ('title', REQUIRED),
+            ('description', REQUIRED), ('severity', REQUIRED), ('enforcement', REQUIRED),
+            ('examples', []), ('anti_patterns', []), ('violations_consequence', ''),
+            ('created_by', 'system'), ('active', True), ('priority', 0),
+        ],
+    },
+    'practices': {
+        'name': 'practices',
+        'table': 'practices p',
+        'alias': 'p',
+        'id': 'practice_id',
+        'columns': [
+            'practice_id', 'category', 'title', 'description', 'benefits',
+            'implementation_guide', 'anti_patterns', 'references', 'examples',
+            'effectiveness_score', 'adoption_rate', 'created_at', 'is_active', 'is_required',
+            'priority'
+        ],
+        'jsonb': ['benefits', 'anti_patterns', 'references', 'examples'],
+        'sort': [
+            ("COALESCE(p.effectiveness_score, -1)", 'numeric'),
+            ("COALESCE(p.adoption_rate, -1)", 'numeric'),
+            ("COALESCE(p.created_at, '-infinity'::timestamp)", 'timestamp'),
+            ("p.practice_id", 'text'),
+        ],
+        'write_columns': [
+            ('practice_id', REQUIRED), ('category', 'general'), ('title', REQUIRED),
+            ('description', REQUIRED), ('benefits', []), ('implementation_guide', ''),
+            ('anti_patterns', []), ('references', []), ('examples', []),
+            ('is_active', True), ('is_required', False), ('priority', None),
+        ],
+    },
+    'templates': {
+        'name': 'templates',
+        'table': 'templates t',
+        'alias': 't',
+        'id': 'template_id',
+        'columns': [
+            'template_id', 'name', 'description', 'category', 'template_content',
+            'variables', 'tags', 'usage_count', 'is_active', 'created_by', 'created_at'
+        ],
+        'jsonb': ['variables', 'tags', 'variables_detail'],
+        'sort': [
+            ("COALESCE(t.usage_count, 0)", 'int'),
+            ("COALESCE(t.created_at, '-infinity'::timestamp)", 'timestamp'),
+            ("t.template_id", 'text'),
+        ],
+        'write_columns': [
+            ('template_id', REQUIRED), ('name', REQUIRED), ('description', ''),
+            ('category', 'general'), ('template_content', REQUIRED), ('variables', []),
+            ('tags', []), ('is_active', True), ('created_by', 'system'),
+        ],
+    },
+}
+
+# Cursor token for a NULL timestamp sort key. PostgreSQL sorts those as
+# '-infinity', which asyncpg decodes as datetime.min; written out as
+# 0001-01-01 it would compare above -infinity and the next page would
+# repeat or skip rows.
+NO_TIMESTAMP = '-infinity'
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return NO_TIMESTAMP if value == datetime.min else value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _cursor_timestamp(value: str) -> Any:
+    return NO_TIMESTAMP if value == NO_TIMESTAMP else datetime.fromisoformat(value)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    payload = [_cursor_value(v) for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, key_types: List[str]) -> List[Any]:
+    """Decode an opaque cursor back into typed sort key values (NULL timestamps as NO_TIMESTAMP)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(key_types):
+            raise ValueError("cursor does not match sort key")
+        converters = {
+            'int': int,
+            'numeric': lambda v: Decimal(str(v)),
+            'timestamp': _cursor_timestamp,
+            'text': str,
+        }
+        return [converters[t](v) for v, t in zip(payload, key_types)]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+def projected_columns(kind: str, fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Validate a field projection against the column whitelist
+    
+    Returns None for "all columns", otherwise the identifier followed by the
+    requested columns without duplicates. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+    spec = CATALOG_TABLES[kind]
+    unknown = [f for f in fields if f not in spec['columns']]
+    if unknown:
+        raise ValueError(f"Unknown {kind} fields: {', '.join(unknown)}")
+    # Always return the identifier so clients can address the row
+    return list(dict.fromkeys([spec['id']] + list(fields)))
+
+
+def write_row(kind: str, record: Dict[str, Any]) -> tuple:
+    """Convert a record to a tuple in write_columns order (KeyError if required field missing)"""
+    row = []
+    for column, default in CATALOG_TABLES[kind]['write_columns']:
+        if default is REQUIRED:
+            value = record[column]
+        else:
+            value = record.get(column)
+            if value is None:
+                value = default
+        row.append(value)
+    return tuple(row)
@@ -1,18 +1,20 @@
 """
-Circuit Breaker Pattern for Database Connections
-Prevents repeated connection attempts when database is down
+Circuit Breaker Pattern for External Dependencies
+Prevents repeated calls to a dependency (PostgreSQL, Claude, agent terminals) while it is down
 
 @author: Dr. Sarah Chen - Senior Backend/Systems Architect
-@architecture: Resilience Pattern - Circuit Breaker
+@architecture: Resilience Pattern - Circuit Breaker with sliding-window failure rate
 @business_logic: Prevents cascading failures by failing fast when external services are unavailable
 @testing: Unit tests required for state transitions and timeout behavior
-@integration: Used by DatabaseService to manage PostgreSQL connection attempts
+@integration: One breaker per dependency via the circuit_breakers registry; DatabaseService owns the 'database' breaker
 """
 
 import asyncio
+import threading
 import time
+from collections import deque
 from enum import Enum
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Deque, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,143 +24,377 @@ class CircuitState(Enum):
     OPEN = "open"      # Circuit broken, fast fail
     HALF_OPEN = "half_open"  # Testing if service recovered
 
+# Numeric state codes for metrics gauges
+STATE_CODES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised instead of calling the dependency while the circuit rejects calls"""
+
+    def __init__(self, name: str, message: str, retry_after: float = 0):
+        super().__init__(message)
+        self.name = name
+        self.retry_after = retry_after
+
+
 class CircuitBreaker:
     """
     Circuit breaker implementation to prevent cascading failures
-    
+
     States:
-    - CLOSED: Normal operation, requests pass through
+    - CLOSED: Normal operation, requests pass through. Outcomes are recorded
+      in a sliding time window; the circuit opens when, within the window,
+      at least failure_threshold calls failed and the failure rate reaches
+      failure_rate_threshold, or the same holds for slow calls.
     - OPEN: Service is down, fail fast without attempting connection
-    - HALF_OPEN: Testing if service has recovered
+    - HALF_OPEN: Testing if service has recovered. Exactly one probe call is
+      admitted; concurrent callers fail fast until the probe finishes.
     """
-    
+
     def __init__(
         self,
         failure_threshold: int = 3,
         recovery_timeout: int = 30,
-        expected_exception: type = Exception
+        expected_exception: type = Exception,
+        name: str = "default",
+        window_seconds: int = 60,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        failure_result: Optional[Callable[[Any], bool]] = None
     ):
         """
         Initialize circuit breaker
-        
+
         Args:
-            failure_threshold: Number of failures before opening circuit
+            failure_threshold: Minimum failed (or slow) calls in the window before opening
             recovery_timeout: Seconds to wait before trying half-open
             expected_exception: Exception type to catch
+            name: Dependency name used in logs and metrics
+            window_seconds: Length of the sliding window of recorded outcomes
+            failure_rate_threshold: Fraction of failed calls in the window that opens the circuit
+            slow_call_duration: Calls taking longer than this many seconds count as slow (None disables)
+            slow_call_rate_threshold: Fraction of slow calls in the window that opens the circuit
+            failure_result: Optional predicate marking a returned value as a failure
         """
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
-        
+        self.name = name
+        self.window_seconds = window_seconds
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.failure_result = failure_result
+
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
         self.state = CircuitState.CLOSED
-        
+
+        # Sliding window as per-second buckets [second, calls, failures, slow]
+        # with running totals, so recording and evaluating are O(1) amortized
+        self._buckets: Deque[List[int]] = deque()
+        self._calls = 0
+        self._slow_calls = 0
+
+        # Half-open admits a single probe: asyncio lock for call_async,
+        # thread lock for the synchronous call()
+        self._probe_lock = asyncio.Lock()
+        self._probe_thread_lock = threading.Lock()
+        self.rejected_calls = 0
+        self.opened_count = 0
+
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """
         Call function through circuit breaker
-        
+
         Args:
             func: Function to call
             *args: Function arguments
             **kwargs: Function keyword arguments
-            
+
         Returns:
             Function result
-            
+
         Raises:
-            Exception: If circuit is open or function fails
+            CircuitBreakerOpenError: If circuit is open or a probe is already running
+            Exception: If function fails
         """
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-            else:
-                raise Exception(f"Circuit breaker is OPEN. Service unavailable for {self._time_until_retry():.0f} more seconds")
-        
-        try:
-            result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
-            self._on_failure()
-            raise
-            
+        self._before_call()
+
+        if self.state == CircuitState.HALF_OPEN:
+            if not self._probe_thread_lock.acquire(blocking=False):
+                raise self._reject("probe in progress")
+            try:
+                return self._execute(func, *args, probe=True, **kwargs)
+            finally:
+                self._probe_thread_lock.release()
+
+        return self._execute(func, *args, **kwargs)
+
     async def call_async(self, func: Callable, *args, **kwargs) -> Any:
         """
         Call async function through circuit breaker
-        
+
         Args:
             func: Async function to call
             *args: Function arguments
             **kwargs: Function keyword arguments
-            
+
         Returns:
             Function result
-            
+
         Raises:
-            Exception: If circuit is open or function fails
+            CircuitBreakerOpenError: If circuit is open or a probe is already running
+            Exception: If function fails
         """
-        if self.state == CircuitState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitState.HALF_OPEN
-                logger.info("Circuit breaker entering HALF_OPEN state")
-            else:
-                time_left = self._time_until_retry()
-                logger.warning(f"Circuit breaker is OPEN. Retry in {time_left:.0f} seconds")
-                raise Exception(f"Circuit breaker is OPEN. Service unavailable for {time_left:.0f} more seconds")
-        
+        return await self._call_async(func, args, kwargs, timed=True)
+
+    async def call_async_untimed(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Like call_async, but the call never counts as slow
+
+        For work whose duration grows with its input (bulk loads), where a
+        long call says nothing about the dependency's health. Failures
+        still count.
+        """
+        return await self._call_async(func, args, kwargs, timed=False)
+
+    async def _call_async(self, func: Callable, args: tuple, kwargs: dict, timed: bool) -> Any:
+        self._before_call()
+
+        if self.state == CircuitState.HALF_OPEN:
+            # locked() and the uncontended acquire below run without yielding,
+            # so only one coroutine can become the probe
+            if self._probe_lock.locked():
+                raise self._reject("probe in progress")
+            async with self._probe_lock:
+                return await self._execute_async(func, args, kwargs, probe=True, timed=timed)
+
+        return await self._execute_async(func, args, kwargs, timed=timed)
+
+    def _before_call(self):
+        """Fail fast while OPEN; move to HALF_OPEN once the recovery timeout has passed"""
+        if self.state != CircuitState.OPEN:
+            return
+        if self._should_attempt_reset():
+            self.state = CircuitState.HALF_OPEN
+            logger.info(f"Circuit breaker '{self.name}' entering HALF_OPEN state")
+        else:
+            raise self._reject()
+
+    def _reject(self, reason: Optional[str] = None) -> CircuitBreakerOpenError:
+        """Count and build the fast-fail error"""
+        self.rejected_calls += 1
+        time_left = self.time_until_retry()
+        if reason:
+            message = f"Circuit breaker is OPEN ({self.name}: {reason})"
+        else:
+            logger.warning(f"Circuit breaker '{self.name}' is OPEN. Retry in {time_left:.0f} seconds")
+            message = f"Circuit breaker is OPEN. Service unavailable for {time_left:.0f} more seconds"
+        return CircuitBreakerOpenError(self.name, message, time_left)
+
+    def _execute(self, func: Callable, *args, probe: bool = False, **kwargs) -> Any:
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except self.expected_exception:
+            self._record(False, time.monotonic() - started, probe)
+            raise
+        self._record(not self._is_failure_result(result), time.monotonic() - started, probe)
+        return result
+
+    async def _execute_async(self, func: Callable, args: tuple, kwargs: dict,
+                             probe: bool = False, timed: bool = True) -> Any:
+        started = time.monotonic() if timed else None
         try:
             result = await func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
-            self._on_failure()
+        except self.expected_exception:
+            self._record(False, self._elapsed(started), probe)
             raise
-            
+        self._record(not self._is_failure_result(result), self._elapsed(started), probe)
+        return result
+
+    @staticmethod
+    def _elapsed(started: Optional[float]) -> Optional[float]:
+        return time.monotonic() - started if started is not None else None
+
+    def _is_failure_result(self, result: Any) -> bool:
+        return self.failure_result is not None and bool(self.failure_result(result))
+
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to try recovery"""
         return (
             self.last_failure_time and
             time.time() - self.last_failure_time >= self.recovery_timeout
         )
-    
-    def _time_until_retry(self) -> float:
+
+    def time_until_retry(self) -> float:
         """Calculate seconds until retry is allowed"""
         if not self.last_failure_time:
             return 0
         elapsed = time.time() - self.last_failure_time
         return max(0, self.recovery_timeout - elapsed)
-        
-    def _on_success(self):
-        """Handle successful call"""
+
+    # ==================== SLIDING WINDOW ====================
+
+    def _expire(self, now: float):
+        """Drop buckets that fell out of the window"""
+        oldest = int(now) - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= oldest:
+            _, calls, failures, slow = self._buckets.popleft()
+            self._calls -= calls
+            self.failure_count -= failures
+            self._slow_calls -= slow
+
+    def _record(self, success: bool, duration: Optional[float], probe: bool = False):
+        """Record one call outcome (duration None: untimed) and apply the state transition"""
+        now = time.time()
+        slow = (self.slow_call_duration is not None and duration is not None
+                and duration > self.slow_call_duration)
+        if slow:
+            logger.warning(f"Circuit breaker '{self.name}' slow call: {duration:.2f}s")
+
         if self.state == CircuitState.HALF_OPEN:
-            logger.info("Circuit breaker recovered, entering CLOSED state")
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
-        
-    def _on_failure(self):
-        """Handle failed call"""
-        self.failure_count += 1
+            # The probe alone decides: healthy closes, failed or slow reopens.
+            # Calls admitted before the circuit opened are ignored.
+            if not probe:
+                return
+            if success and not slow:
+                logger.info(f"Circuit breaker '{self.name}' recovered, entering CLOSED state")
+                self._clear_window()
+                self.state = CircuitState.CLOSED
+            else:
+                self._open("half-open probe failed")
+            return
+
+        self._expire(now)
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        self._calls += 1
+        if not success:
+            bucket[2] += 1
+            self.failure_count += 1
+        if slow:
+            bucket[3] += 1
+            self._slow_calls += 1
+
+        if self.state != CircuitState.CLOSED:
+            return
+        if self._threshold_reached(self.failure_count, self.failure_rate_threshold):
+            self._open(f"{self.failure_count}/{self._calls} calls failed")
+        elif self._threshold_reached(self._slow_calls, self.slow_call_rate_threshold):
+            self._open(f"{self._slow_calls}/{self._calls} calls slow")
+        elif not success:
+            logger.warning(f"Circuit breaker '{self.name}' failure "
+                           f"{self.failure_count}/{self.failure_threshold} in window")
+
+    def _threshold_reached(self, count: int, rate_threshold: float) -> bool:
+        return (
+            count >= self.failure_threshold and
+            self._calls > 0 and
+            count / self._calls >= rate_threshold
+        )
+
+    def _open(self, reason: str):
+        """Trip the circuit; the recovery timeout counts from now"""
         self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
-            logger.error(f"Circuit breaker opened after {self.failure_count} failures")
-        else:
-            logger.warning(f"Circuit breaker failure {self.failure_count}/{self.failure_threshold}")
-            
+        self.state = CircuitState.OPEN
+        self.opened_count += 1
+        logger.error(f"Circuit breaker '{self.name}' opened: {reason}")
+
+    def _clear_window(self):
+        self._buckets.clear()
+        self._calls = 0
+        self.failure_count = 0
+        self._slow_calls = 0
+
     def get_state(self) -> dict:
         """Get current circuit breaker state"""
+        self._expire(time.time())
         return {
+            "name": self.name,
             "state": self.state.value,
             "failure_count": self.failure_count,
             "last_failure_time": self.last_failure_time,
-            "time_until_retry": self._time_until_retry() if self.state == CircuitState.OPEN else 0
+            "time_until_retry": self.time_until_retry() if self.state == CircuitState.OPEN else 0,
+            "window_seconds": self.window_seconds,
+            "calls_in_window": self._calls,
+            "failure_rate": self.failure_count / self._calls if self._calls else 0.0,
+            "slow_calls": self._slow_calls,
+            "slow_call_rate": self._slow_calls / self._calls if self._calls else 0.0,
+            "rejected_calls": self.rejected_calls,
+            "opened_count": self.opened_count,
+            "probe_in_flight": self._probe_lock.locked() or self._probe_thread_lock.locked()
         }
-        
+
     def reset(self):
         """Manually reset circuit breaker"""
-        self.failure_count = 0
+        self._clear_window()
         self.last_failure_time = None
         self.state = CircuitState.CLOSED
-        logger.info("Circuit breaker manually reset")
\ No newline at end of file
+        logger.info(f"Circuit breaker '{self.name}' manually reset")
+
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per external dependency
+
+    Breakers are created on first use with the given settings and shared by
+    every caller of that dependency, so a failing service is tripped once
+    for the whole process. State is exported for the metrics endpoints.
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **settings) -> CircuitBreaker:
+        """Return the breaker for a dependency, creating it with settings on first use"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name=name, **settings)
+                self._breakers[name] = breaker
+            return breaker
+
+    def register(self, name: str, breaker: CircuitBreaker) -> CircuitBreaker:
+        """Register an existing breaker (e.g. one owned by a service) under a dependency name"""
+        with self._lock:
+            breaker.name = name
+            self._breakers[name] = breaker
+            return breaker
+
+    def get_states(self) -> Dict[str, dict]:
+        """Detailed state of every registered breaker"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.get_state() for name, breaker in breakers}
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Numeric gauges per dependency for metrics export"""
+        metrics = {}
+        for name, state in self.get_states().items():
+            metrics[name] = {
+                "state": STATE_CODES[CircuitState(state["state"])],
+                "failure_rate": state["failure_rate"],
+                "slow_call_rate": state["slow_call_rate"],
+                "calls_in_window": state["calls_in_window"],
+                "rejected_calls": state["rejected_calls"],
+                "opened_count": state["opened_count"],
+            }
+        return metrics
+
+    def reset(self, name: Optional[str] = None):
+        """Reset one breaker, or all of them"""
+        with self._lock:
+            breakers = [self._breakers[name]] if name else list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
+
+
+# Global registry
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,243 @@
+"""
+Adaptive Concurrency Limiter for Upstream Model Calls
+Bulkhead in front of Claude so a traffic spike queues briefly or is shed instead of slowing everyone down
+
+@author: Dr. Sarah Chen - Senior Backend/Systems Architect
+@architecture: Resilience Pattern - Bulkhead with gradient-based adaptive limit
+@business_logic: Keeps upstream latency near its uncontended baseline; excess load waits in a
+                 bounded queue and is rejected quickly (429/503) once the queue is full
+@testing: Unit tests for admission, queueing, shedding and limit adaptation
+@integration: Used by /ai/execute and /ai/orchestrated in main.py; metrics in /metrics/performance
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when a call is shed instead of being admitted"""
+
+    def __init__(self, reason: str, status_code: int, retry_after: float):
+        super().__init__(f"Upstream concurrency limit reached ({reason})")
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Gradient-based concurrency limit with a bounded FIFO wait queue
+
+    Two exponentially weighted latency averages are kept: a long one (the
+    baseline) and a short one (current conditions). After every call the
+    limit moves towards limit * (baseline / current) + sqrt(limit): while
+    latency stays at baseline the limit grows by the sqrt(limit) headroom,
+    and as queueing inflates latency the gradient drops below 1 and the
+    limit shrinks. Timeouts count as drops and cut the limit
+    multiplicatively. The limit only grows while at least half of it is in
+    use, so an idle service does not drift to max_limit.
+    """
+
+    def __init__(
+        self,
+        name: str = "upstream",
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        max_queue: int = 50,
+        queue_timeout: float = 10.0,
+        smoothing: float = 0.2,
+        backoff_ratio: float = 0.9,
+        short_window: int = 10,
+        long_window: int = 500,
+        drop_exceptions: Tuple[type, ...] = (asyncio.TimeoutError,)
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            name: Name used in logs and metrics
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            max_queue: Callers allowed to wait for a slot; beyond this calls are shed (429)
+            queue_timeout: Seconds a caller may wait for a slot before being shed (503)
+            smoothing: Weight of each new limit estimate
+            backoff_ratio: Multiplier applied to the limit when a call is dropped
+            short_window: Samples in the short (current) latency average
+            long_window: Samples in the long (baseline) latency average
+            drop_exceptions: Exceptions from the guarded call that count as drops
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self.drop_exceptions = drop_exceptions
+        self._short_alpha = 2 / (short_window + 1)
+        self._long_alpha = 2 / (long_window + 1)
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self._short_rtt: Optional[float] = None
+        self._long_rtt: Optional[float] = None
+        self._recent: Deque[float] = deque(maxlen=200)
+
+        self.accepted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+
+    @property
+    def limit(self) -> int:
+        """Current whole-number concurrency limit"""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    # ==================== ADMISSION ====================
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot for the duration of the block
+
+        Raises:
+            ConcurrencyLimitExceeded: If the wait queue is full or the wait times out
+        """
+        await self._acquire()
+        started = time.monotonic()
+        in_flight = self._in_flight
+        try:
+            yield
+        except self.drop_exceptions:
+            self._release(None, in_flight)
+            raise
+        except BaseException:
+            # Failed calls say nothing about upstream latency
+            self._release(None, in_flight, dropped=False)
+            raise
+        self._release(time.monotonic() - started, in_flight)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) while holding a slot"""
+        async with self.acquire():
+            return await func(*args, **kwargs)
+
+    async def _acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.accepted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise ConcurrencyLimitExceeded("queue_full", 429, self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                self._discard(waiter)
+                self.rejected["queue_timeout"] += 1
+                raise ConcurrencyLimitExceeded("queue_timeout", 503, self._retry_after())
+            # The slot was granted just as the wait timed out; keep it
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted but the caller went away: hand the slot on
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._discard(waiter)
+            raise
+        self.accepted += 1
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _wake(self):
+        """Grant free slots to waiters in FIFO order"""
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _retry_after(self) -> float:
+        """Rough seconds until a queued caller would be admitted"""
+        latency = self._short_rtt or 1.0
+        return round(latency * (len(self._waiters) + 1) / self.limit, 1)
+
+    # ==================== LIMIT ADAPTATION ====================
+
+    def _release(self, rtt: Optional[float], in_flight: int, dropped: bool = True):
+        self._in_flight -= 1
+        self.completed += 1
+        if rtt is not None:
+            self._on_sample(rtt, in_flight)
+        elif dropped:
+            self.dropped += 1
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            logger.warning(f"Concurrency limiter '{self.name}' drop, limit now {self.limit}")
+        self._wake()
+
+    def _on_sample(self, rtt: float, in_flight: int):
+        self._recent.append(rtt)
+        if self._short_rtt is None:
+            self._short_rtt = self._long_rtt = rtt
+            return
+        self._short_rtt += self._short_alpha * (rtt - self._short_rtt)
+        self._long_rtt += self._long_alpha * (rtt - self._long_rtt)
+
+        gradient = max(0.5, min(1.0, self._long_rtt / self._short_rtt))
+        if gradient >= 1.0 and in_flight < self._limit / 2:
+            # Not enough load to learn whether a higher limit is safe
+            return
+        estimate = self._limit * gradient + math.sqrt(self._limit)
+        new_limit = (1 - self.smoothing) * self._limit + self.smoothing * estimate
+        self._limit = max(self.min_limit, min(self.max_limit, new_limit))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Current limit, queue depth and latency figures"""
+        recent = sorted(self._recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else None
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "estimated_limit": round(self._limit, 2),
+            "in_flight": self._in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "accepted": self.accepted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "rejected": dict(self.rejected),
+            "latency_ms": {
+                "current": round(self._short_rtt * 1000, 1) if self._short_rtt else None,
+                "baseline": round(self._long_rtt * 1000, 1) if self._long_rtt else None,
+                "p95": round(p95 * 1000, 1) if p95 is not None else None,
+            },
+        }
@@ -78,6 +78,26 @@ class SystemsPerformanceConfig(BaseSettings):
     target_response_time_ms: int = Field(500, description="Target response time")
     target_p95_response_time_ms: int = Field(1000, description="Target P95 response time")
     
+    # Upstream Concurrency (adaptive bulkhead in front of model calls)
+    upstream_initial_concurrency: int = Field(10, description="Initial concurrent upstream calls")
+    upstream_max_concurrency: int = Field(50, description="Upper bound for the adaptive limit")
+    upstream_queue_size: int = Field(100, description="Requests allowed to wait for a slot before 429")
+    upstream_queue_timeout_seconds: float = Field(10.0, description="Max wait for a slot before 503")
+    
+    # Orchestrated Task Scheduling (weighted fair queues per task priority)
+    scheduler_queue_size: int = Field(500, description="Queued orchestrated tasks allowed per priority")
+    scheduler_result_ttl_seconds: float = Field(600.0, description="How long finished task results can be polled")
+    
+    # Governance Validation Offloading (process pool for large AI outputs)
+    validation_pool_workers: int = Field(2, description="Worker processes for CPU-heavy validation (0 keeps it inline)")
+    validation_inline_threshold_chars: int = Field(32768, description="Outputs shorter than this are validated inline")
+    governance_monitor_sample_rate: float = Field(0.1, description="Fraction of decisions validated in MONITOR mode (high-risk types always)")
+    decision_cache_size: int = Field(1000, description="Validated AI decisions kept for deduplication")
+    decision_cache_ttl_seconds: float = Field(300.0, description="How long a cached decision validation stays valid")
+    persona_consultation_timeout_seconds: float = Field(5.0, description="Deadline for each persona consultation or validation rule")
+    persona_timeout_fallback: str = Field("reject", description="Result for a consultation that misses its deadline: reject, approve or skip")
+    decision_batch_max_size: int = Field(500, description="Decisions accepted per /governance/decisions/batch request (413 above)")
+    
     # Metrics Configuration
     metrics_window_size: int = Field(1000, description="Rolling window for metrics")
     metrics_collection_interval: int = Field(60, description="Metrics snapshot interval (seconds)")
@@ -36,9 +36,12 @@ from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 import json
+import uuid
 import argparse
+import math
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
@@ -68,6 +71,11 @@ from conversation_manager import ConversationManager
 from additional_api_endpoints import add_additional_routes
 from updated_api_endpoints import rules_router, practices_router, templates_router, sessions_router
 from database_service import db_service
+from circuit_breaker import circuit_breakers
+from concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+from task_scheduler import (
+    PriorityTaskScheduler, ScheduledTask, SchedulerFullError, DEFAULT_PRIORITY_WEIGHTS
+)
 from websocket_manager import ws_manager, EventType
 from agent_terminal_manager import agent_terminal_manager, AgentType
 from claude_terminal import claude_terminal
@@ -80,8 +88,12 @@ from governance.core.runtime_governance import (
     AgentContext,
     DecisionContext
 )
+from governance.core.rate_limiter import RateLimitDecision, RateLimitExceeded
+from governance.core.validation_pool import ValidationPool
+from governance.core.decision_sampler import DecisionSampler
 from governance.middleware.ai_decision_injector import (
     AIDecisionInjector,
+    DecisionRequest,
     DecisionType
 )
 
@@ -98,6 +110,8 @@ class AITask(BaseModel):
     persona: Optional[str] = None
     context: Optional[Dict[str, Any]] = {}
     use_cache: bool = True
+    priority: str = "medium"  # TaskPriority name, used by /ai/orchestrated
+    estimated_tokens: Optional[int] = None  # Estimated from the prompt when omitted
 
 class PersonaSuggestion(BaseModel):
     description: str
@@ -111,6 +125,16 @@ class TaskResponse(BaseModel):
     persona_used: Optional[str] = None
     execution_time_ms: int = 0
 
+class DecisionItem(BaseModel):
+    agent_id: str
+    decision_type: DecisionType
+    input_context: Optional[Dict[str, Any]] = None
+    proposed_output: Any = None
+    metadata: Optional[Dict[str, Any]] = None
+
+class DecisionBatch(BaseModel):
+    decisions: List[DecisionItem]
+
 class CacheMetrics(BaseModel):
     hit_rate: float
     tokens_saved: int
@@ -172,10 +196,66 @@ class AIBackendService:
         self.conversation_manager = ConversationManager(self.ai_orchestrator)
         
         # Initialize runtime governance system
-        self.runtime_governance = RuntimeGovernanceSystem()
+        # One validation pool shared by runtime governance and the decision injector
+        self.validation_pool = ValidationPool(
+            max_workers=self.config.systems.validation_pool_workers,
+            inline_threshold=self.config.systems.validation_inline_threshold_chars
+        )
+        self.runtime_governance = RuntimeGovernanceSystem(
+            audit_dir=self.config.app.logs_dir / "governance-audit",
+            validation_pool=self.validation_pool,
+            monitor_sample_rate=self.config.systems.governance_monitor_sample_rate
+        )
         
-        # Initialize AI decision injector
-        self.decision_injector = AIDecisionInjector()
+        # Initialize AI decision injector (samples decisions while governance is in MONITOR mode)
+        self.decision_injector = AIDecisionInjector(
+            validation_pool=self.validation_pool,
+            sampler=DecisionSampler(
+                rate=self.config.systems.governance_monitor_sample_rate,
+                enabled=lambda: self.runtime_governance.governance_level == GovernanceLevel.MONITOR
+            ),
+            cache_size=self.config.systems.decision_cache_size,
+            cache_ttl_seconds=self.config.systems.decision_cache_ttl_seconds,
+            consultation_timeout=self.config.systems.persona_consultation_timeout_seconds,
+            timeout_fallback=self.config.systems.persona_timeout_fallback
+        )
+        
+        # Per-dependency circuit breakers (the database breaker is owned by db_service)
+        self.claude_breaker = circuit_breakers.get(
+            "claude",
+            failure_threshold=5,
+            recovery_timeout=30,
+            slow_call_duration=60.0,
+            failure_result=lambda result: isinstance(result, dict) and not result.get('success', True)
+        )
+        self.agent_breaker = circuit_breakers.get(
+            "agent_terminals",
+            failure_threshold=5,
+            recovery_timeout=15,
+            slow_call_duration=30.0
+        )
+        
+        # Adaptive bulkhead shared by all upstream model calls
+        self.upstream_limiter = AdaptiveConcurrencyLimiter(
+            name="claude",
+            initial_limit=self.config.systems.upstream_initial_concurrency,
+            max_limit=self.config.systems.upstream_max_concurrency,
+            max_queue=self.config.systems.upstream_queue_size,
+            queue_timeout=self.config.systems.upstream_queue_timeout_seconds
+        )
+        
+        # Orchestrated tasks are queued per priority and admitted against max_tokens_per_minute; that admission is their only token charge.
+        # Dispatch is capped at the upstream limit so priority order is decided here, not in its FIFO queue.
+        self.task_scheduler = PriorityTaskScheduler(
+            token_limit=lambda: self.runtime_governance.resource_limits['max_tokens_per_minute'],
+            max_concurrent=lambda: self.upstream_limiter.limit,
+            weights={
+                priority.name.lower(): DEFAULT_PRIORITY_WEIGHTS.get(priority.name.lower(), 1)
+                for priority in TaskPriority
+            },
+            max_queued_per_priority=self.config.systems.scheduler_queue_size,
+            result_ttl=self.config.systems.scheduler_result_ttl_seconds
+        )
         
         self.setup_middleware()
         self.setup_routes()
@@ -186,7 +266,7 @@ class AIBackendService:
         # add_additional_routes(self.app)
         
         # Add real database-backed endpoints using database_service
-        # These routers use the database_service with fallback to mock data
+        # These routers use the database_service with fallback to the offline SQLite store
         self.app.include_router(rules_router)
         self.app.include_router(practices_router) 
         self.app.include_router(templates_router)
@@ -247,6 +327,10 @@ class AIBackendService:
                     await self.ai_orchestrator.start_orchestration()
                     logger.info("AI Orchestration Engine started")
                     
+                    # Start dispatching orchestrated tasks
+                    self.task_scheduler.start()
+                    logger.info("Orchestrated task scheduler started")
+                    
                     # Persona orchestration is ready (no async initialization needed)
                     logger.info("Persona Orchestration ready with assumption fighting")
                     
@@ -281,6 +365,18 @@ class AIBackendService:
                 await self.ai_orchestrator.stop_orchestration()
                 logger.info("AI Orchestration stopped")
                 
+                # Stop dispatching and cancel in-flight orchestrated tasks
+                await self.task_scheduler.stop()
+                
+                # Stop agent resource sampling
+                await self.runtime_governance.resource_sampler.stop()
+                
+                # Persist queued audit events
+                await self.runtime_governance.close_audit_log()
+                
+                # Stop validation worker processes
+                self.validation_pool.shutdown()
+                
                 # Save cache to database
                 if self.db_manager:
                     await self.cache.save_to_database(self.db_manager)
@@ -373,7 +469,108 @@ class AIBackendService:
             logger.info(f"Audit event: {event.get('event')} at {event.get('timestamp')}")
         
         self.runtime_governance.register_hook(HookType.AUDIT_LOG, audit_hook)
+        
+        # Register resource limit hook
+        async def resource_limit_hook(event: dict):
+            """Stop the agent's process when governance terminates it for exceeding a resource limit"""
+            if event['action'] == 'terminate':
+                await agent_terminal_manager.terminate_agent(event['agent'].agent_id)
+        
+        self.runtime_governance.register_hook(HookType.RESOURCE_LIMIT_EXCEEDED, resource_limit_hook)
+    
+    def _overloaded(self, error: ConcurrencyLimitExceeded) -> HTTPException:
+        """Shed an upstream call: 429 when the wait queue is full, 503 when the wait timed out"""
+        logger.warning(f"Shedding upstream request: {error.reason}")
+        return HTTPException(
+            status_code=error.status_code,
+            detail=str(error),
+            headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+        )
+    
+    def _rate_limited(self, decision: RateLimitDecision) -> HTTPException:
+        """Reject an upstream call that does not fit the governance token/API call budgets"""
+        return HTTPException(
+            status_code=429,
+            detail=decision.reason,
+            headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))}
+        )
     
+    def _estimate_tokens(self, task: AITask) -> int:
+        """Token estimate for an orchestrated task: prompt and context plus a response allowance"""
+        if task.estimated_tokens:
+            return task.estimated_tokens
+        text = task.prompt + json.dumps(task.context or {}, default=str)
+        return len(text) // self.config.ai.token_estimation_divisor + 1000
+    
+    def _submit_orchestrated(self, task: AITask) -> ScheduledTask:
+        """Queue a task for full persona orchestration and return its scheduler record"""
+        try:
+            priority = TaskPriority[task.priority.upper()]
+        except KeyError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown priority '{task.priority}'. Use one of: {[p.name for p in TaskPriority]}"
+            )
+        
+        estimated_tokens = self._estimate_tokens(task)
+        orchestrator_task = OrchestratorTask(
+            task_id=f"api_task_{int(datetime.now().timestamp() * 1000)}_{uuid.uuid4().hex[:6]}",
+            task_type="text_generation",
+            description=task.prompt,
+            input_data={
+                "prompt": task.prompt,
+                "persona": task.persona,
+                "context": task.context
+            },
+            priority=priority,
+            estimated_tokens=estimated_tokens,
+            requires_governance=True  # Enable governance for assumption validation
+        )
+        
+        async def run() -> Dict[str, Any]:
+            # Admission already charged the scheduler's token budget, so only
+            # the governance API call budget is debited here, without waiting;
+            # a rejected task hands its token reservation back
+            rate_decision = self.runtime_governance.acquire_rate_limit(tokens=0)
+            if not rate_decision.allowed:
+                self.task_scheduler.refund(orchestrator_task.task_id)
+                raise RateLimitExceeded(rate_decision)
+            
+            # Process through enhanced persona orchestration with assumption fighting
+            async with self.upstream_limiter.acquire():
+                consensus_decision = await self.claude_breaker.call_async(
+                    self.persona_orchestration.process_task_with_full_orchestration,
+                    orchestrator_task
+                )
+            
+            # Log the consensus details
+            logger.info(f"Orchestrated task completed with consensus level: {consensus_decision.consensus_level.value}")
+            logger.info(f"Assumptions validated: {len(consensus_decision.assumptions_validated)}")
+            logger.info(f"Evidence used: {len(consensus_decision.evidence_used)}")
+            
+            result = {
+                "response": consensus_decision.final_decision,
+                "consensus_level": consensus_decision.consensus_level.value,
+                "assumptions_validated": len(consensus_decision.assumptions_validated),
+                "evidence_used": len(consensus_decision.evidence_used)
+            }
+            # Reported usage lets the scheduler settle its estimate
+            tokens_used = getattr(consensus_decision, "tokens_used", None)
+            if isinstance(tokens_used, int):
+                result["tokens_used"] = tokens_used
+            return result
+        
+        try:
+            return self.task_scheduler.submit(
+                run,
+                priority=priority,
+                estimated_tokens=estimated_tokens,
+                task_id=orchestrator_task.task_id,
+                metadata={"persona": task.persona}
+            )
+        except SchedulerFullError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "60"})
+        
     def setup_routes(self):
         """Define API endpoints"""
         
@@ -461,12 +658,22 @@ class AIBackendService:
                     suggested_personas = self.persona_manager.suggest_persona(task.prompt)
                     task.persona = suggested_personas[0] if suggested_personas else None
                 
-                # Execute with Claude
-                result = await self.claude.execute_with_persona(
-                    prompt=task.prompt,
-                    persona=task.persona,
-                    context=task.context
-                )
+                # Debit the governance token and API call budgets
+                estimated_tokens = self._estimate_tokens(task)
+                rate_decision = self.runtime_governance.acquire_rate_limit(tokens=estimated_tokens)
+                if not rate_decision.allowed:
+                    raise self._rate_limited(rate_decision)
+                
+                # Execute with Claude (waits for an upstream slot or is shed)
+                async with self.upstream_limiter.acquire():
+                    result = await self.claude_breaker.call_async(
+                        self.claude.execute_with_persona,
+                        prompt=task.prompt,
+                        persona=task.persona,
+                        context=task.context
+                    )
+                if isinstance(result.get('tokens_used'), int):
+                    self.runtime_governance.record_token_usage(None, estimated_tokens, result['tokens_used'])
                 
                 # Store in cache for future use
                 if result['success'] and task.use_cache:
@@ -488,6 +695,10 @@ class AIBackendService:
                     execution_time_ms=execution_time
                 )
                 
+            except HTTPException:
+                raise
+            except ConcurrencyLimitExceeded as e:
+                raise self._overloaded(e)
             except Exception as e:
                 logger.error(f"AI task execution failed: {e}")
                 execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -508,45 +719,37 @@ class AIBackendService:
             start_time = datetime.now()
             
             try:
-                # Create orchestrator task
-                orchestrator_task = OrchestratorTask(
-                    task_id=f"api_task_{int(datetime.now().timestamp() * 1000)}",
-                    task_type="text_generation",
-                    description=task.prompt,
-                    input_data={
-                        "prompt": task.prompt,
-                        "persona": task.persona,
-                        "context": task.context
-                    },
-                    priority=TaskPriority.MEDIUM,
-                    estimated_tokens=1000,
-                    requires_governance=True  # Enable governance for assumption validation
-                )
+                # Queue behind higher-priority work and wait for the result
+                scheduled = self._submit_orchestrated(task)
+                try:
+                    await self.task_scheduler.wait(scheduled.task_id)
+                except asyncio.CancelledError:
+                    # Client went away: free the slot for someone else
+                    await self.task_scheduler.cancel(scheduled.task_id)
+                    raise
                 
-                # Process through enhanced persona orchestration with assumption fighting
-                consensus_decision = await self.persona_orchestration.process_task_with_full_orchestration(
-                    orchestrator_task
-                )
+                if isinstance(scheduled.exception, (ConcurrencyLimitExceeded, RateLimitExceeded)):
+                    raise scheduled.exception
+                if scheduled.status != "completed":
+                    raise RuntimeError(scheduled.error or f"Task {scheduled.status}")
                 
                 execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
                 
-                # Add metadata if TaskResponse supports it
-                response = TaskResponse(
+                return TaskResponse(
                     success=True,
-                    response=consensus_decision.final_decision,
+                    response=scheduled.result["response"],
                     cached=False,
                     tokens_saved=0,
                     persona_used="orchestrated_consensus",
                     execution_time_ms=execution_time
                 )
                 
-                # Log the consensus details
-                logger.info(f"Orchestrated task completed with consensus level: {consensus_decision.consensus_level.value}")
-                logger.info(f"Assumptions validated: {len(consensus_decision.assumptions_validated)}")
-                logger.info(f"Evidence used: {len(consensus_decision.evidence_used)}")
-                
-                return response
-                
+            except HTTPException:
+                raise
+            except ConcurrencyLimitExceeded as e:
+                raise self._overloaded(e)
+            except RateLimitExceeded as e:
+                raise self._rate_limited(e.decision)
             except Exception as e:
                 logger.error(f"Orchestrated task execution failed: {e}")
                 execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -558,6 +761,50 @@ class AIBackendService:
                     execution_time_ms=execution_time
                 )
         
+        @self.app.post("/ai/orchestrated/tasks", status_code=202)
+        async def submit_orchestrated_task(task: AITask) -> Dict[str, Any]:
+            """Queue an orchestrated task and return immediately; poll or stream it by task_id"""
+            await self._ensure_initialized()
+            
+            scheduled = self._submit_orchestrated(task)
+            return {
+                "task_id": scheduled.task_id,
+                "status": scheduled.status,
+                "priority": scheduled.priority,
+                "estimated_tokens": scheduled.estimated_tokens,
+                "queue_position": self.task_scheduler.queue_position(scheduled.task_id)
+            }
+        
+        @self.app.get("/ai/orchestrated/tasks/{task_id}")
+        async def get_orchestrated_task(task_id: str) -> Dict[str, Any]:
+            """Poll an orchestrated task; the result is included once it has finished"""
+            scheduled = self.task_scheduler.get(task_id)
+            if scheduled is None:
+                raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+            snapshot = scheduled.to_dict()
+            snapshot["queue_position"] = self.task_scheduler.queue_position(task_id)
+            return snapshot
+        
+        @self.app.get("/ai/orchestrated/tasks/{task_id}/stream")
+        async def stream_orchestrated_task(task_id: str) -> StreamingResponse:
+            """Stream status changes as NDJSON until the task finishes"""
+            if self.task_scheduler.get(task_id) is None:
+                raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+            
+            async def events():
+                async for snapshot in self.task_scheduler.stream(task_id):
+                    yield json.dumps(snapshot, default=str) + "\n"
+            
+            return StreamingResponse(events(), media_type="application/x-ndjson")
+        
+        @self.app.delete("/ai/orchestrated/tasks/{task_id}")
+        async def cancel_orchestrated_task(task_id: str) -> Dict[str, Any]:
+            """Cancel a queued or running orchestrated task"""
+            if self.task_scheduler.get(task_id) is None:
+                raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+            cancelled = await self.task_scheduler.cancel(task_id)
+            return {"task_id": task_id, "cancelled": cancelled}
+        
         @self.app.get("/orchestration/status")
         async def get_orchestration_status():
             """Get status of the orchestration engine"""
@@ -658,9 +905,21 @@ class AIBackendService:
                 return {
                     "status": "initializing",
                     "metrics": {},
+                    "circuit_breakers": circuit_breakers.get_metrics(),
+                    "upstream_concurrency": self.upstream_limiter.get_metrics(),
+                    "task_scheduler": self.task_scheduler.get_metrics(),
                     "message": "System is still initializing"
                 }
-            return await self.metrics.get_performance_summary()
+            summary = await self.metrics.get_performance_summary()
+            summary["circuit_breakers"] = circuit_breakers.get_metrics()
+            summary["upstream_concurrency"] = self.upstream_limiter.get_metrics()
+            summary["task_scheduler"] = self.task_scheduler.get_metrics()
+            return summary
+        
+        @self.app.get("/metrics/circuit-breakers")
+        async def get_circuit_breaker_states():
+            """Return detailed state of every dependency circuit breaker"""
+            return circuit_breakers.get_states()
         
         @self.app.get("/agents/status")
         async def get_agent_status():
@@ -706,14 +965,15 @@ class AIBackendService:
                 
                 # Proceed with spawn if approved
                 agent_type = AgentType(agent_type_str)
-                agent = await agent_terminal_manager.spawn_agent(agent_type)
+                agent = await self.agent_breaker.call_async(agent_terminal_manager.spawn_agent, agent_type)
                 
                 # GOVERNANCE: Register the spawned agent
                 await self.runtime_governance.register_agent(
                     agent_id=agent.id,
                     agent_type=agent_type_str,
                     agent_name=agent.name,
-                    metadata=metadata
+                    metadata=metadata,
+                    pid=getattr(agent, 'pid', None)
                 )
                 
                 # Broadcast agent creation
@@ -761,11 +1021,14 @@ class AIBackendService:
                         'success': False,
                         'error': f"Governance rejected: {governance_result.reason}",
                         'risk_level': governance_result.risk_level,
-                        'recommendations': governance_result.recommendations
+                        'recommendations': governance_result.recommendations,
+                        'retry_after': governance_result.metadata.get('retry_after')
                     }
                 
                 # Execute if approved
-                response = await agent_terminal_manager.send_to_agent(agent_id, command)
+                response = await self.agent_breaker.call_async(
+                    agent_terminal_manager.send_to_agent, agent_id, command
+                )
                 
                 # For AI-generated responses, validate the decision
                 if response and isinstance(response, str):
@@ -846,11 +1109,19 @@ class AIBackendService:
             }
         
         @self.app.get("/governance/audit-log")
-        async def get_audit_log(limit: int = 100):
-            """Get recent audit log entries"""
+        async def get_audit_log(
+            limit: int = 100,
+            agent_id: Optional[str] = None,
+            event_type: Optional[str] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None
+        ):
+            """Get recent audit log entries, optionally filtered by agent, event type and time range"""
             await self._ensure_initialized()
             
-            logs = self.runtime_governance.get_audit_log(limit)
+            logs = self.runtime_governance.get_audit_log(
+                limit, agent_id=agent_id, event_type=event_type, since=since, until=until
+            )
             return {
                 "total_entries": len(self.runtime_governance.audit_log),
                 "returned": len(logs),
@@ -912,6 +1183,56 @@ class AIBackendService:
             except Exception as e:
                 return {'success': False, 'error': str(e)}
         
+        @self.app.get("/governance/hook-metrics")
+        async def get_hook_metrics():
+            """Get per-hook latency histograms, errors and timeouts"""
+            await self._ensure_initialized()
+            
+            return {
+                "hook_timeout_seconds": self.runtime_governance.hook_timeout,
+                "hooks": self.runtime_governance.get_hook_metrics()
+            }
+        
+        @self.app.post("/governance/decisions/batch")
+        async def validate_decision_batch(request_data: DecisionBatch):
+            """Validate many AI decisions in one pass; results are returned in request order"""
+            await self._ensure_initialized()
+            
+            max_batch = self.config.systems.decision_batch_max_size
+            if len(request_data.decisions) > max_batch:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch of {len(request_data.decisions)} decisions exceeds the limit of {max_batch}"
+                )
+            batch = [
+                DecisionRequest(
+                    agent_id=item.agent_id,
+                    decision_type=item.decision_type,
+                    input_context=item.input_context or {},
+                    proposed_output=item.proposed_output,
+                    metadata=item.metadata
+                )
+                for item in request_data.decisions
+            ]
+            
+            validations = await self.decision_injector.intercept_decisions(batch)
+            return {
+                'count': len(validations),
+                'approved': sum(1 for v in validations if v.approved),
+                'results': [
+                    {
+                        'decision_id': v.decision_id,
+                        'approved': v.approved,
+                        'risk_level': v.risk_level.value,
+                        'confidence': v.confidence_score,
+                        'modified': bool(v.modifications),
+                        'modified_output': v.modifications.get('modified'),
+                        'warnings': v.warnings
+                    }
+                    for v in validations
+                ]
+            }
+        
         @self.app.get("/governance/decision-metrics")
         async def get_decision_metrics():
             """Get AI decision injection metrics"""
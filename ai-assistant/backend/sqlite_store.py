@@ -0,0 +1,611 @@
+"""
+Embedded SQLite Catalog Store
+Serves rules, practices and templates while PostgreSQL is unreachable
+
+@author: Dr. Sarah Chen - Senior Backend/Systems Architect
+@architecture: Offline-first storage - local SQLite replica plus write journal
+@business_logic: The catalog stays readable and writable without a database server;
+                 offline writes are replayed to PostgreSQL once it is reachable again
+@testing: Unit tests for query parity, keyset pagination, statistics and the journal
+@integration: Used by DatabaseService whenever PostgreSQL is not connected
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import logging
+
+from catalog_schema import (
+    CATALOG_TABLES, NO_TIMESTAMP, decode_cursor, encode_cursor, projected_columns, write_row
+)
+
+logger = logging.getLogger(__name__)
+
+# Timestamps are stored as fixed-width ISO-8601 text so they sort chronologically
+_NOW = "strftime('%Y-%m-%dT%H:%M:%f000', 'now')"
+_NO_TIMESTAMP = '0001-01-01T00:00:00.000000'
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS rules (
+    rule_id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    severity TEXT,
+    enforcement TEXT,
+    examples TEXT DEFAULT '[]',
+    anti_patterns TEXT DEFAULT '[]',
+    violations_consequence TEXT,
+    created_by TEXT DEFAULT 'system',
+    created_at TEXT DEFAULT ({_NOW}),
+    updated_at TEXT DEFAULT ({_NOW}),
+    active INTEGER DEFAULT 1,
+    priority INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'ACTIVE'
+);
+
+CREATE TABLE IF NOT EXISTS practices (
+    practice_id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    benefits TEXT DEFAULT '[]',
+    implementation_guide TEXT,
+    anti_patterns TEXT DEFAULT '[]',
+    "references" TEXT DEFAULT '[]',
+    examples TEXT DEFAULT '[]',
+    effectiveness_score REAL,
+    adoption_rate REAL,
+    created_at TEXT DEFAULT ({_NOW}),
+    is_active INTEGER DEFAULT 1,
+    is_required INTEGER DEFAULT 0,
+    priority TEXT
+);
+
+CREATE TABLE IF NOT EXISTS templates (
+    template_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    category TEXT NOT NULL,
+    template_content TEXT NOT NULL,
+    variables TEXT DEFAULT '[]',
+    tags TEXT DEFAULT '[]',
+    usage_count INTEGER DEFAULT 0,
+    is_active INTEGER DEFAULT 1,
+    created_by TEXT DEFAULT 'system',
+    created_at TEXT DEFAULT ({_NOW})
+);
+
+CREATE TABLE IF NOT EXISTS template_variables (
+    template_id TEXT NOT NULL REFERENCES templates(template_id) ON DELETE CASCADE,
+    variable_name TEXT NOT NULL,
+    variable_type TEXT,
+    default_value TEXT,
+    options TEXT DEFAULT '[]',
+    is_required INTEGER DEFAULT 0,
+    description TEXT
+);
+
+-- Writes made while offline, replayed to PostgreSQL in seq order
+CREATE TABLE IF NOT EXISTS replay_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at TEXT DEFAULT ({_NOW})
+);
+
+-- Same indexes as the PostgreSQL schema (docs/architecture/database.md)
+CREATE INDEX IF NOT EXISTS idx_rules_category ON rules(category) WHERE active = 1;
+CREATE INDEX IF NOT EXISTS idx_practices_category ON practices(category) WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS idx_templates_category ON templates(category) WHERE is_active = 1;
+CREATE INDEX IF NOT EXISTS idx_rules_severity ON rules(severity, created_at DESC) WHERE active = 1;
+CREATE INDEX IF NOT EXISTS idx_rules_keyset ON rules (
+    (-(CASE UPPER(severity) WHEN 'CRITICAL' THEN 1 WHEN 'ERROR' THEN 2
+       WHEN 'WARNING' THEN 3 WHEN 'INFO' THEN 4 ELSE 5 END)) DESC,
+    (COALESCE(created_at, '{_NO_TIMESTAMP}')) DESC, rule_id DESC);
+CREATE INDEX IF NOT EXISTS idx_practices_keyset ON practices (
+    (COALESCE(effectiveness_score, -1)) DESC, (COALESCE(adoption_rate, -1)) DESC,
+    (COALESCE(created_at, '{_NO_TIMESTAMP}')) DESC, practice_id DESC);
+CREATE INDEX IF NOT EXISTS idx_templates_keyset ON templates (
+    (COALESCE(usage_count, 0)) DESC,
+    (COALESCE(created_at, '{_NO_TIMESTAMP}')) DESC, template_id DESC);
+CREATE INDEX IF NOT EXISTS idx_template_variables_template ON template_variables(template_id);
+CREATE INDEX IF NOT EXISTS idx_replay_journal_status ON replay_journal(status, seq);
+"""
+
+# SQLite spellings of the PostgreSQL sort keys in CATALOG_TABLES (same order
+# and cursor types, so a cursor issued by one backend is accepted by the other)
+SORT_KEYS: Dict[str, List[str]] = {
+    'rules': [
+        "-(CASE UPPER(severity) WHEN 'CRITICAL' THEN 1 WHEN 'ERROR' THEN 2 "
+        "WHEN 'WARNING' THEN 3 WHEN 'INFO' THEN 4 ELSE 5 END)",
+        f"COALESCE(created_at, '{_NO_TIMESTAMP}')",
+        "rule_id",
+    ],
+    'practices': [
+        "COALESCE(effectiveness_score, -1)",
+        "COALESCE(adoption_rate, -1)",
+        f"COALESCE(created_at, '{_NO_TIMESTAMP}')",
+        "practice_id",
+    ],
+    'templates': [
+        "COALESCE(usage_count, 0)",
+        f"COALESCE(created_at, '{_NO_TIMESTAMP}')",
+        "template_id",
+    ],
+}
+
+# Columns copied from PostgreSQL rows when refreshing the mirror, in addition
+# to write_columns (server-maintained values such as timestamps and counters)
+MIRROR_COLUMNS: Dict[str, List[str]] = {
+    'rules': ['created_at', 'updated_at', 'status'],
+    'practices': ['effectiveness_score', 'adoption_rate', 'created_at'],
+    'templates': ['usage_count', 'created_at'],
+}
+
+BOOLEAN_COLUMNS = {'active', 'is_active', 'is_required'}
+TIMESTAMP_COLUMNS = {'created_at', 'updated_at'}
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    """Normalize a datetime or ISO string to the stored fixed-width text form"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.isoformat(timespec='microseconds')
+
+
+def _to_sqlite(kind: str, column: str, value: Any) -> Any:
+    """Adapt a Python value to its SQLite storage form"""
+    if value is None:
+        return None
+    if column in CATALOG_TABLES[kind]['jsonb']:
+        return json.dumps(value, default=str)
+    if column in TIMESTAMP_COLUMNS:
+        return _timestamp(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _from_sqlite(kind: str, row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a SQLite row back to the shape DatabaseService returns for PostgreSQL"""
+    item = dict(row)
+    jsonb = CATALOG_TABLES[kind]['jsonb']
+    for column, value in item.items():
+        if value is None:
+            continue
+        if column in jsonb:
+            item[column] = json.loads(value)
+        elif column in BOOLEAN_COLUMNS:
+            item[column] = bool(value)
+        elif column in TIMESTAMP_COLUMNS:
+            item[column] = datetime.fromisoformat(value)
+    return item
+
+
+class SQLiteCatalogStore:
+    """
+    Local SQLite copy of the catalog tables
+
+    One connection in WAL mode is shared by all callers; blocking calls run
+    in a worker thread under a lock so the event loop never waits on disk.
+    The database file is created on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, enable WAL and create the schema"""
+        if self._conn is None:
+            if self.path != ':memory:':
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._pending = conn.execute(
+                "SELECT COUNT(*) FROM replay_journal WHERE status = 'pending'"
+            ).fetchone()[0]
+            self._conn = conn
+            logger.info(f"Opened offline catalog store at {self.path}")
+        return self._conn
+
+    async def _run(self, func: Callable[..., Any], *args) -> Any:
+        """Run func(conn, *args) in a worker thread, serialized on the shared connection"""
+        def call():
+            with self._lock:
+                return func(self._connect(), *args)
+        return await asyncio.to_thread(call)
+
+    @staticmethod
+    def _transaction(conn: sqlite3.Connection, func: Callable[[], Any]) -> Any:
+        """Run func inside BEGIN IMMEDIATE ... COMMIT, rolling back on error"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def close(self):
+        """Close the connection (it is reopened on next use)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Store location and number of writes waiting for replay"""
+        return {
+            "path": self.path,
+            "open": self._conn is not None,
+            "pending_journal_entries": self._pending,
+        }
+
+    # ==================== READS ====================
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Equality filters on whitelisted columns; None means "any value" """
+        clauses, params = [], []
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f'"{column}" = ?')
+                params.append(value)
+        return clauses, params
+
+    @staticmethod
+    def _select_list(kind: str, fields: Optional[List[str]]) -> str:
+        columns = projected_columns(kind, fields)
+        if columns is None:
+            return "*, category AS category_name"
+        return ", ".join(f'"{c}"' for c in columns)
+
+    async def get_page(self, kind: str, filters: Dict[str, Any],
+                       limit: Optional[int] = None, cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """One keyset page with the same ordering and cursor format as PostgreSQL"""
+        spec = CATALOG_TABLES[kind]
+        sort_keys = SORT_KEYS[kind]
+        select_list = self._select_list(kind, fields)
+        where, params = self._where(filters)
+
+        if cursor:
+            after = decode_cursor(cursor, [t for _, t in spec['sort']])
+            where.append(
+                f"({', '.join(sort_keys)}) < ({', '.join('?' for _ in sort_keys)})"
+            )
+            params.extend(_NO_TIMESTAMP if v == NO_TIMESTAMP else
+                          _timestamp(v) if isinstance(v, datetime) else
+                          float(v) if isinstance(v, Decimal) else v for v in after)
+
+        sort_columns = ", ".join(f"{expr} AS _sort_{i}" for i, expr in enumerate(sort_keys))
+        query = (
+            f"SELECT {select_list}, {sort_columns} FROM {spec['name']} "
+            f"WHERE {' AND '.join(where) or '1'} "
+            f"ORDER BY {', '.join(f'_sort_{i} DESC' for i in range(len(sort_keys)))}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        rows = await self._run(lambda conn: conn.execute(query, params).fetchall())
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            # NULL timestamps share PostgreSQL's cursor token
+            next_cursor = encode_cursor([
+                NO_TIMESTAMP if last[f"_sort_{i}"] == _NO_TIMESTAMP else last[f"_sort_{i}"]
+                for i in range(len(sort_keys))
+            ])
+
+        items = []
+        for row in rows:
+            item = _from_sqlite(kind, row)
+            for i in range(len(sort_keys)):
+                item.pop(f"_sort_{i}", None)
+            items.append(item)
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def iter_rows(self, kind: str, filters: Dict[str, Any],
+                        fields: Optional[List[str]] = None,
+                        batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Stream rows ordered by id, batch_size at a time (keyset on the id)"""
+        spec = CATALOG_TABLES[kind]
+        id_column = spec['id']
+        select_list = self._select_list(kind, fields)
+        where, params = self._where(filters)
+        last_id = None
+
+        while True:
+            clauses, values = list(where), list(params)
+            if last_id is not None:
+                clauses.append(f'"{id_column}" > ?')
+                values.append(last_id)
+            query = (
+                f"SELECT {select_list} FROM {spec['name']} "
+                f"WHERE {' AND '.join(clauses) or '1'} "
+                f'ORDER BY "{id_column}" LIMIT ?'
+            )
+            values.append(batch_size)
+            rows = await self._run(lambda conn: conn.execute(query, values).fetchall())
+            for row in rows:
+                yield _from_sqlite(kind, row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][id_column]
+
+    # ==================== STATISTICS ====================
+    # Row shapes match the PostgreSQL statistics queries so DatabaseService
+    # builds the response the same way for both backends. SQLite has no
+    # GROUPING SETS, so the two groupings are combined with UNION ALL.
+
+    async def rules_statistics_rows(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Totals row and (category | severity) group rows for rules"""
+        def query(conn):
+            totals = conn.execute("""
+                SELECT
+                    COUNT(*) AS total_rules,
+                    COUNT(*) FILTER (WHERE active) AS active_rules,
+                    COUNT(*) FILTER (WHERE active AND enforcement = 'mandatory') AS mandatory_count
+                FROM rules
+            """).fetchone()
+            groups = conn.execute("""
+                SELECT 0 AS is_severity_group, category, NULL AS severity, COUNT(*) AS count
+                FROM rules WHERE active GROUP BY category
+                UNION ALL
+                SELECT 1, NULL, severity, COUNT(*)
+                FROM rules WHERE active GROUP BY severity
+            """).fetchall()
+            return dict(totals), [dict(row) for row in groups]
+        return await self._run(query)
+
+    async def practices_statistics_rows(self) -> List[Dict[str, Any]]:
+        """(category | priority) group rows with required counts for practices"""
+        def query(conn):
+            return [dict(row) for row in conn.execute("""
+                SELECT 0 AS is_priority_group, category, NULL AS priority,
+                       COUNT(*) AS count, COUNT(*) FILTER (WHERE is_required) AS required_count
+                FROM practices GROUP BY category
+                UNION ALL
+                SELECT 1, NULL, COALESCE(priority, 'None'),
+                       COUNT(*), COUNT(*) FILTER (WHERE is_required)
+                FROM practices GROUP BY COALESCE(priority, 'None')
+            """)]
+        return await self._run(query)
+
+    async def templates_statistics_rows(self, most_used_limit: int
+                                        ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Per-category counts and the most used templates"""
+        def query(conn):
+            groups = conn.execute(
+                "SELECT category, COUNT(*) AS count FROM templates GROUP BY category"
+            ).fetchall()
+            most_used = conn.execute("""
+                SELECT name, COALESCE(usage_count, 0) AS usage_count
+                FROM templates
+                ORDER BY usage_count IS NULL, usage_count DESC
+                LIMIT ?
+            """, (most_used_limit,)).fetchall()
+            return [dict(row) for row in groups], [dict(row) for row in most_used]
+        return await self._run(query)
+
+    # ==================== WRITES ====================
+
+    @staticmethod
+    def _write_columns(kind: str, mirror: bool) -> List[str]:
+        columns = [c for c, _ in CATALOG_TABLES[kind]['write_columns']]
+        if mirror:
+            columns += MIRROR_COLUMNS[kind]
+        return columns
+
+    def _row(self, kind: str, record: Dict[str, Any], mirror: bool) -> List[Any]:
+        """Storage row for a record (write defaults applied, KeyError if required field missing)"""
+        values = list(write_row(kind, record))
+        if mirror:
+            values += [record.get(c) for c in MIRROR_COLUMNS[kind]]
+        return [_to_sqlite(kind, c, v) for c, v in zip(self._write_columns(kind, mirror), values)]
+
+    def _insert_sql(self, kind: str, upsert: bool, mirror: bool = False) -> str:
+        spec = CATALOG_TABLES[kind]
+        columns = self._write_columns(kind, mirror)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        sql = (
+            f"INSERT INTO {spec['name']} ({column_list}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        if upsert:
+            updates = [f'"{c}" = excluded."{c}"' for c in columns if c != spec['id']]
+            if 'updated_at' in spec['columns'] and 'updated_at' not in columns:
+                updates.append(f'"updated_at" = {_NOW}')
+            sql += f" ON CONFLICT (\"{spec['id']}\") DO UPDATE SET {', '.join(updates)}"
+        return sql
+
+    def _journal(self, conn: sqlite3.Connection, kind: str, operation: str, payload: Any):
+        conn.execute(
+            "INSERT INTO replay_journal (kind, operation, payload) VALUES (?, ?, ?)",
+            (kind, operation, json.dumps(payload, default=str))
+        )
+        self._pending = (self._pending or 0) + 1
+
+    def _replace_template_variables(self, conn: sqlite3.Connection,
+                                    records: List[Dict[str, Any]]):
+        for record in records:
+            if record.get('variables_detail') is None:
+                continue
+            conn.execute("DELETE FROM template_variables WHERE template_id = ?",
+                         (record['template_id'],))
+            conn.executemany(
+                "INSERT INTO template_variables (template_id, variable_name, variable_type, "
+                "default_value, options, is_required, description) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(record['template_id'], var['name'], var['type'], var.get('default'),
+                  json.dumps(var.get('options', [])), var.get('required', False),
+                  var.get('description'))
+                 for var in record['variables_detail']]
+            )
+
+    async def insert(self, kind: str, record: Dict[str, Any], journal: bool = True) -> str:
+        """Insert one record (sqlite3.IntegrityError if the id exists) and journal it"""
+        sql = self._insert_sql(kind, upsert=False)
+        row = self._row(kind, record, mirror=False)
+
+        def write(conn):
+            def body():
+                conn.execute(sql, row)
+                if kind == 'templates':
+                    self._replace_template_variables(conn, [record])
+                if journal:
+                    self._journal(conn, kind, 'create', record)
+            self._transaction(conn, body)
+
+        await self._run(write)
+        return record[CATALOG_TABLES[kind]['id']]
+
+    async def upsert(self, kind: str, records: List[Tuple[int, Dict[str, Any]]],
+                     journal: bool = True) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Insert or update validated (index, record) pairs in one transaction
+
+        The batch is written with executemany; if SQLite rejects it, rows are
+        retried one by one under savepoints. Records that were stored are
+        journalled as a single entry. Returns (upserted ids, per-row errors).
+        """
+        id_column = CATALOG_TABLES[kind]['id']
+        sql = self._insert_sql(kind, upsert=True)
+        rows = [self._row(kind, record, mirror=False) for _, record in records]
+
+        def write(conn):
+            errors: List[Dict[str, Any]] = []
+
+            def body():
+                stored = records
+                conn.execute("SAVEPOINT batch")
+                try:
+                    conn.executemany(sql, rows)
+                    conn.execute("RELEASE batch")
+                except sqlite3.Error as e:
+                    logger.warning(f"Offline {kind} upsert rejected ({e}), retrying row by row")
+                    conn.execute("ROLLBACK TO batch")
+                    conn.execute("RELEASE batch")
+                    stored = []
+                    for (index, record), row in zip(records, rows):
+                        conn.execute("SAVEPOINT row")
+                        try:
+                            conn.execute(sql, row)
+                            conn.execute("RELEASE row")
+                            stored.append((index, record))
+                        except sqlite3.Error as row_error:
+                            conn.execute("ROLLBACK TO row")
+                            conn.execute("RELEASE row")
+                            errors.append({"index": index, "id": record[id_column],
+                                           "error": str(row_error)})
+                if kind == 'templates':
+                    self._replace_template_variables(conn, [r for _, r in stored])
+                if journal and stored:
+                    self._journal(conn, kind, 'upsert', [r for _, r in stored])
+                return [r[id_column] for _, r in stored]
+
+            return self._transaction(conn, body), errors
+
+        return await self._run(write)
+
+    async def update(self, kind: str, record_id: Any, updates: Dict[str, Any],
+                     journal: bool = True) -> bool:
+        """Update columns of one record; returns False if it does not exist"""
+        spec = CATALOG_TABLES[kind]
+        columns = [c for c in updates if c not in (spec['id'], 'created_at')]
+        unknown = [c for c in columns if c not in spec['columns']]
+        if unknown:
+            raise ValueError(f"Unknown {kind} fields: {', '.join(unknown)}")
+
+        assignments = [f'"{c}" = ?' for c in columns]
+        if 'updated_at' in spec['columns'] and 'updated_at' not in columns:
+            assignments.append(f'"updated_at" = {_NOW}')
+        if not assignments:
+            return False
+        sql = f"UPDATE {spec['name']} SET {', '.join(assignments)} WHERE \"{spec['id']}\" = ?"
+        values = [_to_sqlite(kind, c, updates[c]) for c in columns] + [record_id]
+
+        def write(conn):
+            def body():
+                changed = conn.execute(sql, values).rowcount > 0
+                if changed and journal:
+                    self._journal(conn, kind, 'update', {"id": record_id, "updates": updates})
+                return changed
+            return self._transaction(conn, body)
+
+        return await self._run(write)
+
+    async def replace_mirror(self, kind: str, records: List[Dict[str, Any]]) -> int:
+        """Replace the local copy of a table with rows read from PostgreSQL"""
+        spec = CATALOG_TABLES[kind]
+        sql = self._insert_sql(kind, upsert=False, mirror=True)
+        rows = [self._row(kind, record, mirror=True) for record in records]
+
+        def write(conn):
+            def body():
+                conn.execute(f"DELETE FROM {spec['name']}")
+                conn.executemany(sql, rows)
+            self._transaction(conn, body)
+
+        await self._run(write)
+        return len(rows)
+
+    # ==================== REPLAY JOURNAL ====================
+
+    async def pending_journal(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Oldest pending journal entries, payloads decoded"""
+        def query(conn):
+            rows = conn.execute(
+                "SELECT seq, kind, operation, payload, created_at FROM replay_journal "
+                "WHERE status = 'pending' ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+            return [dict(row, payload=json.loads(row['payload'])) for row in rows]
+        return await self._run(query)
+
+    async def acknowledge(self, seq: int):
+        """Remove a journal entry once it has been applied to PostgreSQL"""
+        def write(conn):
+            if conn.execute("DELETE FROM replay_journal WHERE seq = ?", (seq,)).rowcount:
+                self._pending = max((self._pending or 1) - 1, 0)
+        await self._run(write)
+
+    async def mark_failed(self, seq: int, error: str):
+        """Keep an entry PostgreSQL rejected for inspection, but stop replaying it"""
+        def write(conn):
+            if conn.execute(
+                "UPDATE replay_journal SET status = 'failed', error = ? "
+                "WHERE seq = ? AND status = 'pending'", (error, seq)
+            ).rowcount:
+                self._pending = max((self._pending or 1) - 1, 0)
+        await self._run(write)
+
+    async def failed_journal(self) -> List[Dict[str, Any]]:
+        """Journal entries PostgreSQL rejected during replay"""
+        def query(conn):
+            rows = conn.execute(
+                "SELECT seq, kind, operation, payload, error, created_at FROM replay_journal "
+                "WHERE status = 'failed' ORDER BY seq"
+            ).fetchall()
+            return [dict(row, payload=json.loads(row['payload'])) for row in rows]
+        return await self._run(query)
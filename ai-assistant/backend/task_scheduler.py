@@ -0,0 +1,407 @@
+"""
+Priority-Aware Task Scheduler for Orchestrated Tasks
+Weighted fair queueing across task priorities with admission against a rolling token budget
+
+@author: Dr. Sarah Chen - Senior Backend/Systems Architect
+@architecture: Scheduler - one queue per TaskPriority, start-time fair queueing on token cost
+@business_logic: Interactive work is served ahead of batch jobs without starving them, and
+                 upstream token spend stays within resource_limits["max_tokens_per_minute"]
+@testing: Unit tests for ordering, fairness, budget admission and the submit/poll/stream API
+@integration: Used by the /ai/orchestrated endpoints in main.py
+"""
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Share of the token budget each priority receives while all are busy
+DEFAULT_PRIORITY_WEIGHTS: Dict[str, float] = {
+    "critical": 16,
+    "high": 8,
+    "medium": 4,
+    "low": 2,
+    "background": 1,
+}
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+class SchedulerFullError(Exception):
+    """Raised when a priority queue has no room for another task"""
+
+
+def priority_key(priority: Any) -> str:
+    """Normalize a TaskPriority member or priority name to a queue key"""
+    name = getattr(priority, "name", priority)
+    return str(name).lower()
+
+
+@dataclass
+class ScheduledTask:
+    """A task submitted to the scheduler and its lifecycle state"""
+    task_id: str
+    priority: str
+    estimated_tokens: int
+    func: Callable[[], Awaitable[Any]] = field(repr=False)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    exception: Optional[BaseException] = field(default=None, repr=False)
+    tokens_used: Optional[int] = None
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+    _runner: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Serializable snapshot for the poll/stream API"""
+        snapshot = {
+            "task_id": self.task_id,
+            "priority": self.priority,
+            "status": self.status,
+            "estimated_tokens": self.estimated_tokens,
+            "tokens_used": self.tokens_used,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_wait_ms": (
+                int((self.started_at - self.submitted_at) * 1000) if self.started_at else None
+            ),
+            "error": self.error,
+            "metadata": self.metadata,
+        }
+        if include_result:
+            snapshot["result"] = self.result
+        return snapshot
+
+
+class RollingTokenBudget:
+    """
+    Tokens admitted over the last window_seconds
+
+    The limit is read through a callable on every check, so changes to
+    resource_limits apply immediately.
+    """
+
+    def __init__(self, limit: Callable[[], int], window_seconds: float = 60.0):
+        self._limit = limit
+        self.window_seconds = window_seconds
+        self._entries: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit())
+
+    def _expire(self, now: float):
+        while self._entries and self._entries[0][0] <= now - self.window_seconds:
+            self._used -= self._entries.popleft()[1]
+
+    def used(self) -> int:
+        self._expire(time.monotonic())
+        return self._used
+
+    def wait_time(self, tokens: int) -> float:
+        """Seconds until tokens fit in the window (0 if they fit now)"""
+        now = time.monotonic()
+        self._expire(now)
+        limit = self.limit
+        # A task larger than the whole budget is admitted into an empty window
+        needed = min(tokens, limit)
+        if self._used + needed <= limit:
+            return 0.0
+        freed = 0
+        for stamp, amount in self._entries:
+            freed += amount
+            if self._used - freed + needed <= limit:
+                return max(0.0, stamp + self.window_seconds - now)
+        return self.window_seconds
+
+    def record(self, tokens: int):
+        """Charge tokens (negative amounts refund an over-estimate)"""
+        if tokens:
+            self._entries.append((time.monotonic(), tokens))
+            self._used += tokens
+
+
+class PriorityTaskScheduler:
+    """
+    Dispatches queued tasks by weighted fair share, within a token budget
+
+    Each priority has a FIFO queue and a virtual pass value. The dispatcher
+    starts the head task of the non-empty queue with the lowest pass and
+    advances that pass by estimated_tokens / weight, so over time each busy
+    priority receives tokens in proportion to its weight and even the lowest
+    priority keeps making progress. A queue that was idle restarts at the
+    current virtual time instead of banking credit. A task is only started
+    when its estimate fits the rolling token budget and fewer than
+    max_concurrent tasks are running.
+    """
+
+    def __init__(
+        self,
+        token_limit: Callable[[], int],
+        max_concurrent: Union[int, Callable[[], int]] = 4,
+        weights: Optional[Dict[str, float]] = None,
+        max_queued_per_priority: int = 1000,
+        result_ttl: float = 600.0,
+        window_seconds: float = 60.0
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            token_limit: Callable returning the tokens allowed per window
+            max_concurrent: Running task cap, or a callable (e.g. the upstream limiter's limit)
+            weights: Relative share per priority name
+            max_queued_per_priority: Queue capacity per priority
+            result_ttl: Seconds finished tasks stay available for polling
+            window_seconds: Length of the rolling token window
+        """
+        self.weights = dict(weights or DEFAULT_PRIORITY_WEIGHTS)
+        self.budget = RollingTokenBudget(token_limit, window_seconds)
+        self._max_concurrent = max_concurrent
+        self.max_queued_per_priority = max_queued_per_priority
+        self.result_ttl = result_ttl
+
+        self._queues: Dict[str, Deque[ScheduledTask]] = {p: deque() for p in self.weights}
+        self._pass: Dict[str, float] = {p: 0.0 for p in self.weights}
+        self._virtual_time = 0.0
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._running = 0
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._sequence = itertools.count()
+
+        self.metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "budget_waits": 0,
+            "started_by_priority": {p: 0 for p in self.weights},
+        }
+
+    @property
+    def max_concurrent(self) -> int:
+        limit = self._max_concurrent
+        return max(1, int(limit() if callable(limit) else limit))
+
+    # ==================== LIFECYCLE ====================
+
+    def start(self):
+        """Start the dispatcher on the running event loop"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch_loop())
+
+    async def stop(self):
+        """Stop dispatching and cancel running tasks"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        for task in list(self._tasks.values()):
+            if task._runner and not task._runner.done():
+                task._runner.cancel()
+
+    # ==================== SUBMIT / POLL / STREAM ====================
+
+    def submit(self, func: Callable[[], Awaitable[Any]], priority: Any = "medium",
+               estimated_tokens: int = 1000, task_id: Optional[str] = None,
+               metadata: Optional[Dict[str, Any]] = None) -> ScheduledTask:
+        """
+        Queue a task and return immediately
+
+        Raises:
+            ValueError: Unknown priority
+            SchedulerFullError: The priority's queue is at capacity
+        """
+        key = priority_key(priority)
+        if key not in self._queues:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(self.weights)}")
+        queue = self._queues[key]
+        if len(queue) >= self.max_queued_per_priority:
+            self.metrics["rejected"] += 1
+            raise SchedulerFullError(f"{key} queue is full ({self.max_queued_per_priority} tasks)")
+
+        self._prune()
+        task = ScheduledTask(
+            task_id=task_id or f"task_{uuid.uuid4().hex[:12]}",
+            priority=key,
+            estimated_tokens=max(0, int(estimated_tokens)),
+            func=func,
+            metadata=metadata or {},
+        )
+        if not queue:
+            # Idle queues do not bank credit while empty
+            self._pass[key] = max(self._pass[key], self._virtual_time)
+        queue.append(task)
+        self._tasks[task.task_id] = task
+        self.metrics["submitted"] += 1
+        self.start()
+        self._wakeup.set()
+        return task
+
+    def get(self, task_id: str) -> Optional[ScheduledTask]:
+        return self._tasks.get(task_id)
+
+    def queue_position(self, task_id: str) -> Optional[int]:
+        """0-based position of a queued task within its priority queue"""
+        task = self._tasks.get(task_id)
+        if task is None or task.status != "queued":
+            return None
+        for position, queued in enumerate(self._queues[task.priority]):
+            if queued is task:
+                return position
+        return None
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> ScheduledTask:
+        """Wait until a task finishes"""
+        task = self._tasks[task_id]
+        async with task._changed:
+            await asyncio.wait_for(
+                task._changed.wait_for(lambda: task.status in TERMINAL_STATUSES), timeout
+            )
+        return task
+
+    async def stream(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a snapshot on every status change until the task finishes"""
+        task = self._tasks[task_id]
+        last = None
+        while True:
+            async with task._changed:
+                await task._changed.wait_for(lambda: task.status != last)
+                last = task.status
+                snapshot = task.to_dict(include_result=last in TERMINAL_STATUSES)
+            yield snapshot
+            if last in TERMINAL_STATUSES:
+                return
+
+    def refund(self, task_id: str) -> bool:
+        """Return a running task's token reservation when it gives up before calling upstream"""
+        task = self._tasks.get(task_id)
+        if task is None or task.status != "running" or task.tokens_used is not None:
+            return False
+        task.tokens_used = 0
+        self.budget.record(-task.estimated_tokens)
+        return True
+
+    async def cancel(self, task_id: str) -> bool:
+        """Cancel a queued or running task"""
+        task = self._tasks.get(task_id)
+        if task is None or task.status in TERMINAL_STATUSES:
+            return False
+        if task.status == "queued":
+            self._queues[task.priority].remove(task)
+            await self._finish(task, "cancelled")
+        elif task._runner:
+            task._runner.cancel()
+        return True
+
+    # ==================== DISPATCH ====================
+
+    async def _dispatch_loop(self):
+        while True:
+            timeout = self._dispatch_ready()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_ready(self) -> Optional[float]:
+        """Start every task that may run now; return seconds to the next budget opening"""
+        while self._running < self.max_concurrent:
+            busy = [p for p, queue in self._queues.items() if queue]
+            if not busy:
+                return None
+            key = min(busy, key=lambda p: (self._pass[p], -self.weights[p]))
+            task = self._queues[key][0]
+            wait = self.budget.wait_time(task.estimated_tokens)
+            if wait > 0:
+                # Head-of-line wait keeps large tasks from being starved by small ones
+                self.metrics["budget_waits"] += 1
+                return wait
+
+            self._queues[key].popleft()
+            self._virtual_time = self._pass[key]
+            self._pass[key] += max(task.estimated_tokens, 1) / self.weights[key]
+            self.budget.record(task.estimated_tokens)
+            self.metrics["started_by_priority"][key] += 1
+            self._running += 1
+            task.status = "running"
+            task.started_at = time.time()
+            task._runner = asyncio.get_running_loop().create_task(self._run(task))
+            task._runner.add_done_callback(lambda _, task=task: self._on_done(task))
+        return None
+
+    async def _run(self, task: ScheduledTask):
+        async with task._changed:
+            task._changed.notify_all()
+        try:
+            result = await task.func()
+        except asyncio.CancelledError:
+            await self._finish(task, "cancelled")
+        except Exception as e:
+            logger.error(f"Scheduled task {task.task_id} failed: {e}")
+            task.error = str(e)
+            task.exception = e
+            await self._finish(task, "failed")
+        else:
+            task.result = result
+            used = result.get("tokens_used") if isinstance(result, dict) else None
+            if isinstance(used, int):
+                # Settle the estimate against actual usage
+                task.tokens_used = used
+                self.budget.record(used - task.estimated_tokens)
+            await self._finish(task, "completed")
+
+    def _on_done(self, task: ScheduledTask):
+        self._running -= 1
+        self._wakeup.set()
+        if task.status == "running":
+            # Cancelled before its coroutine started
+            asyncio.get_running_loop().create_task(self._finish(task, "cancelled"))
+
+    async def _finish(self, task: ScheduledTask, status: str):
+        task.status = status
+        task.finished_at = time.time()
+        self.metrics[status] += 1
+        async with task._changed:
+            task._changed.notify_all()
+
+    def _prune(self):
+        """Forget finished tasks older than result_ttl"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            task_id for task_id, task in self._tasks.items()
+            if task.status in TERMINAL_STATUSES and task.finished_at < cutoff
+        ]
+        for task_id in expired:
+            del self._tasks[task_id]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depths, running count and token budget usage"""
+        return {
+            **self.metrics,
+            "started_by_priority": dict(self.metrics["started_by_priority"]),
+            "queue_depth": {p: len(queue) for p, queue in self._queues.items()},
+            "running": self._running,
+            "max_concurrent": self.max_concurrent,
+            "tokens_used_in_window": self.budget.used(),
+            "token_limit": self.budget.limit,
+            "weights": dict(self.weights),
+        }
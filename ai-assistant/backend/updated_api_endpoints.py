@@ -4,10 +4,15 @@ Replaces mock implementations with actual database queries
 """
 
 from fastapi import APIRouter, HTTPException, Query, Depends
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Dict, Any, Optional, AsyncIterator
+from datetime import datetime, date
+from decimal import Decimal
+import json
+import zlib
 from database_service import db_service, DatabaseService
+from catalog_schema import projected_columns
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,13 +29,70 @@ async def get_db():
     """Dependency to ensure database is connected
     
     IMPORTANT: We no longer try to reconnect on every call.
-    If the database is not connected, we use the mock fallback.
-    The circuit breaker prevents repeated connection attempts.
+    If the database is not connected, the offline SQLite store is used
+    and a background task reconnects and replays offline writes.
     """
     # Just return the service - it handles its own connection state
-    # and falls back to mock data when not connected
+    # and falls back to the offline store when not connected
     return db_service
 
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated fields= projection into column names"""
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(',') if f.strip()]
+
+# ==================== EXPORT HELPERS ====================
+
+def _json_default(value: Any):
+    """Serialize database types that json.dumps does not handle"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+async def ndjson_stream(rows: AsyncIterator[Dict[str, Any]], compress: bool = False,
+                        batch_size: int = 100) -> AsyncIterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON, optionally gzip-compressed
+    
+    Rows are pulled from the source only as the client consumes the
+    response, so a slow reader slows the database cursor instead of
+    growing a buffer.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    lines: List[str] = []
+    
+    def encode(chunk_lines: List[str]) -> bytes:
+        chunk = ("\n".join(chunk_lines) + "\n").encode()
+        return compressor.compress(chunk) if compressor else chunk
+        
+    async for row in rows:
+        lines.append(json.dumps(row, default=_json_default))
+        if len(lines) >= batch_size:
+            chunk = encode(lines)
+            lines = []
+            if chunk:
+                yield chunk
+                
+    tail = encode(lines) if lines else b""
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+def export_response(name: str, rows: AsyncIterator[Dict[str, Any]], compress: bool) -> StreamingResponse:
+    """Wrap a row stream in an NDJSON (or gzipped NDJSON) download"""
+    filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    if compress:
+        filename += ".gz"
+    return StreamingResponse(
+        ndjson_stream(rows, compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # ==================== MODELS ====================
 
 class RuleCreate(BaseModel):
@@ -78,6 +140,58 @@ class TemplateCreate(BaseModel):
     variables: List[str] = []
     tags: List[str] = []
     created_by: str = "system"
+    variables_detail: Optional[List[Dict[str, Any]]] = None
+
+class BulkImportRequest(BaseModel):
+    records: List[Dict[str, Any]] = Field(..., max_length=50000)
+
+# ==================== BULK HELPERS ====================
+
+async def bulk_import(model, id_field: str, records: List[Dict[str, Any]], upsert) -> Dict[str, Any]:
+    """
+    Validate each record against its create model, bulk upsert the valid
+    ones and report per-row errors and superseded duplicates indexed into
+    the original request.
+    """
+    valid = []
+    positions = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            valid.append(model.model_validate(record).model_dump())
+            positions.append(index)
+        except ValidationError as e:
+            errors.append({
+                "index": index,
+                "id": record.get(id_field) if isinstance(record, dict) else None,
+                "error": "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                )
+            })
+            
+    result = await upsert(valid)
+    
+    # Map database error indexes back onto the request
+    for error in result["errors"]:
+        error["index"] = positions[error["index"]]
+    errors.extend(result["errors"])
+    errors.sort(key=lambda err: err["index"])
+    duplicates = result.get("duplicates", [])
+    for duplicate in duplicates:
+        duplicate["index"] = positions[duplicate["index"]]
+        duplicate["superseded_by"] = positions[duplicate["superseded_by"]]
+    
+    return {
+        "success": not errors,
+        "received": len(records),
+        "upserted": result["upserted"],
+        "failed": len(errors),
+        "superseded": len(duplicates),
+        "method": result["method"],
+        "errors": errors,
+        "duplicates": duplicates
+    }
 
 # ==================== RULES ENDPOINTS ====================
 
@@ -86,27 +200,39 @@ async def get_rules(
     category: Optional[str] = None,
     severity: Optional[str] = None,
     active_only: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: DatabaseService = Depends(get_db)
 ):
     """
-    Get all rules from database with optional filters
+    Get rules from database with optional filters
     
     - **category**: Filter by category (e.g., 'security', 'performance')
     - **severity**: Filter by severity (critical, high, medium, low)
     - **active_only**: Only return active rules (default: true)
+    - **limit**: Page size; omit to return every matching rule
+    - **cursor**: next_cursor from the previous page
+    - **fields**: Comma-separated columns to return (rule_id is always included)
     """
     try:
-        rules = await db.get_rules(
+        page = await db.get_rules_page(
             category=category,
             severity=severity,
-            active_only=active_only
+            active_only=active_only,
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields)
         )
         
         return {
             "success": True,
-            "count": len(rules),
-            "rules": rules
+            "count": len(page['items']),
+            "rules": page['items'],
+            "next_cursor": page['next_cursor']
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get rules: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -128,6 +254,37 @@ async def create_rule(
         logger.error(f"Failed to create rule: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@rules_router.get("/export")
+async def export_rules(
+    category: Optional[str] = None,
+    severity: Optional[str] = None,
+    active_only: bool = False,
+    fields: Optional[str] = None,
+    gzip: bool = False,
+    db: DatabaseService = Depends(get_db)
+):
+    """Stream rules as NDJSON ordered by rule_id (gzip=true for a .ndjson.gz download)"""
+    try:
+        # Validate the projection before the response starts streaming
+        projected_columns('rules', parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = db.iter_rules(category=category, severity=severity,
+                         active_only=active_only, fields=parse_fields(fields))
+    return export_response("rules", rows, gzip)
+
+@rules_router.post("/bulk")
+async def bulk_import_rules(
+    request: BulkImportRequest,
+    db: DatabaseService = Depends(get_db)
+):
+    """Insert or update many rules in one transaction, reporting per-row errors"""
+    try:
+        return await bulk_import(RuleCreate, 'rule_id', request.records, db.bulk_upsert_rules)
+    except Exception as e:
+        logger.error(f"Failed to bulk import rules: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @rules_router.put("/{rule_id}")
 async def update_rule(
     rule_id: str,
@@ -160,34 +317,11 @@ async def update_rule(
 
 @rules_router.get("/stats")
 async def get_rules_statistics(db: DatabaseService = Depends(get_db)):
-    """Get statistics about rules in the system"""
+    """Get statistics about rules in the system (aggregated in SQL)"""
     try:
-        all_rules = await db.get_rules(active_only=False)
-        active_rules = [r for r in all_rules if r.get('active', False)]
-        
-        # Group by category
-        by_category = {}
-        for rule in active_rules:
-            cat = rule.get('category_name', 'Unknown')
-            by_category[cat] = by_category.get(cat, 0) + 1
-            
-        # Group by severity
-        by_severity = {}
-        for rule in active_rules:
-            sev = rule.get('severity', 'unknown')
-            by_severity[sev] = by_severity.get(sev, 0) + 1
-            
         return {
             "success": True,
-            "statistics": {
-                "total_rules": len(all_rules),
-                "active_rules": len(active_rules),
-                "inactive_rules": len(all_rules) - len(active_rules),
-                "by_category": by_category,
-                "by_severity": by_severity,
-                "critical_count": by_severity.get('critical', 0),
-                "mandatory_count": len([r for r in active_rules if r.get('enforcement') == 'mandatory'])
-            }
+            "statistics": await db.get_rules_statistics()
         }
     except Exception as e:
         logger.error(f"Failed to get rules statistics: {e}")
@@ -199,25 +333,37 @@ async def get_rules_statistics(db: DatabaseService = Depends(get_db)):
 async def get_best_practices(
     category: Optional[str] = None,
     required_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: DatabaseService = Depends(get_db)
 ):
     """
-    Get all best practices from database
+    Get best practices from database
     
     - **category**: Filter by category
     - **required_only**: Only return required practices
+    - **limit**: Page size; omit to return every matching practice
+    - **cursor**: next_cursor from the previous page
+    - **fields**: Comma-separated columns to return (practice_id is always included)
     """
     try:
-        practices = await db.get_best_practices(
+        page = await db.get_best_practices_page(
             category=category,
-            required_only=required_only
+            required_only=required_only,
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields)
         )
         
         return {
             "success": True,
-            "count": len(practices),
-            "practices": practices
+            "count": len(page['items']),
+            "practices": page['items'],
+            "next_cursor": page['next_cursor']
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get best practices: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -239,35 +385,40 @@ async def create_best_practice(
         logger.error(f"Failed to create best practice: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@practices_router.get("/export")
+async def export_practices(
+    category: Optional[str] = None,
+    fields: Optional[str] = None,
+    gzip: bool = False,
+    db: DatabaseService = Depends(get_db)
+):
+    """Stream best practices as NDJSON ordered by practice_id"""
+    try:
+        projected_columns('practices', parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = db.iter_best_practices(category=category, fields=parse_fields(fields))
+    return export_response("practices", rows, gzip)
+
+@practices_router.post("/bulk")
+async def bulk_import_practices(
+    request: BulkImportRequest,
+    db: DatabaseService = Depends(get_db)
+):
+    """Insert or update many best practices in one transaction, reporting per-row errors"""
+    try:
+        return await bulk_import(BestPracticeCreate, 'practice_id', request.records, db.bulk_upsert_practices)
+    except Exception as e:
+        logger.error(f"Failed to bulk import best practices: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @practices_router.get("/stats")
 async def get_practices_statistics(db: DatabaseService = Depends(get_db)):
-    """Get statistics about best practices"""
+    """Get statistics about best practices (aggregated in SQL)"""
     try:
-        all_practices = await db.get_best_practices()
-        required = [p for p in all_practices if p.get('is_required', False)]
-        
-        # Group by category
-        by_category = {}
-        for practice in all_practices:
-            cat = practice.get('category_name', 'Unknown')
-            by_category[cat] = by_category.get(cat, 0) + 1
-            
-        # Group by priority
-        by_priority = {}
-        for practice in all_practices:
-            pri = practice.get('priority', 'None')
-            by_priority[pri] = by_priority.get(pri, 0) + 1
-            
         return {
             "success": True,
-            "statistics": {
-                "total_practices": len(all_practices),
-                "required_practices": len(required),
-                "optional_practices": len(all_practices) - len(required),
-                "by_category": by_category,
-                "by_priority": by_priority,
-                "critical_count": by_priority.get('P0-CRITICAL', 0)
-            }
+            "statistics": await db.get_practices_statistics()
         }
     except Exception as e:
         logger.error(f"Failed to get practices statistics: {e}")
@@ -278,17 +429,35 @@ async def get_practices_statistics(db: DatabaseService = Depends(get_db)):
 @templates_router.get("/")
 async def get_templates(
     category: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: DatabaseService = Depends(get_db)
 ):
-    """Get all templates from database"""
+    """
+    Get templates from database
+    
+    - **category**: Filter by category
+    - **limit**: Page size; omit to return every matching template
+    - **cursor**: next_cursor from the previous page
+    - **fields**: Comma-separated columns to return, e.g. name,category to skip template_content
+    """
     try:
-        templates = await db.get_templates(category=category)
+        page = await db.get_templates_page(
+            category=category,
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields)
+        )
         
         return {
             "success": True,
-            "count": len(templates),
-            "templates": templates
+            "count": len(page['items']),
+            "templates": page['items'],
+            "next_cursor": page['next_cursor']
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get templates: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -310,35 +479,40 @@ async def create_template(
         logger.error(f"Failed to create template: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@templates_router.get("/export")
+async def export_templates(
+    category: Optional[str] = None,
+    fields: Optional[str] = None,
+    gzip: bool = False,
+    db: DatabaseService = Depends(get_db)
+):
+    """Stream templates as NDJSON ordered by template_id"""
+    try:
+        projected_columns('templates', parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = db.iter_templates(category=category, fields=parse_fields(fields))
+    return export_response("templates", rows, gzip)
+
+@templates_router.post("/bulk")
+async def bulk_import_templates(
+    request: BulkImportRequest,
+    db: DatabaseService = Depends(get_db)
+):
+    """Insert or update many templates in one transaction, reporting per-row errors"""
+    try:
+        return await bulk_import(TemplateCreate, 'template_id', request.records, db.bulk_upsert_templates)
+    except Exception as e:
+        logger.error(f"Failed to bulk import templates: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @templates_router.get("/stats")
 async def get_templates_statistics(db: DatabaseService = Depends(get_db)):
-    """Get statistics about templates"""
+    """Get statistics about templates (aggregated in SQL)"""
     try:
-        all_templates = await db.get_templates()
-        
-        # Group by category
-        by_category = {}
-        for template in all_templates:
-            cat = template.get('category_name', 'Unknown')
-            by_category[cat] = by_category.get(cat, 0) + 1
-            
-        # Most used templates
-        most_used = sorted(
-            all_templates,
-            key=lambda t: t.get('usage_count', 0),
-            reverse=True
-        )[:5]
-        
         return {
             "success": True,
-            "statistics": {
-                "total_templates": len(all_templates),
-                "by_category": by_category,
-                "most_used": [
-                    {"name": t['name'], "usage_count": t.get('usage_count', 0)}
-                    for t in most_used
-                ]
-            }
+            "statistics": await db.get_templates_statistics()
         }
     except Exception as e:
         logger.error(f"Failed to get templates statistics: {e}")
@@ -377,7 +551,7 @@ async def get_sessions(
 ):
     """Get all sessions with pagination"""
     try:
-        # Return mock sessions for now
+        # Return mock sessions for now; there is no session table to page through yet
         return {
             "sessions": [],
             "total": 0,
@@ -42,6 +42,7 @@ The following are intentionally exposed for external use:
 - GovernanceResult: Result structure for outcomes
 - GovernanceException: Base exception class
 - RuntimeGovernanceSystem: Runtime AI governance
+- RateLimiter: Token/API call budgets for runtime governance
 - GovernanceMonitor: Real-time monitoring
 
 Internal Components (use with caution):
@@ -90,6 +91,7 @@ from .runtime_governance import (
     GovernanceLevel,
     AgentContext
 )
+from .rate_limiter import RateLimiter, RateLimitDecision, RateLimitExceeded
 
 # Monitoring and visibility
 from .governance_monitor import (
@@ -119,6 +121,9 @@ __all__ = [
     'HookType',
     'GovernanceLevel',
     'AgentContext',
+    'RateLimiter',
+    'RateLimitDecision',
+    'RateLimitExceeded',
     
     # Monitoring
     'GovernanceMonitor',
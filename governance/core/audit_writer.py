@@ -0,0 +1,316 @@
+"""
+@fileoverview Append-only JSONL segment log for governance audit events
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance audit persistence
+@responsibility Append batches of audit events to size-bounded segment files and rotate them
+@dependencies json, pathlib, datetime, queue, threading
+@integration_points RuntimeGovernanceSystem audit pipeline, GovernanceEngine._audit_log
+@testing_strategy Unit tests for batching, rotation, retention and the background flush thread against a temp directory
+@governance The audit trail is append-only; old segments are only removed past an explicit retention count
+
+Business Logic Summary:
+- One open segment at a time, appended in whole batches
+- A new segment starts once the current one reaches max_segment_bytes
+- Only the newest max_segments segments are kept (None keeps every segment)
+- BufferedAuditWriter queues events for synchronous callers and fsyncs every N events or T seconds
+
+Architecture Integration:
+- Called from the single audit writer task via asyncio.to_thread
+- GovernanceEngine instances share one BufferedAuditWriter per audit directory
+- Segment names are <prefix>_<YYYYMMDD>_<HHMMSS>_<pid>_<n>.jsonl, so processes sharing a directory
+  never append to the same file; retention only touches names of that exact shape, so other files in
+  the directory (e.g. legacy daily audit_YYYYMMDD.jsonl) are never removed
+
+Sarah's Framework Check:
+- What breaks first: Disk full or unwritable audit directory
+- How we know: write_errors in get_status() and error logs
+- Plan B: Events stay in the in-memory ring buffer
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSegmentWriter:
+    """
+    Writes audit events as JSON lines into rotating segment files
+
+    Not thread-safe: a single writer (task or thread) owns each instance.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str = "runtime_audit",
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        max_segments: Optional[int] = 20
+    ):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self._segment_name = re.compile(rf"{re.escape(prefix)}_\d{{8}}_\d{{6}}_\d+_\d{{4,}}\.jsonl")
+        self._file: Optional[IO[str]] = None
+        self._path: Optional[Path] = None
+        self._size = 0
+        self._counter = 0
+        self.events_written = 0
+        self.batches_written = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+    def segments(self) -> List[Path]:
+        """Segment files written by this prefix, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            path for path in self.directory.glob(f"{self.prefix}_*.jsonl")
+            if self._segment_name.fullmatch(path.name)
+        )
+
+    def write_batch(self, events: List[Dict[str, Any]]) -> int:
+        """Append events as one write; returns bytes written"""
+        if not events:
+            return 0
+        lines = []
+        for event in events:
+            try:
+                lines.append(json.dumps(event, default=str) + "\n")
+            except (TypeError, ValueError) as e:
+                self.write_errors += 1
+                logger.error(f"Dropping unserializable audit event: {e}")
+        if not lines:
+            return 0
+        payload = "".join(lines)
+        try:
+            if self._file is None or self._size >= self.max_segment_bytes:
+                self._rotate()
+            self._file.write(payload)
+            self._file.flush()
+        except OSError as e:
+            self.write_errors += 1
+            logger.error(f"Failed to write {len(lines)} audit events: {e}")
+            return 0
+        written = len(payload.encode("utf-8"))
+        self._size += written
+        self.events_written += len(lines)
+        self.batches_written += 1
+        return written
+
+    def sync(self):
+        """Force written data to disk"""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self.rotations += 1
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._counter += 1
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._path = self.directory / f"{self.prefix}_{stamp}_{os.getpid()}_{self._counter:04d}.jsonl"
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._size = self._path.stat().st_size
+
+        # Retention: keep the newest max_segments files
+        if self.max_segments is None:
+            return
+        for old in self.segments()[:-self.max_segments]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove old audit segment {old}: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "current_segment": self._path.name if self._path else None,
+            "current_segment_bytes": self._size,
+            "segments": len(self.segments()),
+            "events_written": self.events_written,
+            "batches_written": self.batches_written,
+            "rotations": self.rotations,
+            "write_errors": self.write_errors,
+        }
+
+
+_STOP = object()
+
+
+class BufferedAuditWriter:
+    """
+    Queue in front of an AuditSegmentWriter, drained by a background thread
+
+    write() never touches the disk. The flush thread appends whole batches
+    and fsyncs once fsync_every events are pending or fsync_interval
+    seconds have passed since the last sync (0 disables either trigger).
+    The thread starts on the first write and again after close().
+    """
+
+    def __init__(
+        self,
+        writer: AuditSegmentWriter,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        fsync_every: int = 1000,
+        fsync_interval: float = 1.0,
+        max_queue: int = 100_000
+    ):
+        """
+        Initialize buffered writer
+
+        Args:
+            writer: Segment writer owned by the flush thread from now on
+            batch_size: Events appended per write
+            flush_interval: Seconds the thread waits for more events before writing
+            fsync_every: Sync after this many unsynced events
+            fsync_interval: Sync when unsynced events are this many seconds old
+            max_queue: Queued events beyond this are dropped (and counted)
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.events_queued = 0
+        self.events_dropped = 0
+        self.fsyncs = 0
+
+    def write(self, event: Dict[str, Any]):
+        """Queue one event for the flush thread"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.events_dropped += 1
+            logger.warning("Audit queue full; event dropped")
+            return
+        self.events_queued += 1
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="governance-audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._maybe_sync()
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            events = [event for event in batch if event is not _STOP]
+            stopping = len(events) != len(batch)
+            try:
+                self.writer.write_batch(events)
+                self._unsynced += len(events)
+                self._maybe_sync(force=stopping)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _maybe_sync(self, force: bool = False):
+        if not self._unsynced:
+            return
+        due = force \
+            or (self.fsync_every and self._unsynced >= self.fsync_every) \
+            or (self.fsync_interval and time.monotonic() - self._last_sync >= self.fsync_interval)
+        if not due:
+            return
+        try:
+            self.writer.sync()
+        except OSError as e:
+            logger.error(f"Failed to sync audit segment: {e}")
+            return
+        self.fsyncs += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self):
+        """Block until every queued event has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write and sync everything queued, stop the thread and close the segment"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(_STOP)
+                self._thread.join()
+            self._thread = None
+            self.writer.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            **self.writer.get_status(),
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queue_depth": self.queue_depth,
+            "events_queued": self.events_queued,
+            "events_dropped": self.events_dropped,
+            "fsyncs": self.fsyncs,
+        }
+
+
+_shared_writers: Dict[Path, BufferedAuditWriter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_audit_writer(directory: Path, prefix: str = "engine_audit", **options: Any) -> BufferedAuditWriter:
+    """
+    One BufferedAuditWriter per directory and prefix for the whole process
+
+    Options apply only when the writer is first created. Shared writers
+    are flushed and closed at interpreter exit.
+    """
+    key = Path(directory).resolve() / prefix
+    with _shared_lock:
+        writer = _shared_writers.get(key)
+        if writer is None:
+            segment_options = {k: options.pop(k) for k in ("max_segment_bytes", "max_segments") if k in options}
+            writer = BufferedAuditWriter(AuditSegmentWriter(directory, prefix=prefix, **segment_options), **options)
+            _shared_writers[key] = writer
+        return writer
+
+
+@atexit.register
+def close_shared_audit_writers():
+    """Flush and close every shared writer"""
+    with _shared_lock:
+        writers = list(_shared_writers.values())
+    for writer in writers:
+        writer.close()
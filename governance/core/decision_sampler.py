@@ -0,0 +1,186 @@
+"""
+@fileoverview Sampling policy for MONITOR-level decision validation
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Runtime governance observability
+@responsibility Decide which decisions get validated in MONITOR mode and extrapolate outcomes to all traffic
+@dependencies random, collections, typing
+@integration_points RuntimeGovernanceSystem.validate_ai_decision, AIDecisionInjector.intercept_decision
+@testing_strategy Seeded unit tests for the fraction, forced types, reservoirs and estimates
+@governance High-risk decision types are never sampled out
+
+Business Logic Summary:
+- Only active while its enabled() callback says so (MONITOR level)
+- High-risk decision types are always validated
+- Other decisions are validated with probability rate
+- Each agent keeps a uniform reservoir of its validated outcomes
+- Counts of unvalidated traffic are estimated from the sampled outcomes
+
+Architecture Integration:
+- Callers ask should_validate() first and report outcomes with record()
+- get_status() feeds the governance metrics endpoints
+
+Sarah's Framework Check:
+- What breaks first: Estimate accuracy for agents with little traffic
+- How we know: validated vs seen counts are reported next to every estimate
+- Plan B: Raise the rate or switch the level to WARNING for full validation
+"""
+
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_ALWAYS_VALIDATE = frozenset({"security", "deployment", "architecture"})
+
+
+def _type_name(decision_type: Any) -> str:
+    """DecisionType members and plain strings both map to their value"""
+    return str(getattr(decision_type, "value", decision_type)).lower()
+
+
+class _AgentSample:
+    """Counters and reservoir for one agent"""
+
+    __slots__ = ("seen", "forced", "sampled", "forced_rejected", "sampled_rejected", "reservoir")
+
+    def __init__(self):
+        self.seen = 0
+        self.forced = 0
+        self.sampled = 0
+        self.forced_rejected = 0
+        self.sampled_rejected = 0
+        self.reservoir: List[Dict[str, Any]] = []
+
+    @property
+    def validated(self) -> int:
+        return self.forced + self.sampled
+
+    def estimated_rejected(self) -> float:
+        """Forced rejections are exact; sampled ones scale to the unforced traffic"""
+        unforced_seen = self.seen - self.forced
+        if not self.sampled:
+            return float(self.forced_rejected)
+        return self.forced_rejected + self.sampled_rejected * unforced_seen / self.sampled
+
+
+class DecisionSampler:
+    """
+    Sampling policy for decision validation
+
+    Estimates use the observed sampling ratio per agent (decisions seen vs
+    sampled among non-forced types), not the nominal rate, so they stay
+    unbiased when the rate is changed at runtime.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.1,
+        always_validate: Iterable[str] = DEFAULT_ALWAYS_VALIDATE,
+        reservoir_size: int = 50,
+        enabled: Callable[[], bool] = lambda: True,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize sampler
+
+        Args:
+            rate: Fraction of non-forced decisions to validate (0.0 - 1.0)
+            always_validate: Decision type values that are always validated
+            reservoir_size: Validated outcomes kept per agent
+            enabled: Sampling applies only while this returns True
+            seed: Seed for reproducible sampling
+        """
+        self.rate = rate
+        self.always_validate = {_type_name(t) for t in always_validate}
+        self.reservoir_size = reservoir_size
+        self.enabled = enabled
+        self._random = random.Random(seed)
+        self._agents: Dict[str, _AgentSample] = {}
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float):
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Sampling rate must be between 0 and 1, got {value}")
+        self._rate = value
+
+    @property
+    def active(self) -> bool:
+        return bool(self.enabled())
+
+    def should_validate(self, agent_id: str, decision_type: Any) -> bool:
+        """
+        Count the decision and decide whether it gets validated
+
+        Returns True when sampling is inactive, so callers can ask unconditionally.
+        """
+        if not self.active:
+            return True
+        agent = self._agents.setdefault(agent_id, _AgentSample())
+        agent.seen += 1
+        if _type_name(decision_type) in self.always_validate:
+            agent.forced += 1
+            return True
+        if self._random.random() < self._rate:
+            agent.sampled += 1
+            return True
+        return False
+
+    def record(self, agent_id: str, decision_type: Any, approved: bool, risk_level: Any = None):
+        """Report the outcome of a decision that should_validate() selected"""
+        agent = self._agents.get(agent_id)
+        if agent is None or not self.active:
+            return
+        if not approved:
+            if _type_name(decision_type) in self.always_validate:
+                agent.forced_rejected += 1
+            else:
+                agent.sampled_rejected += 1
+
+        # Algorithm R: every validated outcome has equal chance to be in the reservoir
+        outcome = {
+            "decision_type": _type_name(decision_type),
+            "approved": approved,
+            "risk_level": _type_name(risk_level) if risk_level is not None else None
+        }
+        if len(agent.reservoir) < self.reservoir_size:
+            agent.reservoir.append(outcome)
+        else:
+            slot = self._random.randrange(agent.validated)
+            if slot < self.reservoir_size:
+                agent.reservoir[slot] = outcome
+
+    def reservoir(self, agent_id: str) -> List[Dict[str, Any]]:
+        agent = self._agents.get(agent_id)
+        return list(agent.reservoir) if agent else []
+
+    def forget(self, agent_id: str):
+        self._agents.pop(agent_id, None)
+
+    def get_status(self) -> Dict[str, Any]:
+        seen = sum(a.seen for a in self._agents.values())
+        validated = sum(a.validated for a in self._agents.values())
+        rejected = sum(a.estimated_rejected() for a in self._agents.values())
+        return {
+            "active": self.active,
+            "rate": self._rate,
+            "always_validate": sorted(self.always_validate),
+            "seen": seen,
+            "validated": validated,
+            "skipped": seen - validated,
+            "estimated": {
+                "rejected": round(rejected, 1),
+                "approved": round(seen - rejected, 1),
+                "rejection_rate": round(rejected / seen, 4) if seen else None
+            },
+            "agents": {
+                agent_id: {
+                    "seen": agent.seen,
+                    "validated": agent.validated,
+                    "estimated_rejected": round(agent.estimated_rejected(), 1),
+                    "reservoir": len(agent.reservoir)
+                }
+                for agent_id, agent in self._agents.items()
+            }
+        }
@@ -3,14 +3,14 @@
 @author Dr. Sarah Chen v1.5 - 2025-08-29
 @architecture Backend - Core governance orchestration engine
 @responsibility Orchestrate governance validation, manage rule execution, coordinate personas
-@dependencies logging, pathlib, context, result, exceptions modules
+@dependencies logging, pathlib, context, result, exceptions, rule_table, audit_writer modules
 @integration_points Personas, validators, rules, hooks, storage systems
 @testing_strategy Unit tests for pipeline, integration tests for full validation flow
 @governance Central orchestration point for all governance operations
 
 Business Logic Summary:
 - Orchestrate governance validation pipeline
-- Load and manage validation rules
+- Load and manage validation rules (built-in lists plus governance/definitions files)
 - Coordinate persona invocations
 - Aggregate validation results
 - Handle validation errors and timeouts
@@ -31,12 +31,16 @@ Sarah's Framework Check:
 
 import time
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List
 from pathlib import Path
 
 from .context import GovernanceContext
 from .result import GovernanceResult, ValidationResult
 from .exceptions import GovernanceError, ValidationError
+from .audit_writer import shared_audit_writer
+from .rule_table import MISSING, MatchCache, RuleTable, RuleTableLoader, context_fingerprint
 
 
 # Configure logging
@@ -62,25 +66,82 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class DecisionWindow:
+    """
+    Sliding count of decisions over window_seconds, in bucket_seconds buckets
+    
+    Buckets are [start, decisions, approvals] with running totals, so
+    recording and reading are O(1) amortized and memory is bounded by
+    window_seconds / bucket_seconds. The window is exact to one bucket.
+    """
+    
+    def __init__(self, window_seconds: int, bucket_seconds: int):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self._buckets: Deque[List[int]] = deque()
+        self.decisions = 0
+        self.approvals = 0
+    
+    def _expire(self, now: float):
+        oldest = int(now) - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= oldest:
+            _, decisions, approvals = self._buckets.popleft()
+            self.decisions -= decisions
+            self.approvals -= approvals
+    
+    def record(self, now: float, approved: bool):
+        self._expire(now)
+        start = int(now) - int(now) % self.bucket_seconds
+        if not self._buckets or self._buckets[-1][0] != start:
+            self._buckets.append([start, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        self.decisions += 1
+        if approved:
+            bucket[2] += 1
+            self.approvals += 1
+    
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self._expire(now)
+        return {
+            'decisions': self.decisions,
+            'approvals': self.approvals,
+            'approval_rate': self.approvals / self.decisions if self.decisions else 0.0
+        }
+
+
 class GovernanceEngine:
     """
     Main governance orchestration engine.
     This is the minimal version that we'll enhance incrementally.
     """
     
-    def __init__(self, config_path: Optional[Path] = None):
+    def __init__(self, config_path: Optional[Path] = None, reload_interval: float = 2.0,
+                 cache_size: int = 1024, history_size: int = 1000,
+                 audit_dir: Optional[Path] = None, audit_max_segments: Optional[int] = None):
         """
         Initialize the governance engine.
         
         Args:
-            config_path: Path to configuration directory
+            config_path: Path to configuration directory (rule definition files)
+            reload_interval: Seconds between checks for changed definition files
+            cache_size: Rule matches memoized by context fingerprint (0 disables)
+            history_size: Recent decisions kept in decision_history
+            audit_dir: Directory for engine_audit_*.jsonl segments (shared writer per directory)
+            audit_max_segments: Newest segments to keep; None (default) never deletes audit files
         """
         self.config_path = config_path or Path("governance/definitions")
         self.evaluation_count = 0
         self.start_time = time.time()
         
-        # Track decisions for metrics
-        self.decision_history = []
+        # Track decisions for metrics: recent entries in a ring, totals and
+        # sliding windows maintained incrementally so get_metrics is O(1)
+        self.decision_history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._decision_counts: Dict[str, int] = {}
+        self._total_decisions = 0
+        self._last_minute = DecisionWindow(window_seconds=60, bucket_seconds=1)
+        self._last_hour = DecisionWindow(window_seconds=3600, bucket_seconds=60)
+        self._history_lock = threading.Lock()
         
         # Simple rules for initial testing
         self.rules = {
@@ -89,19 +150,57 @@ class GovernanceEngine:
             "auto_approve": ["documentation", "typo_fix"]
         }
         
+        # Built-in lists and definition files compile into one dispatch table
+        self.rule_loader = RuleTableLoader(self.config_path, self._builtin_rules, poll_interval=reload_interval)
+        self.rule_loader.reload()
+        self.match_cache = MatchCache(max_size=cache_size)
+        self.cache_bypasses = 0
+        self.batch_duplicates = 0
+        
+        # Audit entries go through a background writer; evaluate never opens files
+        self.audit_writer = shared_audit_writer(audit_dir or Path(".governance/audit"),
+                                                prefix="engine_audit", max_segments=audit_max_segments)
+        
         logger.info(f"Governance Engine initialized with config path: {self.config_path}")
     
+    @property
+    def rule_table(self) -> RuleTable:
+        """Current compiled rule table, reloaded if definition files changed"""
+        return self.rule_loader.maybe_reload()
+    
     def evaluate(self, context: GovernanceContext) -> GovernanceResult:
         """
         Evaluate governance rules for the given context.
         This is the main entry point for governance evaluation.
         
+        The matching rule is memoized by the context fields the rules read;
+        set context.bypass_cache to force a fresh match.
+        
         Args:
             context: The governance context to evaluate
             
         Returns:
             GovernanceResult with the decision
         """
+        return self._evaluate(context)
+    
+    def evaluate_many(self, contexts: List[GovernanceContext]) -> List[GovernanceResult]:
+        """
+        Evaluate a batch, matching rules once per distinct fingerprint.
+        
+        Every context still gets its own result, history entry and audit
+        records; contexts with bypass_cache are matched individually.
+        
+        Args:
+            contexts: Governance contexts to evaluate
+            
+        Returns:
+            Results in the same order as contexts
+        """
+        batch: Dict[Any, Any] = {}
+        return [self._evaluate(context, batch) for context in contexts]
+    
+    def _evaluate(self, context: GovernanceContext, batch: Optional[Dict[Any, Any]] = None) -> GovernanceResult:
         start_time = time.time()
         self.evaluation_count += 1
         
@@ -111,15 +210,10 @@ class GovernanceEngine:
         self._audit_log("evaluation_start", context, None)
         
         try:
-            # Simple rule evaluation for now
-            result = self._evaluate_simple_rules(context)
+            result = self._evaluate_simple_rules(context, batch)
             
             # Track decision
-            self.decision_history.append({
-                'decision': result.decision,
-                'operation_type': context.operation_type,
-                'timestamp': time.time()
-            })
+            self._record_decision(result.decision, context.operation_type)
             
             # Calculate execution time
             execution_time = (time.time() - start_time) * 1000
@@ -146,85 +240,153 @@ class GovernanceEngine:
                 context_id=context.operation_id
             )
     
-    def _evaluate_simple_rules(self, context: GovernanceContext) -> GovernanceResult:
+    def _evaluate_simple_rules(self, context: GovernanceContext,
+                               batch: Optional[Dict[Any, Any]] = None) -> GovernanceResult:
         """
-        Simple rule evaluation for initial testing.
-        This will be replaced with more sophisticated evaluation.
+        Evaluate the compiled rule table; the highest-priority match decides.
         """
-        operation = context.operation_type
-        
-        # Check dangerous operations
-        if operation in self.rules["dangerous_operations"]:
-            return GovernanceResult(
-                decision="rejected",
-                reason=f"Operation '{operation}' is marked as dangerous",
-                confidence=1.0,
-                evidence=[f"Operation {operation} is in dangerous list"]
-            )
-        
-        # Check if review required
-        if operation in self.rules["requires_review"]:
-            return GovernanceResult(
-                decision="review",
-                reason=f"Operation '{operation}' requires review",
-                confidence=0.8,
-                evidence=[f"Operation {operation} requires human review"],
-                recommendations=["Please get approval from team lead"]
-            )
+        rule = self._match(context, batch)
+        if rule is None:
+            # Unreachable while the built-in default rule exists
+            return GovernanceResult(decision="approved", confidence=0.5)
+        return rule.to_result(context)
+    
+    def _match(self, context: GovernanceContext, batch: Optional[Dict[Any, Any]] = None):
+        """
+        Find the deciding rule, through the batch memo and the match cache.
         
-        # Check auto-approve
-        if operation in self.rules["auto_approve"]:
-            return GovernanceResult(
-                decision="approved",
-                confidence=1.0,
-                evidence=[f"Operation {operation} is pre-approved"]
-            )
+        Only the matched rule is cached; results are rebuilt per context so
+        callers never share a mutable GovernanceResult.
+        """
+        table = self.rule_table
+        if context.bypass_cache:
+            self.cache_bypasses += 1
+            return table.match(context)
         
-        # Check payload for specific patterns
-        if "test" in context.operation_type.lower():
-            # Test operations get approved with lower confidence
-            return GovernanceResult(
-                decision="approved",
-                confidence=0.7,
-                evidence=["Test operation detected"]
-            )
+        key = context_fingerprint(context, table.fields_read)
+        if batch is not None and key in batch:
+            self.batch_duplicates += 1
+            return batch[key]
         
-        # Default: approve with medium confidence
-        return GovernanceResult(
-            decision="approved",
-            confidence=0.5,
-            evidence=["No specific rules matched, defaulting to approval"],
-            recommendations=["Consider adding specific rules for this operation type"]
-        )
+        if self.match_cache.max_size <= 0:
+            rule = table.match(context)
+        else:
+            rule = self.match_cache.get(table.version, key)
+            if rule is MISSING:
+                rule = table.match(context)
+                self.match_cache.put(table.version, key, rule)
+        if batch is not None:
+            batch[key] = rule
+        return rule
+    
+    def _builtin_rules(self) -> List[Dict[str, Any]]:
+        """
+        Rule definitions for the in-code lists. Definition files default to
+        priority 0, so they override the test heuristic and the default but
+        not the explicit dangerous/review/auto-approve lists.
+        """
+        return [
+            {
+                "id": "builtin:dangerous_operations",
+                "operation_type": list(self.rules["dangerous_operations"]),
+                "decision": "rejected",
+                "reason": "Operation '{operation_type}' is marked as dangerous",
+                "confidence": 1.0,
+                "evidence": ["Operation {operation_type} is in dangerous list"],
+                "priority": 1000
+            },
+            {
+                "id": "builtin:requires_review",
+                "operation_type": list(self.rules["requires_review"]),
+                "decision": "review",
+                "reason": "Operation '{operation_type}' requires review",
+                "confidence": 0.8,
+                "evidence": ["Operation {operation_type} requires human review"],
+                "recommendations": ["Please get approval from team lead"],
+                "priority": 900
+            },
+            {
+                "id": "builtin:auto_approve",
+                "operation_type": list(self.rules["auto_approve"]),
+                "decision": "approved",
+                "confidence": 1.0,
+                "evidence": ["Operation {operation_type} is pre-approved"],
+                "priority": 800
+            },
+            {
+                # Test operations get approved with lower confidence
+                "id": "builtin:test_operation",
+                "operation_type": "*",
+                "when": [{"field": "operation_type", "matches": "(?i)test"}],
+                "decision": "approved",
+                "confidence": 0.7,
+                "evidence": ["Test operation detected"],
+                "priority": -100
+            },
+            {
+                "id": "builtin:default",
+                "operation_type": "*",
+                "decision": "approved",
+                "confidence": 0.5,
+                "evidence": ["No specific rules matched, defaulting to approval"],
+                "recommendations": ["Consider adding specific rules for this operation type"],
+                "priority": -1000
+            }
+        ]
+    
+    def _record_decision(self, decision: str, operation_type: str):
+        """Append to the history ring and update counters and windows"""
+        now = time.time()
+        approved = decision == 'approved'
+        with self._history_lock:
+            self.decision_history.append({
+                'decision': decision,
+                'operation_type': operation_type,
+                'timestamp': now
+            })
+            self._decision_counts[decision] = self._decision_counts.get(decision, 0) + 1
+            self._total_decisions += 1
+            self._last_minute.record(now, approved)
+            self._last_hour.record(now, approved)
     
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get engine metrics.
         """
-        uptime = time.time() - self.start_time
+        now = time.time()
+        uptime = now - self.start_time
         
-        # Calculate approval rate
-        if self.decision_history:
-            approvals = sum(1 for d in self.decision_history if d['decision'] == 'approved')
-            approval_rate = approvals / len(self.decision_history)
-        else:
-            approval_rate = 0.0
+        with self._history_lock:
+            total = self._total_decisions
+            approvals = self._decision_counts.get('approved', 0)
+            last_minute = self._last_minute.snapshot(now)
+            last_hour = self._last_hour.snapshot(now)
+            recent = len(self.decision_history)
+            by_type = self._count_decisions_by_type()
         
         return {
             'evaluation_count': self.evaluation_count,
             'uptime_seconds': uptime,
-            'approval_rate': approval_rate,
-            'total_decisions': len(self.decision_history),
-            'decisions_by_type': self._count_decisions_by_type()
+            'approval_rate': approvals / total if total else 0.0,
+            'total_decisions': total,
+            'recent_decisions': recent,
+            'decisions_by_type': by_type,
+            'decisions_per_minute': last_minute['decisions'],
+            'decisions_per_hour': last_hour['decisions'],
+            'last_minute': last_minute,
+            'last_hour': last_hour,
+            'rule_table': self.rule_loader.get_status(),
+            'audit': self.audit_writer.get_status(),
+            'cache': {
+                **self.match_cache.get_stats(),
+                'bypasses': self.cache_bypasses,
+                'batch_duplicates': self.batch_duplicates
+            }
         }
     
     def _count_decisions_by_type(self) -> Dict[str, int]:
         """Count decisions by type"""
-        counts = {}
-        for decision in self.decision_history:
-            decision_type = decision['decision']
-            counts[decision_type] = counts.get(decision_type, 0) + 1
-        return counts
+        return dict(self._decision_counts)
     
     def add_rule(self, rule_type: str, value: str):
         """
@@ -237,6 +399,7 @@ class GovernanceEngine:
         if rule_type in self.rules:
             if value not in self.rules[rule_type]:
                 self.rules[rule_type].append(value)
+                self.rule_loader.reload()
                 logger.info(f"Added rule: {rule_type} -> {value}")
         else:
             logger.warning(f"Unknown rule type: {rule_type}")
@@ -251,18 +414,14 @@ class GovernanceEngine:
         """
         if rule_type in self.rules and value in self.rules[rule_type]:
             self.rules[rule_type].remove(value)
+            self.rule_loader.reload()
             logger.info(f"Removed rule: {rule_type} -> {value}")
     
     def _audit_log(self, event_type: str, context: GovernanceContext, result: Optional[GovernanceResult]):
         """
-        Write audit log entry
+        Queue audit log entry
         """
-        audit_dir = Path(".governance/audit")
-        audit_dir.mkdir(parents=True, exist_ok=True)
-        
-        audit_file = audit_dir / f"audit_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        
-        audit_entry = {
+        self.audit_writer.write({
             'timestamp': datetime.now().isoformat(),
             'event_type': event_type,
             'operation_id': context.operation_id,
@@ -272,14 +431,15 @@ class GovernanceEngine:
             'decision': result.decision if result else None,
             'confidence': result.confidence if result else None,
             'reason': result.reason if result else None
-        }
-        
-        try:
-            import json
-            with open(audit_file, 'a') as f:
-                f.write(json.dumps(audit_entry) + '\n')
-        except Exception as e:
-            logger.error(f"Failed to write audit log: {e}")
+        })
+    
+    def flush_audit_log(self):
+        """Block until queued audit entries are written"""
+        self.audit_writer.flush()
+    
+    def close(self):
+        """Write and sync pending audit entries and release the segment file"""
+        self.audit_writer.close()
     
     def __str__(self) -> str:
         """String representation"""
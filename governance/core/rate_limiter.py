@@ -0,0 +1,264 @@
+"""
+@fileoverview Token-bucket enforcement of per-minute token and API call limits
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Runtime governance rate limiting
+@responsibility Debit token and API call budgets per agent and globally, and report wait times
+@dependencies time, threading, dataclasses
+@integration_points RuntimeGovernanceSystem.validate_agent_execution, upstream model calls in main.py
+@testing_strategy Unit tests with a controllable clock for refill, rejection, settlement and hot updates
+@governance Keeps cost and throughput within resource_limits when many agents run at once
+
+Business Logic Summary:
+- One global bucket each for tokens and API calls
+- One bucket pair per agent, created on first use
+- A request is debited from every applicable bucket or from none
+- Rejections carry the seconds until the request would fit
+
+Architecture Integration:
+- Capacities come from RuntimeGovernanceSystem.resource_limits
+- update_resource_limits reconfigures buckets in place
+- Actual token usage is settled against the estimate after a call
+
+Sarah's Framework Check:
+- What breaks first: Global token bucket under many concurrent agents
+- How we know: retry_after hints and limited counters in get_status()
+- Plan B: Raise limits at runtime via update_resource_limits without restart
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# resource_limits keys -> (bucket kind, scope)
+LIMIT_KEYS = {
+    "max_tokens_per_minute": ("tokens", "global"),
+    "max_api_calls_per_minute": ("api_calls", "global"),
+    "max_tokens_per_agent_per_minute": ("tokens", "agent"),
+    "max_api_calls_per_agent_per_minute": ("api_calls", "agent"),
+}
+
+
+class RateLimitExceeded(Exception):
+    """Raised by callers that cannot wait out a rate limit"""
+
+    def __init__(self, decision: "RateLimitDecision"):
+        super().__init__(decision.reason)
+        self.decision = decision
+        self.retry_after = decision.retry_after
+
+
+class TokenBucket:
+    """
+    Bucket holding up to capacity units, refilled continuously at capacity per period
+
+    Refill is computed lazily from elapsed time, so every operation is O(1).
+    A request larger than the whole capacity is allowed once the bucket is
+    full and leaves it in debt, rather than being rejected forever.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Units refilled per second"""
+        return self.capacity / self.period
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.tokens < self.capacity:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be debited (0 if it can be now)"""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (needed - self.tokens) / self.rate
+
+    def debit(self, amount: float):
+        self.tokens -= amount
+
+    def credit(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def reconfigure(self, capacity: float):
+        """Change capacity, keeping the current level (capped at the new capacity)"""
+        self._refill()
+        self.capacity = float(capacity)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a debit attempt"""
+    allowed: bool
+    retry_after: float = 0.0
+    limit: Optional[str] = None  # e.g. "max_tokens_per_minute" when rejected
+    scope: Optional[str] = None  # "global" or "agent"
+
+    @property
+    def reason(self) -> str:
+        if self.allowed:
+            return "Within rate limits"
+        return f"Rate limit {self.limit} reached ({self.scope}); retry in {self.retry_after:.1f}s"
+
+
+class RateLimiter:
+    """
+    Global and per-agent token buckets for tokens and API calls
+
+    Thread-safe; all checks and debits take one short lock.
+    """
+
+    def __init__(self, limits: Dict[str, Any], period: float = 60.0):
+        self.period = period
+        self._lock = threading.Lock()
+        self._limits: Dict[str, float] = {}
+        self._global: Dict[str, TokenBucket] = {}
+        self._agents: Dict[str, Dict[str, TokenBucket]] = {}
+        self.stats = {"allowed": 0, "limited": 0, "limited_by": {key: 0 for key in LIMIT_KEYS}}
+        self.configure(limits)
+
+    def configure(self, limits: Dict[str, Any]):
+        """Apply capacities from resource_limits; missing per-agent limits fall back to the global ones"""
+        with self._lock:
+            for key in LIMIT_KEYS:
+                value = limits.get(key)
+                if value is None and LIMIT_KEYS[key][1] == "agent":
+                    value = limits.get(key.replace("_per_agent", ""))
+                if value is not None:
+                    self._limits[key] = float(value)
+
+            for key, (kind, scope) in LIMIT_KEYS.items():
+                if key not in self._limits:
+                    continue
+                if scope == "global":
+                    if kind in self._global:
+                        self._global[kind].reconfigure(self._limits[key])
+                    else:
+                        self._global[kind] = TokenBucket(self._limits[key], self.period)
+                else:
+                    for buckets in self._agents.values():
+                        if kind in buckets:
+                            buckets[kind].reconfigure(self._limits[key])
+
+    def _agent_buckets(self, agent_id: str) -> Dict[str, TokenBucket]:
+        buckets = self._agents.get(agent_id)
+        if buckets is None:
+            buckets = self._agents[agent_id] = {}
+            for key, (kind, scope) in LIMIT_KEYS.items():
+                if scope == "agent" and key in self._limits:
+                    buckets[kind] = TokenBucket(self._limits[key], self.period)
+        return buckets
+
+    def _applicable(self, agent_id: Optional[str]) -> List[Tuple[str, str, TokenBucket]]:
+        applicable = [
+            (key, scope, self._global[kind])
+            for key, (kind, scope) in LIMIT_KEYS.items()
+            if scope == "global" and kind in self._global
+        ]
+        if agent_id is not None:
+            buckets = self._agent_buckets(agent_id)
+            applicable += [
+                (key, scope, buckets[kind])
+                for key, (kind, scope) in LIMIT_KEYS.items()
+                if scope == "agent" and kind in buckets
+            ]
+        return applicable
+
+    def acquire(self, agent_id: Optional[str] = None, tokens: int = 0,
+                api_calls: int = 1) -> RateLimitDecision:
+        """
+        Debit tokens and API calls from the global and agent buckets, or from none
+
+        Returns:
+            RateLimitDecision with retry_after set to the longest wait when rejected
+        """
+        amounts = {"tokens": tokens, "api_calls": api_calls}
+        with self._lock:
+            worst = RateLimitDecision(allowed=True)
+            applicable = self._applicable(agent_id)
+            for key, scope, bucket in applicable:
+                amount = amounts[LIMIT_KEYS[key][0]]
+                if amount <= 0:
+                    continue
+                wait = bucket.wait_time(amount)
+                if wait > worst.retry_after:
+                    worst = RateLimitDecision(False, wait, key, scope)
+
+            if not worst.allowed:
+                self.stats["limited"] += 1
+                self.stats["limited_by"][worst.limit] += 1
+                return worst
+
+            for key, _, bucket in applicable:
+                amount = amounts[LIMIT_KEYS[key][0]]
+                if amount > 0:
+                    bucket.debit(amount)
+            self.stats["allowed"] += 1
+            return worst
+
+    async def wait(self, agent_id: Optional[str] = None, tokens: int = 0, api_calls: int = 1,
+                   timeout: Optional[float] = None) -> RateLimitDecision:
+        """Retry acquire after each wait hint until it succeeds or the timeout would be exceeded"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            decision = self.acquire(agent_id, tokens, api_calls)
+            if decision.allowed:
+                return decision
+            if deadline is not None and time.monotonic() + decision.retry_after > deadline:
+                return decision
+            await asyncio.sleep(decision.retry_after)
+
+    def settle(self, agent_id: Optional[str], estimated_tokens: int, actual_tokens: int):
+        """Correct a token debit once the actual usage is known"""
+        difference = actual_tokens - estimated_tokens
+        if not difference:
+            return
+        with self._lock:
+            for key, _, bucket in self._applicable(agent_id):
+                if LIMIT_KEYS[key][0] != "tokens":
+                    continue
+                if difference > 0:
+                    bucket.debit(difference)
+                else:
+                    bucket.credit(-difference)
+
+    def remove_agent(self, agent_id: str):
+        with self._lock:
+            self._agents.pop(agent_id, None)
+
+    def get_status(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Capacities, current levels and limit counters"""
+        with self._lock:
+            status = {
+                "limits": dict(self._limits),
+                "global_available": {
+                    kind: round(bucket.available(), 1) for kind, bucket in self._global.items()
+                },
+                "tracked_agents": len(self._agents),
+                "allowed": self.stats["allowed"],
+                "limited": self.stats["limited"],
+                "limited_by": dict(self.stats["limited_by"]),
+            }
+            if agent_id is not None and agent_id in self._agents:
+                status["agent_available"] = {
+                    kind: round(bucket.available(), 1)
+                    for kind, bucket in self._agents[agent_id].items()
+                }
+            return status
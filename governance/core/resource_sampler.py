@@ -0,0 +1,182 @@
+"""
+@fileoverview Shared process-level resource sampler for governed agents
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Runtime governance resource monitoring
+@responsibility Read RSS and CPU of every agent process in one pass and keep a short window per agent
+@dependencies asyncio, psutil (optional), dataclasses
+@integration_points RuntimeGovernanceSystem.register_agent, terminate_agent, resource limit enforcement
+@testing_strategy Unit tests against the test process itself and with fake readings
+@governance Real resource usage is what max_memory_per_agent and max_cpu_per_agent are checked against
+
+Business Logic Summary:
+- One background task samples all tracked agents every interval
+- Each agent's process tree (root plus children) is summed
+- Rolling window of recent samples per agent
+- Exited processes are reported so they can be cleaned up
+
+Architecture Integration:
+- RuntimeGovernanceSystem tracks agents that registered with a pid
+- Every pass is handed to a callback that updates usage and enforces limits
+- The task stops itself when no agents are tracked
+
+Sarah's Framework Check:
+- What breaks first: Sampling pass time with many agents and deep process trees
+- How we know: last_pass_ms in get_status()
+- Plan B: Raise the interval; without psutil sampling is disabled and logged
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResourceSample:
+    """Resource reading for one agent's process tree"""
+    timestamp: float
+    rss_bytes: int
+    cpu_percent: float  # Percent of one core, summed over the process tree
+    process_count: int
+
+
+class AgentResourceSampler:
+    """
+    Single sampler task for all agent processes
+
+    psutil reports CPU since the previous reading of the same Process
+    object, so Process objects are cached per pid between passes; a newly
+    seen process reads 0% on its first pass.
+    """
+
+    def __init__(
+        self,
+        on_sample: Callable[[Dict[str, Optional[ResourceSample]]], Any],
+        interval: float = 10.0,
+        window: int = 6
+    ):
+        """
+        Initialize sampler
+
+        Args:
+            on_sample: Called after every pass with agent_id -> sample (None if the process exited)
+            interval: Seconds between passes
+            window: Samples kept per agent
+        """
+        self.on_sample = on_sample
+        self.interval = interval
+        self.window = window
+        self._roots: Dict[str, int] = {}
+        self._processes: Dict[str, Dict[int, Any]] = {}
+        self._samples: Dict[str, Deque[ResourceSample]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.passes = 0
+        self.last_pass_ms = 0.0
+
+    @property
+    def available(self) -> bool:
+        return PSUTIL_AVAILABLE
+
+    def track(self, agent_id: str, pid: int):
+        """Start sampling an agent's process tree"""
+        if not PSUTIL_AVAILABLE:
+            logger.warning(f"psutil not installed; resource sampling disabled for agent {agent_id}")
+            return
+        self._roots[agent_id] = pid
+        self._processes[agent_id] = {}
+        self._samples[agent_id] = deque(maxlen=self.window)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def untrack(self, agent_id: str):
+        self._roots.pop(agent_id, None)
+        self._processes.pop(agent_id, None)
+        self._samples.pop(agent_id, None)
+
+    def samples(self, agent_id: str) -> List[ResourceSample]:
+        return list(self._samples.get(agent_id, ()))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while self._roots:
+            try:
+                await self.sample_once()
+            except Exception as e:
+                logger.error(f"Resource sampling pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sample_once(self) -> Dict[str, Optional[ResourceSample]]:
+        """Sample every tracked agent in one pass and hand the results to on_sample"""
+        started = time.perf_counter()
+        snapshot = [(agent_id, pid, self._processes[agent_id]) for agent_id, pid in self._roots.items()]
+        readings = await asyncio.to_thread(self._read_all, snapshot)
+
+        for agent_id, sample in readings.items():
+            if sample is not None and agent_id in self._samples:
+                self._samples[agent_id].append(sample)
+        self.passes += 1
+        self.last_pass_ms = (time.perf_counter() - started) * 1000
+
+        result = self.on_sample(readings)
+        if asyncio.iscoroutine(result):
+            await result
+        return readings
+
+    def _read_all(self, snapshot: List[Tuple[str, int, Dict[int, Any]]]) -> Dict[str, Optional[ResourceSample]]:
+        now = time.time()
+        return {agent_id: self._read_tree(pid, cache, now) for agent_id, pid, cache in snapshot}
+
+    @staticmethod
+    def _read_tree(pid: int, cache: Dict[int, Any], now: float) -> Optional[ResourceSample]:
+        try:
+            root = cache.get(pid) or psutil.Process(pid)
+            tree = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+        seen = {}
+        rss = 0
+        cpu = 0.0
+        for process in tree:
+            process = cache.get(process.pid, process)
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            seen[process.pid] = process
+        # Forget exited children, keep the rest for the next CPU reading
+        cache.clear()
+        cache.update(seen)
+        if pid not in seen:
+            return None
+        return ResourceSample(timestamp=now, rss_bytes=rss, cpu_percent=cpu, process_count=len(seen))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "available": PSUTIL_AVAILABLE,
+            "running": self._task is not None and not self._task.done(),
+            "tracked_agents": len(self._roots),
+            "interval_seconds": self.interval,
+            "passes": self.passes,
+            "last_pass_ms": round(self.last_pass_ms, 2),
+        }
@@ -0,0 +1,495 @@
+"""
+@fileoverview Declarative governance rules compiled into an indexed dispatch table
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Core governance rule evaluation
+@responsibility Load rule definitions, compile payload predicates and dispatch by operation type/subtype
+@dependencies re, yaml, json, pathlib, threading
+@integration_points GovernanceEngine.evaluate, governance/definitions/*.yaml
+@testing_strategy Unit tests for compilation, dispatch order and hot reload; tests/performance/bench_rule_table.py
+@governance Rule definitions change governance behaviour without a code change
+
+Business Logic Summary:
+- Rules match an operation_type (or "*") and optionally an operation_subtype
+- Optional "when" predicates test context fields (payload.*, metadata.*, actor, ...)
+- The highest-priority matching rule decides; ties keep definition order
+- Definition files are re-read when their mtimes change
+
+Architecture Integration:
+- RuleTable is immutable; reloads build a new table and swap one reference
+- Candidate lists per (type, subtype) are merged once and memoized
+- Each table carries a version and the context fields its rules read
+- MatchCache memoizes matches by a fingerprint of exactly those fields
+
+Sarah's Framework Check:
+- What breaks first: A malformed definition file during reload
+- How we know: ConfigurationError logged with the rule id; reload_errors and last_error in status
+- Plan B: The last good definitions stay active until the files parse again
+
+Definition format (YAML or JSON):
+    rules:
+      - id: block-force-push-main
+        operation_type: git_push          # string, list, or "*"
+        operation_subtype: force          # optional
+        when:                             # optional, all must hold
+          - field: payload.branch
+            in: [main, master]
+        decision: rejected                # approved | rejected | review
+        reason: "Force push to {operation_type} is blocked"   # {operation_type}, {operation_subtype}, {actor}
+        confidence: 1.0
+        evidence: ["..."]
+        recommendations: ["..."]
+        priority: 500                     # higher wins, default 0
+"""
+
+import json
+import logging
+import re
+import string
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from .context import GovernanceContext
+from .exceptions import ConfigurationError
+from .result import GovernanceResult
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = "*"
+DECISIONS = ("approved", "rejected", "review")
+DEFINITION_SUFFIXES = (".yaml", ".yml", ".json")
+# Context fields a reason or evidence template may reference
+TEMPLATE_FIELDS = ("operation_type", "operation_subtype", "actor")
+
+MISSING = object()
+
+
+def _resolve(context: GovernanceContext, path: str) -> Any:
+    """Read a dotted field path (e.g. payload.branch) from the context"""
+    head, _, rest = path.partition(".")
+    value = getattr(context, head, MISSING)
+    for part in rest.split(".") if rest else ():
+        if isinstance(value, dict):
+            value = value.get(part, MISSING)
+        else:
+            return MISSING
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _string_tuple(rule_id: str, name: str, value: Any) -> Tuple[str, ...]:
+    """A string or list-of-strings field as a tuple"""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise ConfigurationError(f"Rule {rule_id}: {name} must be a string or a list of strings, got {value!r}")
+    return tuple(value)
+
+
+def _check_template(rule_id: str, name: str, template: str):
+    """Reject reason/evidence templates that would fail when the rule matches"""
+    try:
+        fields = [f for _, f, _, _ in string.Formatter().parse(template) if f is not None]
+    except ValueError as e:
+        raise ConfigurationError(f"Rule {rule_id}: bad {name} template {template!r}: {e}")
+    unknown = [f for f in fields if f not in TEMPLATE_FIELDS]
+    if unknown:
+        raise ConfigurationError(f"Rule {rule_id}: {name} template uses {unknown}; "
+                                 f"allowed placeholders are {TEMPLATE_FIELDS}")
+    try:
+        template.format_map(dict.fromkeys(TEMPLATE_FIELDS))  # Fields may be None at match time
+    except (TypeError, ValueError) as e:
+        raise ConfigurationError(f"Rule {rule_id}: bad {name} template {template!r}: {e}")
+
+
+def _compile_predicate(spec: Dict[str, Any]) -> Tuple[str, Callable[[Any], bool]]:
+    """Turn one {field, <operator>: operand} mapping into a test on the field value"""
+    if not isinstance(spec, dict):
+        raise ConfigurationError(f"Predicate must be a mapping, got {spec!r}")
+    if "field" not in spec:
+        raise ConfigurationError(f"Predicate without 'field': {spec}")
+    if not isinstance(spec["field"], str):
+        raise ConfigurationError(f"Predicate field must be a string: {spec}")
+    operators = [key for key in spec if key != "field"]
+    if len(operators) != 1:
+        raise ConfigurationError(f"Predicate needs exactly one operator: {spec}")
+    op, operand = operators[0], spec[operators[0]]
+    if op in ("in", "not_in") and not isinstance(operand, (list, tuple)):
+        raise ConfigurationError(f"'{op}' needs a list operand: {spec}")
+    if op == "matches" and not isinstance(operand, str):
+        raise ConfigurationError(f"'matches' needs a string pattern: {spec}")
+    if op in ("gt", "gte", "lt", "lte") and not _is_number(operand):
+        raise ConfigurationError(f"'{op}' needs a numeric operand: {spec}")
+    if op == "contains":
+        try:
+            hash(operand)
+        except TypeError:
+            raise ConfigurationError(f"'contains' needs a scalar operand: {spec}")
+
+    if op == "equals":
+        return spec["field"], lambda v: v is not MISSING and v == operand
+    if op == "not_equals":
+        return spec["field"], lambda v: v != operand
+    if op == "in":
+        members = frozenset(operand) if all(isinstance(m, (str, int, float, bool)) for m in operand) else list(operand)
+        return spec["field"], lambda v: v is not MISSING and _member(v, members)
+    if op == "not_in":
+        members = list(operand)
+        return spec["field"], lambda v: v is MISSING or not _member(v, members)
+    if op == "contains":
+        return spec["field"], lambda v: isinstance(v, (str, list, tuple, dict, set)) and operand in v
+    if op == "matches":
+        try:
+            regex = re.compile(operand)
+        except re.error as e:
+            raise ConfigurationError(f"Bad regex {operand!r}: {e}")
+        return spec["field"], lambda v: v is not MISSING and regex.search(str(v)) is not None
+    if op == "exists":
+        return spec["field"], lambda v: (v is not MISSING) == bool(operand)
+    comparisons = {
+        "gt": lambda v: v > operand,
+        "gte": lambda v: v >= operand,
+        "lt": lambda v: v < operand,
+        "lte": lambda v: v <= operand,
+    }
+    if op in comparisons:
+        compare = comparisons[op]
+        return spec["field"], lambda v: isinstance(v, (int, float)) and not isinstance(v, bool) and compare(v)
+    raise ConfigurationError(f"Unknown predicate operator '{op}'")
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, type-tagged form of a context value (1, 1.0 and True stay distinct)"""
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()), key=lambda kv: kv[0])))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(repr(_freeze(v)) for v in value)))
+    if value is MISSING:
+        return ("missing",)
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value).__name__, repr(value))
+    return (type(value).__name__, value)
+
+
+def context_fingerprint(context: GovernanceContext, fields: Tuple[str, ...]) -> Tuple:
+    """Key for a context over the given fields; contexts differing elsewhere share it"""
+    return tuple(_freeze(_resolve(context, path)) for path in fields)
+
+
+def _member(value: Any, members: Any) -> bool:
+    try:
+        return value in members
+    except TypeError:  # Unhashable value against a frozenset
+        return False
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A rule with its predicates compiled, ready to dispatch"""
+    rule_id: str
+    operation_types: Tuple[str, ...]
+    operation_subtype: Optional[str]
+    decision: str
+    reason: Optional[str]
+    confidence: float
+    evidence: Tuple[str, ...]
+    recommendations: Tuple[str, ...]
+    priority: int
+    order: int
+    predicates: Tuple[Tuple[str, Callable[[Any], bool]], ...] = field(default=(), compare=False)
+    source: str = "builtin"
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(path for path, _ in self.predicates)
+
+    def matches(self, context: GovernanceContext) -> bool:
+        for path, test in self.predicates:
+            if not test(_resolve(context, path)):
+                return False
+        return True
+
+    def to_result(self, context: GovernanceContext) -> GovernanceResult:
+        values = {name: getattr(context, name) for name in TEMPLATE_FIELDS}
+        return GovernanceResult(
+            decision=self.decision,
+            reason=self.reason.format_map(values) if self.reason else None,
+            confidence=self.confidence,
+            evidence=[e.format_map(values) for e in self.evidence],
+            recommendations=list(self.recommendations)
+        )
+
+
+def compile_rule(spec: Dict[str, Any], order: int, source: str = "builtin") -> CompiledRule:
+    """Validate and compile one rule definition"""
+    if not isinstance(spec, dict):
+        raise ConfigurationError(f"Rule {source}#{order} must be a mapping, got {type(spec).__name__}")
+    rule_id = str(spec.get("id") or f"{source}#{order}")
+    operation_types = spec.get("operation_type")
+    if operation_types is None:
+        raise ConfigurationError(f"Rule {rule_id} has no operation_type")
+    operation_types = _string_tuple(rule_id, "operation_type", operation_types)
+    operation_subtype = spec.get("operation_subtype")
+    if operation_subtype is not None and not isinstance(operation_subtype, str):
+        raise ConfigurationError(f"Rule {rule_id}: operation_subtype must be a string, got {operation_subtype!r}")
+    decision = spec.get("decision")
+    if decision not in DECISIONS:
+        raise ConfigurationError(f"Rule {rule_id} has invalid decision {decision!r}; expected one of {DECISIONS}")
+    reason = spec.get("reason")
+    if reason is not None and not isinstance(reason, str):
+        raise ConfigurationError(f"Rule {rule_id}: reason must be a string, got {reason!r}")
+    if reason is not None:
+        _check_template(rule_id, "reason", reason)
+    evidence = _string_tuple(rule_id, "evidence", spec.get("evidence") or ())
+    for template in evidence:
+        _check_template(rule_id, "evidence", template)
+    confidence = spec.get("confidence", 1.0)
+    if not _is_number(confidence):
+        raise ConfigurationError(f"Rule {rule_id}: confidence must be a number, got {confidence!r}")
+    priority = spec.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise ConfigurationError(f"Rule {rule_id}: priority must be an integer, got {priority!r}")
+    when = spec.get("when") or ()
+    if not isinstance(when, (list, tuple)):
+        raise ConfigurationError(f"Rule {rule_id}: when must be a list of predicates, got {when!r}")
+    try:
+        predicates = tuple(_compile_predicate(p) for p in when)
+    except ConfigurationError as e:
+        raise ConfigurationError(f"Rule {rule_id}: {e}")
+    return CompiledRule(
+        rule_id=rule_id,
+        operation_types=operation_types,
+        operation_subtype=operation_subtype,
+        decision=decision,
+        reason=reason,
+        confidence=float(confidence),
+        evidence=evidence,
+        recommendations=_string_tuple(rule_id, "recommendations", spec.get("recommendations") or ()),
+        priority=priority,
+        order=order,
+        predicates=predicates,
+        source=source
+    )
+
+
+class RuleTable:
+    """
+    Immutable dispatch table of compiled rules
+
+    Rules are bucketed by (operation_type, operation_subtype) with "*" and
+    None as wildcards. A lookup merges at most four buckets, once per
+    distinct (type, subtype), and walks the merged list by priority.
+    """
+
+    def __init__(self, rules: Iterable[CompiledRule], version: int = 1):
+        self.version = version
+        self.rules = tuple(rules)
+        self._index: Dict[Tuple[str, Optional[str]], List[CompiledRule]] = {}
+        for rule in self.rules:
+            for operation_type in rule.operation_types:
+                self._index.setdefault((operation_type, rule.operation_subtype), []).append(rule)
+        self._merged: Dict[Tuple[str, Optional[str]], Tuple[CompiledRule, ...]] = {}
+        self._merge_lock = threading.Lock()
+        # Context fields any rule can read; operation type/subtype always are
+        self.fields_read = tuple(sorted(
+            {"operation_type", "operation_subtype", "actor"} | {f for r in self.rules for f in r.fields}
+        ))
+
+    def candidates(self, operation_type: str, operation_subtype: Optional[str]) -> Tuple[CompiledRule, ...]:
+        key = (operation_type, operation_subtype)
+        merged = self._merged.get(key)
+        if merged is None:
+            buckets = {(operation_type, None), (WILDCARD, None)}
+            if operation_subtype is not None:
+                buckets |= {(operation_type, operation_subtype), (WILDCARD, operation_subtype)}
+            rules = [rule for bucket in buckets for rule in self._index.get(bucket, ())]
+            merged = tuple(sorted(rules, key=lambda r: (-r.priority, r.order)))
+            with self._merge_lock:
+                if len(self._merged) < 10000:  # Bound memo growth from arbitrary operation types
+                    self._merged[key] = merged
+        return merged
+
+    def match(self, context: GovernanceContext) -> Optional[CompiledRule]:
+        for rule in self.candidates(context.operation_type, context.operation_subtype):
+            if rule.matches(context):
+                return rule
+        return None
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class MatchCache:
+    """
+    LRU of rule matches keyed by (table version, context fingerprint)
+
+    Entries from an older table version are dropped on first sight of a
+    new version, so a reload invalidates everything at once.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.version: Optional[int] = None
+        self._entries: "OrderedDict[Tuple, Optional[CompiledRule]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: int):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self.version = version
+
+    def get(self, version: int, key: Tuple) -> Any:
+        """Cached match (possibly None), or MISSING"""
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return MISSING
+
+    def put(self, version: int, key: Tuple, rule: Optional[CompiledRule]):
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = rule
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class RuleTableLoader:
+    """
+    Loads definition files and rebuilds the table when their mtimes change
+
+    Polling is throttled to poll_interval seconds, so calling
+    maybe_reload() on every evaluation costs one clock read.
+    """
+
+    def __init__(self, directory: Path, builtin: Callable[[], List[Dict[str, Any]]], poll_interval: float = 2.0):
+        self.directory = Path(directory)
+        self.builtin = builtin
+        self.poll_interval = poll_interval
+        self.table = RuleTable([], version=0)
+        self._snapshot: Dict[str, int] = {}
+        self._file_specs: List[Tuple[Dict[str, Any], str]] = []
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+
+    def _scan(self) -> Dict[str, int]:
+        if not self.directory.is_dir():
+            return {}
+        return {
+            str(path): path.stat().st_mtime_ns
+            for path in sorted(self.directory.iterdir())
+            if path.suffix in DEFINITION_SUFFIXES and path.is_file()
+        }
+
+    def maybe_reload(self) -> RuleTable:
+        """Return the current table, rebuilding it first if definitions changed"""
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return self.table
+        with self._lock:
+            self._last_poll = now
+            try:
+                snapshot = self._scan()
+            except OSError as e:
+                logger.error(f"Could not scan rule definitions in {self.directory}: {e}")
+                return self.table
+            if snapshot != self._snapshot:
+                self._rebuild(snapshot)
+        return self.table
+
+    def reload(self) -> RuleTable:
+        """Rebuild unconditionally (after add_rule/remove_rule or on demand)"""
+        with self._lock:
+            self._last_poll = time.monotonic()
+            self._rebuild(self._scan())
+        return self.table
+
+    def _rebuild(self, snapshot: Dict[str, int]):
+        self._snapshot = snapshot
+        try:
+            file_specs = [(spec, Path(path).name) for path in snapshot for spec in self._read(Path(path))]
+            rules = self._compile(file_specs)
+        except (ConfigurationError, OSError, TypeError, ValueError, yaml.YAMLError) as e:
+            # Keep the last good definitions; retry when the files change again
+            self.reload_errors += 1
+            self.last_error = str(e)
+            logger.error(f"Rule definitions not reloaded, keeping the last good files: {e}")
+            rules = self._compile(self._file_specs)
+        else:
+            self._file_specs = file_specs
+            self.last_error = None
+        self.table = RuleTable(rules, version=self.table.version + 1)
+        self.reloads += 1
+        logger.info(f"Rule table version {self.table.version}: {len(rules)} rules from {len(snapshot)} files")
+
+    def _compile(self, file_specs: List[Tuple[Dict[str, Any], str]]) -> List[CompiledRule]:
+        specs = [(spec, "builtin") for spec in self.builtin()] + file_specs
+        return [compile_rule(spec, order, source) for order, (spec, source) in enumerate(specs)]
+
+    @staticmethod
+    def _read(path: Path) -> List[Dict[str, Any]]:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+        if data is None:
+            return []
+        rules = data.get("rules") if isinstance(data, dict) else data
+        if not isinstance(rules, list):
+            raise ConfigurationError(f"{path.name}: expected a 'rules' list")
+        return rules
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "version": self.table.version,
+            "rules": len(self.table),
+            "files": len(self._snapshot),
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "last_error": self.last_error,
+        }
@@ -31,9 +31,15 @@ Sarah's Framework Check:
 import asyncio
 import json
 import logging
+import os
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable, Set
+from typing import Dict, List, Any, Optional, Callable, Deque, Set, Union
 from enum import Enum
+from itertools import islice
 from dataclasses import dataclass, field
 import traceback
 from pathlib import Path
@@ -46,6 +52,11 @@ from .exceptions import GovernanceViolation
 from ..rules.smart_rules import SmartRules
 from ..validators.basic_hallucination_detector import BasicHallucinationDetector
 from .governance_monitor import GovernanceMonitor, GovernanceEvent, GovernanceEventType
+from .rate_limiter import RateLimiter, RateLimitDecision
+from .resource_sampler import AgentResourceSampler, ResourceSample
+from .audit_writer import AuditSegmentWriter
+from .validation_pool import ValidationPool
+from .decision_sampler import DecisionSampler
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +94,7 @@ class HookType(Enum):
     POST_DECISION = "post_decision"
     AGENT_TERMINATE = "agent_terminate"
     RESOURCE_CHECK = "resource_check"
+    RESOURCE_LIMIT_EXCEEDED = "resource_limit_exceeded"
     AUDIT_LOG = "audit_log"
 
 
@@ -94,6 +106,52 @@ class GovernanceLevel(Enum):
     BYPASS = "bypass"      # Skip checks
 
 
+class HookLatencyHistogram:
+    """Fixed-bucket latency histogram for one registered hook"""
+    
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.outcomes = {"ok": 0, "error": 0, "timeout": 0}
+    
+    def observe(self, elapsed_ms: float, outcome: str):
+        self.counts[bisect_left(self.BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.outcomes[outcome] += 1
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of calls"""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets_ms": {
+                **{f"le_{bound}": count for bound, count in zip(self.BUCKETS_MS, self.counts)},
+                "le_inf": self.counts[-1]
+            },
+            **self.outcomes
+        }
+
+
 @dataclass
 class AgentContext:
     """Context for agent operations"""
@@ -127,7 +185,14 @@ class RuntimeGovernanceSystem:
     Manages hooks, validations, and real-time enforcement
     """
     
-    def __init__(self, config_path: Optional[Path] = None, enable_monitor: bool = True):
+    # CPU is judged on the window average once this many samples exist, so one spike does not trip it
+    MIN_CPU_SAMPLES = 3
+    
+    def __init__(self, config_path: Optional[Path] = None, enable_monitor: bool = True,
+                 resource_sample_interval: float = 10.0, hook_timeout: float = 2.0,
+                 audit_dir: Optional[Path] = None, audit_memory_size: int = 10000,
+                 audit_batch_size: int = 200, audit_flush_interval: float = 1.0,
+                 validation_pool: Optional[ValidationPool] = None, monitor_sample_rate: float = 0.1):
         self.config_path = config_path or Path("governance-config")
         self.governance_level = GovernanceLevel.STRICT
         
@@ -135,6 +200,13 @@ class RuntimeGovernanceSystem:
         self.engine = GovernanceEngine()
         self.smart_rules = SmartRules()
         self.hallucination_detector = BasicHallucinationDetector()
+        self.validation_pool = validation_pool or ValidationPool()
+        
+        # MONITOR mode validates a sample of decisions (high-risk types always)
+        self.decision_sampler = DecisionSampler(
+            rate=monitor_sample_rate,
+            enabled=lambda: self.governance_level == GovernanceLevel.MONITOR
+        )
         
         # Initialize monitor
         self.monitor = GovernanceMonitor(verbose=enable_monitor) if enable_monitor else None
@@ -156,6 +228,12 @@ class RuntimeGovernanceSystem:
             hook_type: [] for hook_type in HookType
         }
         
+        # Hooks run concurrently, each against a deadline; sync hooks run in a thread pool
+        self.hook_timeout = hook_timeout
+        self._hook_timeouts: Dict[Callable, float] = {}
+        self._hook_latency: Dict[str, HookLatencyHistogram] = {}
+        self._hook_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="governance-hook")
+        
         # Active agents tracking
         self.active_agents: Dict[str, AgentContext] = {}
         
@@ -165,7 +243,9 @@ class RuntimeGovernanceSystem:
             "max_memory_per_agent": 512 * 1024 * 1024,  # 512MB
             "max_cpu_per_agent": 25,  # 25% CPU
             "max_tokens_per_minute": 10000,
-            "max_api_calls_per_minute": 100
+            "max_api_calls_per_minute": 100,
+            "max_tokens_per_agent_per_minute": 4000,
+            "max_api_calls_per_agent_per_minute": 40
         }
         
         # Metrics
@@ -175,15 +255,40 @@ class RuntimeGovernanceSystem:
             "decisions_validated": 0,
             "violations_detected": 0,
             "hallucinations_caught": 0,
-            "resource_limits_hit": 0
+            "resource_limits_hit": 0,
+            "decisions_sampled_out": 0
         }
         
-        # Audit log
-        self.audit_log: List[Dict[str, Any]] = []
+        # Audit log: bounded in-memory ring with per-agent and per-event indexes
+        self.audit_log: Deque[Dict[str, Any]] = deque(maxlen=audit_memory_size)
+        self._audit_times: Deque[float] = deque(maxlen=audit_memory_size)
+        self._audit_seq = 0
+        self._audit_by_agent: Dict[str, Deque[tuple]] = {}
+        self._audit_by_event: Dict[str, Deque[tuple]] = {}
+        
+        # One writer task drains the queue in batches to JSONL segments (and AUDIT_LOG hooks)
+        audit_dir = audit_dir or os.getenv("GOVERNANCE_AUDIT_DIR")
+        self.audit_writer = AuditSegmentWriter(Path(audit_dir)) if audit_dir else None
+        self.audit_batch_size = audit_batch_size
+        self.audit_flush_interval = audit_flush_interval
+        self._audit_queue: Optional[asyncio.Queue] = None
+        self._audit_task: Optional[asyncio.Task] = None
+        self._audit_dropped = 0
+        self._audit_write_errors = 0
         
         # Load configurations
         self._load_configurations()
         
+        # Token buckets for the per-minute token and API call limits
+        self.rate_limiter = RateLimiter(self.resource_limits)
+        
+        # One sampler task reads RSS/CPU for every agent process
+        self.resource_sampler = AgentResourceSampler(
+            self._on_resource_sample,
+            interval=resource_sample_interval
+        )
+        self._resource_breaches: Set[tuple] = set()
+        
     def _load_configurations(self):
         """Load governance configurations"""
         try:
@@ -207,32 +312,86 @@ class RuntimeGovernanceSystem:
     
     # ============= Hook Registration =============
     
-    def register_hook(self, hook_type: HookType, callback: Callable) -> None:
-        """Register a hook callback"""
+    def register_hook(self, hook_type: HookType, callback: Callable,
+                      timeout: Optional[float] = None) -> None:
+        """Register a hook callback, optionally with its own deadline in seconds"""
         if hook_type not in self.hooks:
             raise ValueError(f"Invalid hook type: {hook_type}")
         
         self.hooks[hook_type].append(callback)
+        if timeout is not None:
+            self._hook_timeouts[callback] = timeout
         logger.info(f"Registered hook for {hook_type.value}")
     
     async def trigger_hook(self, hook_type: HookType, context: Any) -> List[Any]:
-        """Trigger all registered hooks for a type"""
-        results = []
+        """
+        Trigger all registered hooks for a type
         
-        for callback in self.hooks[hook_type]:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    result = await callback(context)
-                else:
-                    result = callback(context)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Hook {callback.__name__} failed: {e}")
+        Hooks run concurrently and results keep registration order. A failed
+        hook is dropped from the results (STRICT re-raises its error once all
+        hooks finish). A hook that misses its deadline counts as a veto in
+        STRICT, a warning in WARNING and is only logged otherwise.
+        """
+        callbacks = list(self.hooks[hook_type])
+        if not callbacks:
+            return []
+        
+        outcomes = await asyncio.gather(*(
+            self._run_hook(hook_type, callback, context) for callback in callbacks
+        ))
+        
+        results = []
+        first_error = None
+        for callback, (outcome, value) in zip(callbacks, outcomes):
+            name = getattr(callback, "__name__", repr(callback))
+            if outcome == "ok":
+                results.append(value)
+            elif outcome == "error":
+                logger.error(f"Hook {name} failed: {value}")
+                if self.governance_level == GovernanceLevel.STRICT and first_error is None:
+                    first_error = value
+            else:
+                timeout = self._hook_timeouts.get(callback, self.hook_timeout)
+                reason = f"Governance hook {name} timed out after {timeout}s"
                 if self.governance_level == GovernanceLevel.STRICT:
-                    raise
-                    
+                    logger.error(reason)
+                    results.append({"approved": False, "reason": reason})
+                elif self.governance_level == GovernanceLevel.WARNING:
+                    logger.warning(reason)
+                else:
+                    logger.info(reason)
+        
+        if first_error is not None:
+            raise first_error
         return results
     
+    async def _run_hook(self, hook_type: HookType, callback: Callable, context: Any) -> tuple:
+        """Run one hook against its deadline; returns (outcome, result or error)"""
+        timeout = self._hook_timeouts.get(callback, self.hook_timeout)
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(callback):
+                call = callback(context)
+            else:
+                call = asyncio.get_running_loop().run_in_executor(self._hook_executor, callback, context)
+            outcome = ("ok", await asyncio.wait_for(call, timeout))
+        except asyncio.TimeoutError:
+            # A timed-out sync hook keeps its thread until it returns
+            outcome = ("timeout", None)
+        except Exception as e:
+            outcome = ("error", e)
+        
+        key = f"{hook_type.value}:{getattr(callback, '__qualname__', repr(callback))}"
+        histogram = self._hook_latency.get(key)
+        if histogram is None:
+            histogram = self._hook_latency[key] = HookLatencyHistogram()
+        histogram.observe((time.perf_counter() - started) * 1000, outcome[0])
+        return outcome
+    
+    def get_hook_metrics(self) -> Dict[str, Any]:
+        """Latency histogram and outcome counts per registered hook"""
+        return {name: histogram.to_dict() for name, histogram in self._hook_latency.items()}
+    
     # ============= Agent Lifecycle Management =============
     
     async def validate_agent_spawn(
@@ -347,11 +506,15 @@ class RuntimeGovernanceSystem:
         agent_id: str,
         agent_type: str,
         agent_name: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        pid: Optional[int] = None
     ) -> None:
         """
         Register a spawned agent for monitoring
         Called AFTER agent is created
+        
+        Resource usage is sampled when the agent's process id is given
+        (or present as metadata["pid"]).
         """
         agent_context = AgentContext(
             agent_id=agent_id,
@@ -367,8 +530,10 @@ class RuntimeGovernanceSystem:
         # Trigger post-spawn hooks
         await self.trigger_hook(HookType.POST_AGENT_SPAWN, agent_context)
         
-        # Start monitoring
-        asyncio.create_task(self._monitor_agent(agent_id))
+        # Start sampling the agent's process
+        pid = pid or agent_context.metadata.get("pid")
+        if pid:
+            self.resource_sampler.track(agent_id, int(pid))
         
         logger.info(f"Registered agent {agent_name} ({agent_id}) for governance")
     
@@ -432,6 +597,25 @@ class RuntimeGovernanceSystem:
                     risk_level="HIGH"
                 )
         
+        # Debit the agent's and the global token/API call budgets
+        estimated_tokens = int((context or {}).get("estimated_tokens", 0))
+        rate_decision = self.acquire_rate_limit(agent_id, tokens=estimated_tokens)
+        if not rate_decision.allowed:
+            agent_context.violations.append({
+                "type": "rate_limit",
+                "limit": rate_decision.limit,
+                "retry_after": rate_decision.retry_after,
+                "timestamp": datetime.now().isoformat()
+            })
+            if self.governance_level == GovernanceLevel.STRICT:
+                return GovernanceResult(
+                    approved=False,
+                    reason=rate_decision.reason,
+                    risk_level="MEDIUM",
+                    recommendations=[f"Retry after {rate_decision.retry_after:.1f} seconds"],
+                    metadata={"retry_after": rate_decision.retry_after, "limit": rate_decision.limit}
+                )
+        
         # Update task history
         agent_context.task_history.append({
             "command": command,
@@ -439,6 +623,14 @@ class RuntimeGovernanceSystem:
             "approved": True
         })
         
+        if not rate_decision.allowed:
+            return GovernanceResult(
+                approved=True,
+                reason=f"Execution approved despite rate limit: {rate_decision.reason}",
+                risk_level="MEDIUM",
+                metadata={"retry_after": rate_decision.retry_after, "limit": rate_decision.limit}
+            )
+        
         return GovernanceResult(
             approved=True,
             reason="Execution approved",
@@ -466,6 +658,9 @@ class RuntimeGovernanceSystem:
             
             # Remove from active agents
             del self.active_agents[agent_id]
+            self.rate_limiter.remove_agent(agent_id)
+            self.resource_sampler.untrack(agent_id)
+            self._resource_breaches = {b for b in self._resource_breaches if b[0] != agent_id}
             self.metrics["agents_terminated"] += 1
             
             logger.info(f"Agent {agent_id} terminated: {reason}")
@@ -482,7 +677,30 @@ class RuntimeGovernanceSystem:
         """
         Validate AI decision before execution
         Checks for hallucinations, policy violations, etc.
+        
+        In MONITOR mode only a sample of decisions is validated; the rest
+        are approved unchecked and counted for the extrapolated metrics.
         """
+        if not self.decision_sampler.should_validate(agent_id, decision_type):
+            self.metrics["decisions_sampled_out"] += 1
+            return GovernanceResult(
+                approved=True,
+                reason="Not sampled for validation (monitor mode)",
+                risk_level="LOW",
+                metadata={"sampled": False}
+            )
+        
+        result = await self._validate_ai_decision(agent_id, decision_type, input_data, proposed_output)
+        self.decision_sampler.record(agent_id, decision_type, result.approved, result.risk_level)
+        return result
+    
+    async def _validate_ai_decision(
+        self,
+        agent_id: str,
+        decision_type: str,
+        input_data: Dict[str, Any],
+        proposed_output: Any
+    ) -> GovernanceResult:
         decision_context = DecisionContext(
             decision_id=f"decision_{datetime.now().timestamp()}",
             agent_id=agent_id,
@@ -494,9 +712,11 @@ class RuntimeGovernanceSystem:
         try:
             # Check for hallucinations
             if isinstance(proposed_output, str):
-                hallucination_check = self.hallucination_detector.detect(
+                # Large outputs are scanned in the validation pool, off the event loop
+                hallucination_check = await self.validation_pool.run(
+                    self.hallucination_detector.check_content,
                     proposed_output,
-                    {"type": decision_type, "input": input_data}
+                    size=len(proposed_output)
                 )
                 
                 if hallucination_check.get("is_hallucination", False):
@@ -586,6 +806,8 @@ class RuntimeGovernanceSystem:
             }
         }
         
+        usage["rate_limits"] = self.rate_limiter.get_status(agent_id)
+        
         if agent_id and agent_id in self.active_agents:
             agent_context = self.active_agents[agent_id]
             usage["agent_specific"] = {
@@ -600,48 +822,247 @@ class RuntimeGovernanceSystem:
         
         return usage
     
-    async def _monitor_agent(self, agent_id: str):
-        """Background task to monitor agent resources"""
-        while agent_id in self.active_agents:
-            try:
-                agent_context = self.active_agents[agent_id]
-                
-                # Update resource usage (would connect to actual monitoring)
-                # This is a placeholder for real resource monitoring
-                agent_context.resource_usage = {
-                    "memory_mb": 100,  # Placeholder
-                    "cpu_percent": 5,   # Placeholder
-                    "api_calls": len(agent_context.task_history)
-                }
-                
-                # Check for violations
-                if agent_context.resource_usage.get("memory_mb", 0) > \
-                   self.resource_limits["max_memory_per_agent"] / (1024 * 1024):
-                    logger.warning(f"Agent {agent_id} exceeding memory limit")
-                    agent_context.violations.append({
-                        "type": "memory_limit",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"Error monitoring agent {agent_id}: {e}")
-                await asyncio.sleep(10)
+    def acquire_rate_limit(
+        self,
+        agent_id: Optional[str] = None,
+        tokens: int = 0,
+        api_calls: int = 1
+    ) -> RateLimitDecision:
+        """
+        Debit the token and API call budgets for one upstream call
+        
+        Debits the global buckets and, when agent_id is given, that agent's
+        buckets. A rejected call debits nothing and carries retry_after.
+        BYPASS skips the check.
+        """
+        if self.governance_level == GovernanceLevel.BYPASS:
+            return RateLimitDecision(allowed=True)
+        
+        decision = self.rate_limiter.acquire(agent_id, tokens=tokens, api_calls=api_calls)
+        if not decision.allowed:
+            self.metrics["resource_limits_hit"] += 1
+            logger.warning(f"Rate limit for {agent_id or 'global'}: {decision.reason}")
+        return decision
+    
+    async def wait_for_rate_limit(
+        self,
+        agent_id: Optional[str] = None,
+        tokens: int = 0,
+        api_calls: int = 1,
+        timeout: Optional[float] = None
+    ) -> RateLimitDecision:
+        """Like acquire_rate_limit, but sleeps on the wait hint until the call fits or timeout would pass"""
+        if self.governance_level == GovernanceLevel.BYPASS:
+            return RateLimitDecision(allowed=True)
+        
+        decision = await self.rate_limiter.wait(agent_id, tokens=tokens, api_calls=api_calls, timeout=timeout)
+        if not decision.allowed:
+            self.metrics["resource_limits_hit"] += 1
+            logger.warning(f"Rate limit for {agent_id or 'global'}: {decision.reason}")
+        return decision
+    
+    def record_token_usage(self, agent_id: Optional[str], estimated_tokens: int, actual_tokens: int):
+        """Settle a token debit against the tokens the call actually used"""
+        self.rate_limiter.settle(agent_id, estimated_tokens, actual_tokens)
+    
+    async def _on_resource_sample(self, readings: Dict[str, Optional[ResourceSample]]):
+        """Update agent resource usage from a sampler pass and enforce per-agent limits"""
+        for agent_id, sample in readings.items():
+            agent_context = self.active_agents.get(agent_id)
+            if agent_context is None:
+                continue
+            
+            if sample is None:
+                # Process exited or is no longer visible
+                self.resource_sampler.untrack(agent_id)
+                agent_context.resource_usage["process_alive"] = False
+                continue
+            
+            window = self.resource_sampler.samples(agent_id)
+            cpu_average = sum(s.cpu_percent for s in window) / len(window)
+            agent_context.resource_usage = {
+                "memory_mb": round(sample.rss_bytes / (1024 * 1024), 1),
+                "memory_peak_mb": round(max(s.rss_bytes for s in window) / (1024 * 1024), 1),
+                "cpu_percent": round(sample.cpu_percent, 1),
+                "cpu_percent_avg": round(cpu_average, 1),
+                "process_count": sample.process_count,
+                "process_alive": True,
+                "samples": len(window),
+                "sampled_at": datetime.fromtimestamp(sample.timestamp).isoformat(),
+                "api_calls": len(agent_context.task_history)
+            }
+            
+            if self.governance_level == GovernanceLevel.BYPASS:
+                continue
+            
+            checks = [
+                ("memory_limit", sample.rss_bytes, self.resource_limits["max_memory_per_agent"], True),
+                ("cpu_limit", cpu_average, self.resource_limits["max_cpu_per_agent"],
+                 len(window) >= self.MIN_CPU_SAMPLES),
+            ]
+            for violation_type, value, limit, judged in checks:
+                breach = (agent_id, violation_type)
+                if judged and value > limit:
+                    if breach not in self._resource_breaches:
+                        # Only the transition into a breach is recorded
+                        self._resource_breaches.add(breach)
+                        await self._enforce_resource_limit(agent_context, violation_type, value, limit)
+                else:
+                    self._resource_breaches.discard(breach)
+                if agent_id not in self.active_agents:
+                    break
+    
+    async def _enforce_resource_limit(self, agent_context: AgentContext, violation_type: str,
+                                      value: float, limit: float):
+        """Record a resource violation; STRICT terminates the agent"""
+        violation = {
+            "type": violation_type,
+            "value": value,
+            "limit": limit,
+            "timestamp": datetime.now().isoformat()
+        }
+        agent_context.violations.append(violation)
+        self.metrics["resource_limits_hit"] += 1
+        
+        action = {
+            GovernanceLevel.STRICT: "terminate",
+            GovernanceLevel.WARNING: "warn"
+        }.get(self.governance_level, "log")
+        logger.warning(f"Agent {agent_context.agent_id} exceeded {violation_type} ({value} > {limit}), action: {action}")
+        
+        self._audit_log_event({
+            "event": "agent_resource_limit_exceeded",
+            "agent_id": agent_context.agent_id,
+            "violation": violation,
+            "action": action
+        })
+        
+        try:
+            await self.trigger_hook(HookType.RESOURCE_LIMIT_EXCEEDED, {
+                "agent": agent_context,
+                "violation": violation,
+                "action": action
+            })
+        except Exception as e:
+            logger.error(f"Resource limit hook failed for agent {agent_context.agent_id}: {e}")
+        
+        if action == "terminate":
+            await self.terminate_agent(
+                agent_context.agent_id,
+                reason=f"Resource limit exceeded: {violation_type}"
+            )
     
     # ============= Audit and Logging =============
     
+    AUDIT_QUEUE_SIZE = 50000
+    
     def _audit_log_event(self, event: Dict[str, Any]):
         """Log an audit event"""
         event["timestamp"] = event.get("timestamp", datetime.now().isoformat())
+        
+        if len(self.audit_log) == self.audit_log.maxlen:
+            self._evict_oldest_audit_event()
+        now = time.time()
+        record = (self._audit_seq, now, event)
+        self._audit_seq += 1
         self.audit_log.append(event)
+        self._audit_times.append(now)
+        for key, index in ((event.get("agent_id"), self._audit_by_agent),
+                           (event.get("event"), self._audit_by_event)):
+            if key is not None:
+                index.setdefault(key, deque()).append(record)
         
-        # Trigger audit hooks
-        asyncio.create_task(self.trigger_hook(HookType.AUDIT_LOG, event))
+        self._enqueue_audit_event(event)
+    
+    def _evict_oldest_audit_event(self):
+        """Drop the oldest event from the indexes before the ring overwrites it"""
+        oldest = self.audit_log[0]
+        for key, index in ((oldest.get("agent_id"), self._audit_by_agent),
+                           (oldest.get("event"), self._audit_by_event)):
+            entries = index.get(key)
+            if entries:
+                entries.popleft()
+                if not entries:
+                    del index[key]
+    
+    def _enqueue_audit_event(self, event: Dict[str, Any]):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (CLI or git hook use): write through, hooks need a loop
+            if self.audit_writer:
+                self.audit_writer.write_batch([event])
+            return
         
-        # Keep audit log size manageable
-        if len(self.audit_log) > 10000:
-            self.audit_log = self.audit_log[-5000:]
+        if self._audit_queue is None:
+            self._audit_queue = asyncio.Queue(maxsize=self.AUDIT_QUEUE_SIZE)
+            self._audit_batch_ready = asyncio.Event()
+        if self._audit_task is None or self._audit_task.done():
+            self._audit_task = loop.create_task(self._audit_writer_loop())
+        try:
+            self._audit_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._audit_dropped += 1
+            logger.warning("Audit queue full; event kept in memory only")
+            return
+        if self._audit_queue.qsize() >= self.audit_batch_size:
+            self._audit_batch_ready.set()
+    
+    async def _audit_writer_loop(self):
+        """Single writer: batch by size or flush interval, persist, then run AUDIT_LOG hooks"""
+        queue = self._audit_queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            if queue.qsize() + 1 < self.audit_batch_size:
+                # Wait for a full batch or the flush interval, whichever comes first
+                self._audit_batch_ready.clear()
+                timer = loop.call_later(self.audit_flush_interval, self._audit_batch_ready.set)
+                try:
+                    await self._audit_batch_ready.wait()
+                finally:
+                    timer.cancel()
+            while len(batch) < self.audit_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write_audit_batch(batch)
+            except Exception as e:
+                # Keep draining: a dead writer would leave flush_audit_log waiting forever
+                self._audit_write_errors += 1
+                logger.error(f"Failed to write {len(batch)} audit events: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _write_audit_batch(self, batch: List[Dict[str, Any]]):
+        if self.audit_writer:
+            await asyncio.to_thread(self.audit_writer.write_batch, batch)
+        if self.hooks[HookType.AUDIT_LOG]:
+            outcomes = await asyncio.gather(
+                *(self.trigger_hook(HookType.AUDIT_LOG, event) for event in batch),
+                return_exceptions=True
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error(f"Audit hook failed: {outcome}")
+    
+    async def flush_audit_log(self):
+        """Wait until every queued audit event has been written"""
+        if self._audit_queue is not None and self._audit_task is not None:
+            await self._audit_queue.join()
+    
+    async def close_audit_log(self):
+        """Flush, stop the writer task and close the current segment"""
+        await self.flush_audit_log()
+        if self._audit_task is not None:
+            self._audit_task.cancel()
+            try:
+                await self._audit_task
+            except asyncio.CancelledError:
+                pass
+            self._audit_task = None
+        if self.audit_writer:
+            self.audit_writer.close()
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current governance metrics"""
@@ -649,12 +1070,69 @@ class RuntimeGovernanceSystem:
             **self.metrics,
             "active_agents": len(self.active_agents),
             "audit_log_size": len(self.audit_log),
-            "governance_level": self.governance_level.value
+            "audit_queue_depth": self._audit_queue.qsize() if self._audit_queue else 0,
+            "audit_events_dropped": self._audit_dropped,
+            "audit_write_errors": self._audit_write_errors,
+            "audit_writer": self.audit_writer.get_status() if self.audit_writer else None,
+            "governance_level": self.governance_level.value,
+            "resource_sampler": self.resource_sampler.get_status(),
+            "validation_pool": self.validation_pool.get_status(),
+            "sampling": self.decision_sampler.get_status()
         }
     
-    def get_audit_log(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent audit log entries"""
-        return self.audit_log[-limit:]
+    def get_audit_log(
+        self,
+        limit: int = 100,
+        agent_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[Union[datetime, str, float]] = None,
+        until: Optional[Union[datetime, str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recent audit log entries, oldest first
+        
+        Agent and event type filters read their index instead of the whole
+        log; since/until are bisected on the ring's ingestion times.
+        """
+        since_ts, until_ts = self._epoch(since), self._epoch(until)
+        
+        times = self._audit_times
+        start = bisect_left(times, since_ts) if since_ts is not None else 0
+        stop = bisect_right(times, until_ts) if until_ts is not None else len(times)
+        
+        if agent_id is None and event_type is None:
+            return list(islice(self.audit_log, max(start, stop - limit), stop))
+        
+        candidates = [
+            index.get(key, ())
+            for key, index in ((agent_id, self._audit_by_agent), (event_type, self._audit_by_event))
+            if key is not None
+        ]
+        entries = min(candidates, key=len)
+        # Index entries are (seq, ts, event); the ring holds seqs first_seq onwards
+        first_seq = self._audit_seq - len(times)
+        low = bisect_left(entries, (first_seq + start,))
+        high = bisect_left(entries, (first_seq + stop,))
+        
+        matches = []
+        for _, _, event in islice(reversed(entries), len(entries) - high, len(entries) - low):
+            if len(matches) >= limit:
+                break
+            if agent_id is not None and event.get("agent_id") != agent_id:
+                continue
+            if event_type is not None and event.get("event") != event_type:
+                continue
+            matches.append(event)
+        matches.reverse()
+        return matches
+    
+    @staticmethod
+    def _epoch(value: Optional[Union[datetime, str, float]]) -> Optional[float]:
+        if value is None or isinstance(value, (int, float)):
+            return value
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        return value.timestamp()
     
     # ============= Configuration Management =============
     
@@ -675,6 +1153,7 @@ class RuntimeGovernanceSystem:
         """Update resource limits"""
         old_limits = self.resource_limits.copy()
         self.resource_limits.update(limits)
+        self.rate_limiter.configure(self.resource_limits)
         
         self._audit_log_event({
             "event": "resource_limits_updated",
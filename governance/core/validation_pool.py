@@ -0,0 +1,238 @@
+"""
+@fileoverview Bounded process pool for CPU-heavy governance validation
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Runtime governance validation offloading
+@responsibility Run large regex/pattern validation jobs in worker processes so they do not block the event loop
+@dependencies asyncio, concurrent.futures, time
+@integration_points RuntimeGovernanceSystem.validate_ai_decision, AIDecisionInjector.intercept_decision
+@testing_strategy Unit tests for the inline threshold, offloaded results, backpressure and timing metrics
+@governance Offloading changes where validation runs, never its outcome
+
+Business Logic Summary:
+- Payloads below inline_threshold characters are validated inline (pickling costs more than the scan)
+- Larger payloads run in a ProcessPoolExecutor with at most max_pending jobs submitted
+- Callers past max_pending wait for a slot instead of growing the executor queue
+- A slot is held until the worker finishes the job, even if the caller stopped waiting
+- A broken pool or unpicklable arguments fall back to inline execution; errors the job
+  itself raises in a worker are re-raised to the caller, never re-run inline
+
+Architecture Integration:
+- Job functions must be module-level so they can be pickled into the workers
+- The executor starts on the first offloaded job; small-payload deployments never fork
+- One pool can be shared by the runtime governance system and the decision injector
+
+Sarah's Framework Check:
+- What breaks first: Queue depth when large outputs arrive faster than the workers drain them
+- How we know: queue_depth and per-job queue_ms in get_status()
+- Plan B: Raise max_workers or inline_threshold; fallbacks keep validation running if the pool dies
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """Call fn, returning the result and the time spent computing it"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+class _JobError:
+    """An exception raised by the job in a worker, returned rather than raised"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _offloaded_call(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    """
+    Worker entry point: _timed_call with the job's own errors wrapped
+
+    Anything the parent then sees raised by the future is a transport
+    failure (pickling the call or its result), not the job failing.
+    """
+    try:
+        return _timed_call(fn, args)
+    except Exception as e:
+        return _JobError(e), 0.0
+
+
+class JobTimings:
+    """Rolling queue/run timings for one kind of validation job"""
+
+    WINDOW = 512
+
+    def __init__(self):
+        self.inline = 0
+        self.offloaded = 0
+        self._run_ms: Deque[float] = deque(maxlen=self.WINDOW)
+        self._queue_ms: Deque[float] = deque(maxlen=self.WINDOW)
+
+    def observe(self, run_ms: float, queue_ms: Optional[float] = None):
+        self._run_ms.append(run_ms)
+        if queue_ms is None:
+            self.inline += 1
+        else:
+            self.offloaded += 1
+            self._queue_ms.append(queue_ms)
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, Any]:
+        if not samples:
+            return {"mean_ms": None, "p95_ms": None, "max_ms": None}
+        ordered = sorted(samples)
+        return {
+            "mean_ms": round(sum(ordered) / len(ordered), 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            "max_ms": round(ordered[-1], 2)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "run": self._summary(self._run_ms),
+            "queue": self._summary(self._queue_ms)
+        }
+
+
+class ValidationPool:
+    """
+    Size-gated process pool for validation jobs
+
+    queue_ms for an offloaded job is everything that is not compute:
+    waiting for a slot, pickling and waiting for a free worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        inline_threshold: int = 32 * 1024,
+        max_pending: Optional[int] = None
+    ):
+        """
+        Initialize pool
+
+        Args:
+            max_workers: Worker processes (default: CPU count, at most 4; 0 keeps every job inline)
+            inline_threshold: Payload size in characters below which jobs run inline
+            max_pending: Offloaded jobs submitted at once (default: 4 per worker)
+        """
+        self.max_workers = min(4, os.cpu_count() or 1) if max_workers is None else max_workers
+        self.inline_threshold = inline_threshold
+        self.max_pending = max_pending or max(1, self.max_workers * 4)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._timings: Dict[str, JobTimings] = {}
+        self.in_flight = 0
+        self.waiting = 0
+        self.fallbacks = 0
+
+    def should_offload(self, size: int) -> bool:
+        return self.max_workers > 0 and size >= self.inline_threshold
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs not yet running in a worker: waiting for a slot or queued in the executor"""
+        return self.waiting + max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn: Callable, *args: Any, size: int = 0) -> Any:
+        """
+        Run fn(*args), in a worker process when size reaches inline_threshold
+
+        fn must be a module-level function (or a bound method of a picklable
+        object) and args must be picklable; otherwise the job falls back inline.
+        Exceptions raised by fn itself propagate without an inline re-run.
+        """
+        timings = self._timings.setdefault(fn.__name__, JobTimings())
+        if not self.should_offload(size):
+            return self._run_inline(fn, args, timings)
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                future = self._get_executor().submit(_offloaded_call, fn, args)
+            except BaseException:
+                self._release_slot()
+                raise
+            # Cancelling the waiter (e.g. a caller's deadline) cannot stop a job a
+            # worker already runs, so the slot is freed when the job is done
+            future.add_done_callback(lambda _: self._release_from_executor(loop))
+            result, run_ms = await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            logger.error(f"Validation pool broke running {fn.__name__}, restarting: {e}")
+            self._reset_executor()
+            self.fallbacks += 1
+            return self._run_inline(fn, args, timings)
+        except Exception as e:
+            # Job errors come back as _JobError, so this is a pickling failure
+            logger.warning(f"Could not offload {fn.__name__} ({e}); running inline")
+            self.fallbacks += 1
+            return self._run_inline(fn, args, timings)
+
+        if isinstance(result, _JobError):
+            raise result.error
+
+        total_ms = (time.perf_counter() - started) * 1000
+        timings.observe(run_ms, queue_ms=max(0.0, total_ms - run_ms))
+        return result
+
+    def _release_slot(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def _release_from_executor(self, loop: asyncio.AbstractEventLoop):
+        """Done callback of an executor future; may run on an executor thread"""
+        try:
+            loop.call_soon_threadsafe(self._release_slot)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    @staticmethod
+    def _run_inline(fn: Callable, args: Tuple, timings: JobTimings) -> Any:
+        result, run_ms = _timed_call(fn, args)
+        timings.observe(run_ms)
+        return result
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _reset_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        """Stop the worker processes; later jobs start a new executor"""
+        self._reset_executor()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self._executor is not None,
+            "max_workers": self.max_workers,
+            "inline_threshold": self.inline_threshold,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "queue_depth": self.queue_depth,
+            "fallbacks": self.fallbacks,
+            "jobs": {name: timings.to_dict() for name, timings in self._timings.items()}
+        }
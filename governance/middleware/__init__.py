@@ -49,6 +49,7 @@ from .ai_decision_injector import (
     AIDecisionInjector,
     DecisionType,
     DecisionValidation,
+    DecisionRequest,
     RiskLevel,
     PersonaConsultation
 )
@@ -57,6 +58,7 @@ __all__ = [
     'AIDecisionInjector',
     'DecisionType',
     'DecisionValidation',
+    'DecisionRequest',
     'RiskLevel',
     'PersonaConsultation'
 ]
\ No newline at end of file
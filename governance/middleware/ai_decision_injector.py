@@ -3,7 +3,7 @@
 @author Dr. Sarah Chen v1.0 & Alex Novak v1.0 - 2025-08-29
 @architecture Backend - Middleware layer for AI decision interception
 @responsibility Validate AI outputs through persona consultation and risk assessment before execution
-@dependencies asyncio, json, logging, typing, datetime, dataclasses, enum, hashlib
+@dependencies asyncio, logging, typing, datetime, dataclasses, enum, hashlib, re, governance.core.validation_pool
 @integration_points AI agents, persona validators, risk assessment engine, audit system
 @testing_strategy Unit tests for each persona, integration tests for decision flow, risk scoring tests
 @governance Central enforcement point for all AI-generated decisions
@@ -29,16 +29,28 @@ Sarah's Framework Check:
 """
 
 import asyncio
-import json
 import logging
-from typing import Dict, List, Any, Optional, Callable, Tuple
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+
+from ..core.decision_sampler import DecisionSampler
+from ..core.runtime_governance import HookLatencyHistogram
+from ..core.validation_pool import ValidationPool
 
 logger = logging.getLogger(__name__)
 
+# What a consultation or rule that misses its deadline turns into
+TIMEOUT_FALLBACKS = ("reject", "approve", "skip")
+_TIMED_OUT = object()
+
 
 class DecisionType(Enum):
     """Types of AI decisions"""
@@ -87,13 +99,435 @@ class DecisionValidation:
     audit_trail: List[Dict[str, Any]] = field(default_factory=list)
 
 
+@dataclass
+class DecisionRequest:
+    """One decision in an intercept_decisions() batch"""
+    agent_id: str
+    decision_type: DecisionType
+    input_context: Dict[str, Any]
+    proposed_output: Any
+    metadata: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DecisionRequest":
+        return cls(
+            agent_id=data["agent_id"],
+            decision_type=DecisionType(data["decision_type"]),
+            input_context=data.get("input_context") or {},
+            proposed_output=data.get("proposed_output"),
+            metadata=data.get("metadata")
+        )
+
+
+# ============= Built-in Persona Reviews =============
+# Plain functions over picklable arguments so each can run as its own validation pool job
+
+
+@lru_cache(maxsize=32)
+def _compiled_patterns(patterns: Tuple[str, ...]) -> Tuple[Any, Tuple[Any, ...]]:
+    """Combined alternation plus each pattern, compiled once per pattern set (per process)"""
+    combined = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE) if patterns else None
+    return combined, tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+
+
+def _first_dangerous_pattern(output: str, patterns: Tuple[str, ...]) -> Optional[str]:
+    """First pattern in list order found in output; one pass when nothing matches"""
+    combined, compiled = _compiled_patterns(patterns)
+    if combined is None or not combined.search(output):
+        return None
+    for pattern, regex in zip(patterns, compiled):
+        if regex.search(output):
+            return pattern
+    return None
+
+
+def _sarah_chen_review(
+    decision_type: DecisionType,
+    context: Dict[str, Any],
+    output: Any,
+    dangerous_patterns: Tuple[str, ...]
+) -> PersonaConsultation:
+    """Dr. Sarah Chen's validation - Backend/Systems perspective"""
+    consultation = PersonaConsultation(
+        persona_name="Dr. Sarah Chen",
+        approved=True,
+        confidence=0.9
+    )
+    
+    # Check for system stability concerns
+    if decision_type in [DecisionType.CODE_GENERATION, DecisionType.ARCHITECTURE]:
+        # Check for failure modes
+        if isinstance(output, str):
+            if "try:" not in output.lower() and "except" not in output.lower():
+                consultation.concerns.append("No error handling detected")
+                consultation.confidence *= 0.8
+            
+            if "cache" in context.get("topic", "").lower():
+                if "fallback" not in output.lower():
+                    consultation.concerns.append("No fallback strategy for cache")
+                    consultation.recommendations.append("Add fallback mechanism")
+                    consultation.confidence *= 0.7
+    
+    # Three Questions Framework
+    consultation.recommendations.extend([
+        "Consider: What breaks first?",
+        "Consider: How do we know when it breaks?",
+        "Consider: What's Plan B?"
+    ])
+    
+    if consultation.confidence < 0.7:
+        consultation.approved = False
+        consultation.risk_assessment = "high"
+    
+    return consultation
+
+
+def _alex_novak_review(
+    decision_type: DecisionType,
+    context: Dict[str, Any],
+    output: Any,
+    dangerous_patterns: Tuple[str, ...]
+) -> PersonaConsultation:
+    """Alex Novak's validation - Frontend/Integration perspective"""
+    consultation = PersonaConsultation(
+        persona_name="Alex Novak",
+        approved=True,
+        confidence=0.9
+    )
+    
+    # Check for frontend/integration concerns
+    if decision_type == DecisionType.CODE_GENERATION:
+        if isinstance(output, str):
+            # Check for memory leak patterns
+            if "addEventListener" in output and "removeEventListener" not in output:
+                consultation.concerns.append("Potential memory leak: Event listeners not cleaned up")
+                consultation.recommendations.append("Add cleanup in ngOnDestroy or equivalent")
+                consultation.confidence *= 0.6
+            
+            # Check for IPC security
+            if "ipc" in output.lower() or "electron" in output.lower():
+                if "contextBridge" not in output:
+                    consultation.concerns.append("IPC communication should use contextBridge")
+                    consultation.confidence *= 0.7
+    
+    # 3 AM Test
+    if consultation.confidence > 0.7:
+        consultation.recommendations.append("Passes 3 AM test: debuggable under pressure")
+    else:
+        consultation.concerns.append("Fails 3 AM test: needs better error messages")
+        consultation.approved = False
+    
+    return consultation
+
+
+def _jordan_chen_review(
+    decision_type: DecisionType,
+    context: Dict[str, Any],
+    output: Any,
+    dangerous_patterns: Tuple[str, ...]
+) -> PersonaConsultation:
+    """Jordan Chen's validation - Security perspective"""
+    consultation = PersonaConsultation(
+        persona_name="Jordan Chen",
+        approved=True,
+        confidence=0.95
+    )
+    
+    if isinstance(output, str):
+        # Check for security vulnerabilities
+        pattern = _first_dangerous_pattern(output, dangerous_patterns)
+        if pattern is not None:
+            consultation.approved = False
+            consultation.concerns.append(f"Security risk: Dangerous pattern detected ({pattern})")
+            consultation.risk_assessment = "critical"
+            consultation.confidence = 0.1
+        
+        # Check for SQL injection risks
+        if "SELECT" in output.upper() or "INSERT" in output.upper():
+            if "?" not in output and "prepare" not in output.lower():
+                consultation.concerns.append("Potential SQL injection: Use parameterized queries")
+                consultation.recommendations.append("Use prepared statements")
+                consultation.confidence *= 0.5
+        
+        # Check for XSS risks
+        if "innerHTML" in output or "dangerouslySetInnerHTML" in output:
+            consultation.concerns.append("XSS risk: Sanitize user input before rendering")
+            consultation.confidence *= 0.6
+    
+    return consultation
+
+
+def _riley_thompson_review(
+    decision_type: DecisionType,
+    context: Dict[str, Any],
+    output: Any,
+    dangerous_patterns: Tuple[str, ...]
+) -> PersonaConsultation:
+    """Riley Thompson's validation - Infrastructure/Operations perspective"""
+    consultation = PersonaConsultation(
+        persona_name="Riley Thompson",
+        approved=True,
+        confidence=0.85
+    )
+    
+    if decision_type == DecisionType.DEPLOYMENT:
+        consultation.recommendations.append("Ensure rollback plan is documented")
+        consultation.recommendations.append("Verify monitoring alerts are configured")
+        
+        if isinstance(output, str):
+            if "rollback" not in output.lower():
+                consultation.concerns.append("No rollback strategy mentioned")
+                consultation.confidence *= 0.7
+            
+            if "health" not in output.lower() and "monitor" not in output.lower():
+                consultation.concerns.append("No health checks or monitoring mentioned")
+                consultation.confidence *= 0.8
+    
+    return consultation
+
+
+def _check_validation_rule(
+    rule: str,
+    decision_type: DecisionType,
+    output: Any,
+    dangerous_patterns: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """Apply a specific validation rule"""
+    if rule == "no_dangerous_patterns":
+        if isinstance(output, str):
+            pattern = _first_dangerous_pattern(output, dangerous_patterns)
+            if pattern is not None:
+                return {
+                    "passed": False,
+                    "message": f"Dangerous pattern detected: {pattern}"
+                }
+    
+    elif rule == "follows_standards":
+        # Check for basic code standards
+        if isinstance(output, str) and decision_type == DecisionType.CODE_GENERATION:
+            issues = []
+            if len(output.split('\n')) > 1:
+                lines = output.split('\n')
+                for line in lines:
+                    if len(line) > 120:
+                        issues.append("Line too long (>120 chars)")
+                        break
+            
+            if issues:
+                return {
+                    "passed": False,
+                    "message": f"Code standard violations: {', '.join(issues)}"
+                }
+    
+    elif rule == "no_vulnerabilities":
+        # Already checked in Jordan Chen's validation
+        pass
+    
+    elif rule == "rollback_plan":
+        if isinstance(output, str):
+            if "rollback" not in output.lower():
+                return {
+                    "passed": False,
+                    "message": "No rollback plan specified"
+                }
+    
+    return {"passed": True, "message": ""}
+
+
+class DecisionCache:
+    """
+    Bounded LRU of validation results with a time-to-live
+    
+    Lookups, inserts and evictions are O(1): entries live in an OrderedDict
+    ordered by last use, so the least recently used entry is always first.
+    """
+    
+    def __init__(self, max_size: int = 1000, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, DecisionValidation]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, key: str) -> Optional[DecisionValidation]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, validation = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return validation
+    
+    def put(self, key: str, validation: DecisionValidation):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, validation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+    
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
+class DecisionFingerprinter:
+    """
+    Streaming blake2b fingerprints of decision inputs
+    
+    Values are fed into the hash piece by piece (length-prefixed and
+    type-tagged, dict keys sorted), so nothing is concatenated or
+    JSON-encoded first. Digests of large strings are memoized by content
+    in a small LRU: a repeated system prompt, history or context document
+    costs one str hash and compare even when each request builds a new
+    string object. Dicts and lists are always re-walked.
+    """
+    
+    CHUNK_CHARS = 64 * 1024
+    
+    def __init__(self, memo_min_chars: int = 4096, memo_max_chars: int = 1024 * 1024):
+        self.memo_min_chars = memo_min_chars
+        self.memo_max_chars = memo_max_chars
+        self._memo: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memo_chars = 0
+        self.memo_hits = 0
+        self.memo_misses = 0
+    
+    def decision_id(
+        self,
+        agent_id: str,
+        decision_type: DecisionType,
+        context: Any,
+        output: Any,
+        context_digest: Optional[bytes] = None
+    ) -> str:
+        """
+        Decision ID over agent, type, context and output
+        
+        The context enters as its own digest, so a batch can hash each
+        shared context once and pass context_digest for every item.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        self.update(digest, agent_id)
+        self.update(digest, decision_type.value)
+        digest.update(context_digest or self.context_digest(context))
+        self.update(digest, output)
+        return digest.hexdigest()
+    
+    def context_digest(self, context: Any) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        self.update(digest, context)
+        return digest.digest()
+    
+    def update(self, digest: Any, value: Any):
+        """Feed one JSON-like value into digest"""
+        if isinstance(value, str):
+            if len(value) >= self.memo_min_chars:
+                digest.update(b"S")
+                digest.update(self._string_digest(value))
+            else:
+                data = value.encode("utf-8", "surrogatepass")
+                digest.update(b"s%d:" % len(data))
+                digest.update(data)
+        elif isinstance(value, dict):
+            digest.update(b"{%d:" % len(value))
+            for key in sorted(value, key=str):
+                self.update(digest, str(key))
+                self.update(digest, value[key])
+            digest.update(b"}")
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"[%d:" % len(value))
+            for item in value:
+                self.update(digest, item)
+            digest.update(b"]")
+        elif value is None or isinstance(value, (bool, int, float)):
+            data = repr(value).encode()
+            digest.update(b"p%d:" % len(data))
+            digest.update(data)
+        else:
+            digest.update(b"o")
+            self.update(digest, str(value))
+    
+    def _string_digest(self, text: str) -> bytes:
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            self.memo_hits += 1
+            return cached
+        
+        self.memo_misses += 1
+        digest = hashlib.blake2b(digest_size=16)
+        for start in range(0, len(text), self.CHUNK_CHARS):
+            digest.update(text[start:start + self.CHUNK_CHARS].encode("utf-8", "surrogatepass"))
+        result = digest.digest()
+        
+        # The memo keeps its key strings alive; bound it by their total size
+        if len(text) <= self.memo_max_chars:
+            self._memo[text] = result
+            self._memo_chars += len(text)
+            while self._memo_chars > self.memo_max_chars:
+                evicted, _ = self._memo.popitem(last=False)
+                self._memo_chars -= len(evicted)
+        return result
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "memo_entries": len(self._memo),
+            "memo_chars": self._memo_chars,
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses
+        }
+
+
 class AIDecisionInjector:
     """
     Middleware for intercepting and validating AI decisions
     Implements multi-persona consultation and risk assessment
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        validation_pool: Optional[ValidationPool] = None,
+        sampler: Optional[DecisionSampler] = None,
+        cache_size: int = 1000,
+        cache_ttl_seconds: float = 300.0,
+        consultation_timeout: float = 5.0,
+        timeout_fallback: str = "reject"
+    ):
+        # Decision cache for deduplication; must exist before the configs are assigned
+        self.decision_cache = DecisionCache(max_size=cache_size, ttl_seconds=cache_ttl_seconds)
+        self.fingerprinter = DecisionFingerprinter()
+        
         # Decision type configurations
         self.decision_configs = {
             DecisionType.CODE_GENERATION: {
@@ -139,8 +573,18 @@ class AIDecisionInjector:
             "Riley Thompson": self._validate_riley_thompson
         }
         
-        # Decision cache for deduplication
-        self.decision_cache: Dict[str, DecisionValidation] = {}
+        # Built-in reviews of large outputs run in worker processes
+        self.validation_pool = validation_pool or ValidationPool()
+        
+        # Consultations and rules run concurrently, each against its own deadline
+        if timeout_fallback not in TIMEOUT_FALLBACKS:
+            raise ValueError(f"timeout_fallback must be one of {TIMEOUT_FALLBACKS}, got {timeout_fallback!r}")
+        self.consultation_timeout = consultation_timeout
+        self.timeout_fallback = timeout_fallback
+        self._validator_latency: Dict[str, HookLatencyHistogram] = {}
+        
+        # Optional MONITOR-mode sampling; None validates every decision
+        self.sampler = sampler
         
         # Metrics
         self.metrics = {
@@ -148,7 +592,10 @@ class AIDecisionInjector:
             "decisions_approved": 0,
             "decisions_modified": 0,
             "decisions_rejected": 0,
-            "high_risk_decisions": 0
+            "high_risk_decisions": 0,
+            "decisions_sampled_out": 0,
+            "batch_items": 0,
+            "batch_duplicates": 0
         }
     
     async def intercept_decision(
@@ -163,15 +610,117 @@ class AIDecisionInjector:
         Main entry point for decision interception
         Validates and potentially modifies AI decisions
         """
+        return await self._intercept(agent_id, decision_type, input_context, proposed_output, metadata)
+    
+    async def intercept_decisions(
+        self,
+        batch: List[Union[DecisionRequest, Dict[str, Any]]],
+        max_concurrency: int = 8
+    ) -> List[DecisionValidation]:
+        """
+        Validate many decisions in one pass; results come back in batch order
+        
+        Each distinct context is fingerprinted once per batch and identical
+        decisions (same agent, type, context and output) are validated once.
+        Persona checks read the output, so distinct outputs are still checked
+        separately, up to max_concurrency at a time.
+        """
+        requests = [
+            item if isinstance(item, DecisionRequest) else DecisionRequest.from_dict(item)
+            for item in batch
+        ]
+        
+        # Fingerprint shared contexts once (the batch holds them, so ids are stable)
+        context_digests: Dict[int, bytes] = {}
+        decision_ids = []
+        for request in requests:
+            digest = context_digests.get(id(request.input_context))
+            if digest is None:
+                digest = self.fingerprinter.context_digest(request.input_context)
+                context_digests[id(request.input_context)] = digest
+            decision_ids.append(self.fingerprinter.decision_id(
+                request.agent_id, request.decision_type, request.input_context,
+                request.proposed_output, context_digest=digest
+            ))
+        
+        # One validation per distinct decision
+        distinct: Dict[str, DecisionRequest] = {}
+        for decision_id, request in zip(decision_ids, requests):
+            distinct.setdefault(decision_id, request)
+        self.metrics["batch_items"] += len(requests)
+        self.metrics["batch_duplicates"] += len(requests) - len(distinct)
+        
+        slots = asyncio.Semaphore(max_concurrency)
+        
+        async def validate(decision_id: str, request: DecisionRequest) -> DecisionValidation:
+            async with slots:
+                return await self._intercept(
+                    request.agent_id, request.decision_type, request.input_context,
+                    request.proposed_output, request.metadata, decision_id=decision_id
+                )
+        
+        results = await asyncio.gather(*(validate(did, request) for did, request in distinct.items()))
+        by_id = dict(zip(distinct, results))
+        return [by_id[decision_id] for decision_id in decision_ids]
+    
+    async def _intercept(
+        self,
+        agent_id: str,
+        decision_type: DecisionType,
+        input_context: Dict[str, Any],
+        proposed_output: Any,
+        metadata: Optional[Dict[str, Any]],
+        decision_id: Optional[str] = None
+    ) -> DecisionValidation:
+        if self.sampler is not None:
+            if not self.sampler.should_validate(agent_id, decision_type):
+                return self._unsampled_decision(agent_id, decision_type)
+            validation = await self._intercept_decision(
+                agent_id, decision_type, input_context, proposed_output, metadata, decision_id
+            )
+            self.sampler.record(agent_id, decision_type, validation.approved, validation.risk_level)
+            return validation
+        return await self._intercept_decision(
+            agent_id, decision_type, input_context, proposed_output, metadata, decision_id
+        )
+    
+    def _unsampled_decision(self, agent_id: str, decision_type: DecisionType) -> DecisionValidation:
+        """Pass-through result for a decision the sampler skipped"""
+        self.metrics["decisions_sampled_out"] += 1
+        return DecisionValidation(
+            decision_id=f"unsampled_{self.metrics['decisions_sampled_out']}",
+            approved=True,
+            risk_level=RiskLevel.LOW,
+            confidence_score=1.0,
+            personas_consulted=[],
+            audit_trail=[{
+                "timestamp": datetime.now().isoformat(),
+                "event": "validation_skipped",
+                "reason": "not sampled (monitor mode)",
+                "agent_id": agent_id,
+                "decision_type": decision_type.value
+            }]
+        )
+    
+    async def _intercept_decision(
+        self,
+        agent_id: str,
+        decision_type: DecisionType,
+        input_context: Dict[str, Any],
+        proposed_output: Any,
+        metadata: Optional[Dict[str, Any]],
+        decision_id: Optional[str] = None
+    ) -> DecisionValidation:
         # Generate decision ID
-        decision_id = self._generate_decision_id(
+        decision_id = decision_id or self._generate_decision_id(
             agent_id, decision_type, input_context, proposed_output
         )
         
         # Check cache
-        if decision_id in self.decision_cache:
+        cached = self.decision_cache.get(decision_id)
+        if cached is not None:
             logger.info(f"Decision {decision_id} found in cache")
-            return self.decision_cache[decision_id]
+            return cached
         
         # Start validation
         validation = DecisionValidation(
@@ -196,21 +745,31 @@ class AIDecisionInjector:
             {"required_personas": [], "risk_threshold": 0.5, "validation_rules": []}
         )
         
-        # Consult required personas
-        for persona_name in config["required_personas"]:
-            if persona_name in self.persona_validators:
-                consultation = await self.persona_validators[persona_name](
-                    decision_type, input_context, proposed_output
-                )
-                validation.personas_consulted.append(consultation)
-                
-                # Update approval status
-                if not consultation.approved:
-                    validation.approved = False
-                    validation.warnings.extend(consultation.concerns)
-                
-                # Update confidence
-                validation.confidence_score *= consultation.confidence
+        # Consult required personas and run validation rules concurrently
+        personas = [name for name in config["required_personas"] if name in self.persona_validators]
+        rules = list(config["validation_rules"])
+        outcomes = await asyncio.gather(
+            *(self._consult(name, decision_type, input_context, proposed_output) for name in personas),
+            *(self._run_rule(rule, decision_type, proposed_output) for rule in rules),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        consultations, rule_results = outcomes[:len(personas)], outcomes[len(personas):]
+        
+        for consultation in consultations:
+            if consultation is None:
+                continue  # Timed out with the "skip" fallback
+            validation.personas_consulted.append(consultation)
+            
+            # Update approval status
+            if not consultation.approved:
+                validation.approved = False
+                validation.warnings.extend(consultation.concerns)
+            
+            # Update confidence
+            validation.confidence_score *= consultation.confidence
         
         # Assess risk level
         risk_score = await self._assess_risk(
@@ -228,10 +787,7 @@ class AIDecisionInjector:
             self.metrics["high_risk_decisions"] += 1
         
         # Apply validation rules
-        for rule in config["validation_rules"]:
-            rule_result = await self._apply_validation_rule(
-                rule, decision_type, proposed_output
-            )
+        for rule_result in rule_results:
             if not rule_result["passed"]:
                 validation.approved = False
                 validation.warnings.append(rule_result["message"])
@@ -264,17 +820,107 @@ class AIDecisionInjector:
         else:
             self.metrics["decisions_rejected"] += 1
         
-        # Cache result
-        self.decision_cache[decision_id] = validation
-        
-        # Limit cache size
-        if len(self.decision_cache) > 1000:
-            oldest_keys = list(self.decision_cache.keys())[:500]
-            for key in oldest_keys:
-                del self.decision_cache[key]
+        # Cache result (least recently used entries are evicted past cache_size)
+        self.decision_cache.put(decision_id, validation)
         
         return validation
     
+    async def _consult(
+        self,
+        persona_name: str,
+        decision_type: DecisionType,
+        context: Dict[str, Any],
+        output: Any
+    ) -> Optional[PersonaConsultation]:
+        """One persona consultation against the deadline; None when skipped on timeout"""
+        consultation = await self._with_deadline(
+            persona_name,
+            self.persona_validators[persona_name](decision_type, context, output)
+        )
+        if consultation is not _TIMED_OUT:
+            return consultation
+        if self.timeout_fallback == "skip":
+            return None
+        approve = self.timeout_fallback == "approve"
+        return PersonaConsultation(
+            persona_name=persona_name,
+            approved=approve,
+            confidence=0.5 if approve else 0.0,
+            concerns=[f"{persona_name} consultation timed out after {self.consultation_timeout}s"],
+            risk_assessment="medium" if approve else "high"
+        )
+    
+    async def _run_rule(self, rule: str, decision_type: DecisionType, output: Any) -> Dict[str, Any]:
+        result = await self._with_deadline(
+            f"rule:{rule}",
+            self._apply_validation_rule(rule, decision_type, output)
+        )
+        if result is not _TIMED_OUT:
+            return result
+        if self.timeout_fallback == "reject":
+            return {"passed": False, "message": f"Validation rule {rule} timed out"}
+        return {"passed": True, "message": ""}
+    
+    async def _with_deadline(self, name: str, awaitable: Any) -> Any:
+        """Await with consultation_timeout and record latency per validator"""
+        histogram = self._validator_latency.setdefault(name, HookLatencyHistogram())
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(awaitable, self.consultation_timeout)
+        except asyncio.TimeoutError:
+            histogram.observe((time.perf_counter() - started) * 1000, "timeout")
+            logger.warning(f"{name} missed its {self.consultation_timeout}s deadline; fallback: {self.timeout_fallback}")
+            return _TIMED_OUT
+        except Exception:
+            histogram.observe((time.perf_counter() - started) * 1000, "error")
+            raise
+        histogram.observe((time.perf_counter() - started) * 1000, "ok")
+        return result
+    
+    def _payload_size(self, output: Any) -> int:
+        return len(output) if isinstance(output, str) else 0
+    
+    # ============= Configuration =============
+    # Cached validations were computed under the old configuration, so any change drops them.
+    # Configs are exposed as read-only views (lists become tuples) so in-place edits raise
+    # instead of silently bypassing invalidation; change them by assignment or the helpers below.
+    
+    @property
+    def decision_configs(self) -> MappingProxyType:
+        return self._decision_configs
+    
+    @decision_configs.setter
+    def decision_configs(self, configs: Dict[DecisionType, Dict[str, Any]]):
+        self._decision_configs = MappingProxyType({
+            decision_type: MappingProxyType({
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in config.items()
+            })
+            for decision_type, config in configs.items()
+        })
+        self.clear_cache()
+    
+    @property
+    def dangerous_patterns(self) -> Tuple[str, ...]:
+        return self._dangerous_patterns
+    
+    @dangerous_patterns.setter
+    def dangerous_patterns(self, patterns: List[str]):
+        self._dangerous_patterns = tuple(patterns)
+        self.clear_cache()
+    
+    def update_decision_config(self, decision_type: DecisionType, **changes: Any):
+        """Change (or add) the configuration for one decision type"""
+        config = dict(self._decision_configs.get(
+            decision_type,
+            {"required_personas": [], "risk_threshold": 0.5, "validation_rules": []}
+        ))
+        config.update(changes)
+        self.decision_configs = {**self._decision_configs, decision_type: config}
+    
+    def add_dangerous_pattern(self, pattern: str):
+        self.dangerous_patterns = self._dangerous_patterns + (pattern,)
+    
     # ============= Persona Validators =============
     
     async def _validate_sarah_chen(
@@ -284,38 +930,10 @@ class AIDecisionInjector:
         output: Any
     ) -> PersonaConsultation:
         """Dr. Sarah Chen's validation - Backend/Systems perspective"""
-        consultation = PersonaConsultation(
-            persona_name="Dr. Sarah Chen",
-            approved=True,
-            confidence=0.9
+        return await self.validation_pool.run(
+            _sarah_chen_review, decision_type, context, output, self.dangerous_patterns,
+            size=self._payload_size(output)
         )
-        
-        # Check for system stability concerns
-        if decision_type in [DecisionType.CODE_GENERATION, DecisionType.ARCHITECTURE]:
-            # Check for failure modes
-            if isinstance(output, str):
-                if "try:" not in output.lower() and "except" not in output.lower():
-                    consultation.concerns.append("No error handling detected")
-                    consultation.confidence *= 0.8
-                
-                if "cache" in context.get("topic", "").lower():
-                    if "fallback" not in output.lower():
-                        consultation.concerns.append("No fallback strategy for cache")
-                        consultation.recommendations.append("Add fallback mechanism")
-                        consultation.confidence *= 0.7
-        
-        # Three Questions Framework
-        consultation.recommendations.extend([
-            "Consider: What breaks first?",
-            "Consider: How do we know when it breaks?",
-            "Consider: What's Plan B?"
-        ])
-        
-        if consultation.confidence < 0.7:
-            consultation.approved = False
-            consultation.risk_assessment = "high"
-        
-        return consultation
     
     async def _validate_alex_novak(
         self,
@@ -324,35 +942,10 @@ class AIDecisionInjector:
         output: Any
     ) -> PersonaConsultation:
         """Alex Novak's validation - Frontend/Integration perspective"""
-        consultation = PersonaConsultation(
-            persona_name="Alex Novak",
-            approved=True,
-            confidence=0.9
+        return await self.validation_pool.run(
+            _alex_novak_review, decision_type, context, output, self.dangerous_patterns,
+            size=self._payload_size(output)
         )
-        
-        # Check for frontend/integration concerns
-        if decision_type == DecisionType.CODE_GENERATION:
-            if isinstance(output, str):
-                # Check for memory leak patterns
-                if "addEventListener" in output and "removeEventListener" not in output:
-                    consultation.concerns.append("Potential memory leak: Event listeners not cleaned up")
-                    consultation.recommendations.append("Add cleanup in ngOnDestroy or equivalent")
-                    consultation.confidence *= 0.6
-                
-                # Check for IPC security
-                if "ipc" in output.lower() or "electron" in output.lower():
-                    if "contextBridge" not in output:
-                        consultation.concerns.append("IPC communication should use contextBridge")
-                        consultation.confidence *= 0.7
-        
-        # 3 AM Test
-        if consultation.confidence > 0.7:
-            consultation.recommendations.append("Passes 3 AM test: debuggable under pressure")
-        else:
-            consultation.concerns.append("Fails 3 AM test: needs better error messages")
-            consultation.approved = False
-        
-        return consultation
     
     async def _validate_jordan_chen(
         self,
@@ -361,36 +954,10 @@ class AIDecisionInjector:
         output: Any
     ) -> PersonaConsultation:
         """Jordan Chen's validation - Security perspective"""
-        consultation = PersonaConsultation(
-            persona_name="Jordan Chen",
-            approved=True,
-            confidence=0.95
+        return await self.validation_pool.run(
+            _jordan_chen_review, decision_type, context, output, self.dangerous_patterns,
+            size=self._payload_size(output)
         )
-        
-        if isinstance(output, str):
-            # Check for security vulnerabilities
-            import re
-            for pattern in self.dangerous_patterns:
-                if re.search(pattern, output, re.IGNORECASE):
-                    consultation.approved = False
-                    consultation.concerns.append(f"Security risk: Dangerous pattern detected ({pattern})")
-                    consultation.risk_assessment = "critical"
-                    consultation.confidence = 0.1
-                    break
-            
-            # Check for SQL injection risks
-            if "SELECT" in output.upper() or "INSERT" in output.upper():
-                if "?" not in output and "prepare" not in output.lower():
-                    consultation.concerns.append("Potential SQL injection: Use parameterized queries")
-                    consultation.recommendations.append("Use prepared statements")
-                    consultation.confidence *= 0.5
-            
-            # Check for XSS risks
-            if "innerHTML" in output or "dangerouslySetInnerHTML" in output:
-                consultation.concerns.append("XSS risk: Sanitize user input before rendering")
-                consultation.confidence *= 0.6
-        
-        return consultation
     
     async def _validate_riley_thompson(
         self,
@@ -399,26 +966,10 @@ class AIDecisionInjector:
         output: Any
     ) -> PersonaConsultation:
         """Riley Thompson's validation - Infrastructure/Operations perspective"""
-        consultation = PersonaConsultation(
-            persona_name="Riley Thompson",
-            approved=True,
-            confidence=0.85
+        return await self.validation_pool.run(
+            _riley_thompson_review, decision_type, context, output, self.dangerous_patterns,
+            size=self._payload_size(output)
         )
-        
-        if decision_type == DecisionType.DEPLOYMENT:
-            consultation.recommendations.append("Ensure rollback plan is documented")
-            consultation.recommendations.append("Verify monitoring alerts are configured")
-            
-            if isinstance(output, str):
-                if "rollback" not in output.lower():
-                    consultation.concerns.append("No rollback strategy mentioned")
-                    consultation.confidence *= 0.7
-                
-                if "health" not in output.lower() and "monitor" not in output.lower():
-                    consultation.concerns.append("No health checks or monitoring mentioned")
-                    consultation.confidence *= 0.8
-        
-        return consultation
     
     # ============= Risk Assessment =============
     
@@ -471,46 +1022,10 @@ class AIDecisionInjector:
         output: Any
     ) -> Dict[str, Any]:
         """Apply a specific validation rule"""
-        if rule == "no_dangerous_patterns":
-            if isinstance(output, str):
-                import re
-                for pattern in self.dangerous_patterns:
-                    if re.search(pattern, output, re.IGNORECASE):
-                        return {
-                            "passed": False,
-                            "message": f"Dangerous pattern detected: {pattern}"
-                        }
-        
-        elif rule == "follows_standards":
-            # Check for basic code standards
-            if isinstance(output, str) and decision_type == DecisionType.CODE_GENERATION:
-                issues = []
-                if len(output.split('\n')) > 1:
-                    lines = output.split('\n')
-                    for line in lines:
-                        if len(line) > 120:
-                            issues.append("Line too long (>120 chars)")
-                            break
-                
-                if issues:
-                    return {
-                        "passed": False,
-                        "message": f"Code standard violations: {', '.join(issues)}"
-                    }
-        
-        elif rule == "no_vulnerabilities":
-            # Already checked in Jordan Chen's validation
-            pass
-        
-        elif rule == "rollback_plan":
-            if isinstance(output, str):
-                if "rollback" not in output.lower():
-                    return {
-                        "passed": False,
-                        "message": "No rollback plan specified"
-                    }
-        
-        return {"passed": True, "message": ""}
+        return await self.validation_pool.run(
+            _check_validation_rule, rule, decision_type, output, self.dangerous_patterns,
+            size=self._payload_size(output)
+        )
     
     # ============= Auto-fix Capabilities =============
     
@@ -567,14 +1082,22 @@ class AIDecisionInjector:
         output: Any
     ) -> str:
         """Generate unique decision ID for caching"""
-        content = f"{agent_id}:{decision_type.value}:{json.dumps(context, sort_keys=True)}:{str(output)}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return self.fingerprinter.decision_id(agent_id, decision_type, context, output)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get middleware metrics"""
-        return self.metrics.copy()
+        metrics = {
+            **self.metrics,
+            "cache": {**self.decision_cache.get_stats(), "fingerprints": self.fingerprinter.get_stats()},
+            "validation_pool": self.validation_pool.get_status(),
+            "validators": {name: hist.to_dict() for name, hist in self._validator_latency.items()}
+        }
+        if self.sampler is not None:
+            metrics["sampling"] = self.sampler.get_status()
+        return metrics
     
     def clear_cache(self):
         """Clear decision cache"""
-        self.decision_cache.clear()
-        logger.info("Decision cache cleared")
\ No newline at end of file
+        if len(self.decision_cache):
+            self.decision_cache.clear()
+            logger.info("Decision cache cleared")
\ No newline at end of file
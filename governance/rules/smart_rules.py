@@ -14,6 +14,8 @@ Business Logic Summary:
 - Multi-language exemption support
 - Separate safe operations from dangerous patterns
 - File, class, and context-based exemptions
+- All patterns scanned in one pass; hits shared across checks on the same content
+- Exemptions compiled into a per-pattern index at load time
 
 Architecture Integration:
 - Implements cross-language exemption architecture
@@ -27,11 +29,16 @@ Sarah's Framework Check:
 - Plan B: Override with documented exemptions
 """
 
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+import os
 import re
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
 import fnmatch
 
 # Import hallucination detector if available
@@ -46,19 +53,145 @@ except ImportError:
     HALLUCINATION_DETECTION_AVAILABLE = False
 
 
+_DEFINITION = re.compile(r'\b(class|def|function)\s+([A-Za-z_$][\w$]*)')
+
+# Glob exemptions follow fnmatch, which is case-insensitive where the OS is
+_GLOB_IGNORES_CASE = os.path.normcase('A') == 'a'
+
+
+def _reason(exemption: Dict[str, Any]) -> str:
+    return exemption.get('reason', 'No reason provided')
+
+
+class _PathMatcher:
+    """
+    File exemptions for one pattern as a single anchored regex
+    
+    Each exemption is one lookahead branch, tried in list order, so the
+    first exemption whose path matches is the one reported - as with the
+    old linear scan. A branch matches the path as a substring or, for
+    patterns with wildcards, as an fnmatch glob.
+    """
+    
+    def __init__(self, exemptions: List[Dict[str, Any]]):
+        self.exemptions = exemptions
+        branches = []
+        for index, exemption in enumerate(exemptions):
+            path = exemption['path'].replace('\\', '/')
+            options = [f".*?{re.escape(path)}"]
+            if '*' in path or '?' in path:
+                glob = fnmatch.translate(path)
+                options.append(f"(?i:{glob})" if _GLOB_IGNORES_CASE else glob)
+            branches.append(f"(?=(?P<e{index}>{'|'.join(options)}))")
+        self._regex = re.compile(r"\A(?:" + "|".join(branches) + ")", re.DOTALL)
+    
+    def match(self, file_path: str) -> Optional[Dict[str, Any]]:
+        found = self._regex.match(file_path)
+        return self.exemptions[int(found.lastgroup[1:])] if found else None
+
+
+class _ContentProfile(NamedTuple):
+    """What exemption checks need from one file's content, extracted once"""
+    classes: Set[str]
+    functions: Set[str]
+    present: Set[str]  # Context/requires strings that occur in the content
+
+
+class _ExemptionIndex:
+    """
+    Exemptions grouped by the pattern they exempt, with path matchers compiled
+    
+    Expired file/temporary exemptions are left out; valid_until is the next
+    expiry among the kept ones, after which the index must be rebuilt.
+    """
+    
+    def __init__(self, exemptions: Dict[str, Any], is_valid):
+        self.safe_patterns = {
+            language: [(safe.lower(), safe) for safe in patterns]
+            for language, patterns in (exemptions.get('global_safe_patterns') or {}).items()
+        }
+        self.valid_until: Optional[float] = None
+        self.file = self._path_matchers(exemptions.get('file_exemptions'), is_valid)
+        self.temporary = self._path_matchers(exemptions.get('temporary_exemptions'), is_valid)
+        self.classes = self._by_pattern(exemptions.get('class_exemptions'), 'name')
+        self.functions = self._by_pattern(exemptions.get('function_exemptions'), 'name')
+        self.contexts = self._by_pattern(exemptions.get('context_exemptions'), 'context')
+        self.context_strings = {
+            value
+            for entries in self.contexts.values()
+            for exemption in entries
+            for value in (exemption['context'], exemption.get('requires'))
+            if value
+        }
+    
+    def _path_matchers(self, exemptions, is_valid) -> Dict[str, _PathMatcher]:
+        by_pattern: Dict[str, List[Dict[str, Any]]] = {}
+        for exemption in exemptions or []:
+            if not exemption.get('path') or not is_valid(exemption):
+                continue
+            expiry = self._expiry(exemption)
+            if expiry is not None and (self.valid_until is None or expiry < self.valid_until):
+                self.valid_until = expiry
+            for pattern in exemption.get('patterns', []):
+                by_pattern.setdefault(pattern, []).append(exemption)
+        return {pattern: _PathMatcher(entries) for pattern, entries in by_pattern.items()}
+    
+    @staticmethod
+    def _by_pattern(exemptions, key: str) -> Dict[str, List[Dict[str, Any]]]:
+        by_pattern: Dict[str, List[Dict[str, Any]]] = {}
+        for exemption in exemptions or []:
+            if not exemption.get(key):
+                continue
+            for pattern in exemption.get('patterns', []):
+                by_pattern.setdefault(pattern, []).append(exemption)
+        return by_pattern
+    
+    @staticmethod
+    def _expiry(exemption: Dict[str, Any]) -> Optional[float]:
+        try:
+            return datetime.strptime(exemption['expires'], '%Y-%m-%d').timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
 class ExemptionManager:
     """
     @class ExemptionManager
     @description Manages exemptions for governance rules
     @architecture_role Handle context-aware exemptions across languages
     @business_logic Reduce false positives while maintaining security
+    
+    Exemptions are compiled into an index at load time. Path-only verdicts
+    (global, file and temporary exemptions) are kept in an LRU keyed by
+    (pattern, path, language); class, function and context exemptions are
+    checked against definitions extracted once per distinct content.
     """
     
+    VERDICT_CACHE_SIZE = 16384
+    PROFILE_CACHE_SIZE = 32
+    
     def __init__(self, exemption_file: Optional[str] = None):
         """Initialize exemption manager"""
         self.exemptions = self._load_exemptions(exemption_file)
-        self._cache = {}  # Cache exemption lookups
-        
+        self._lock = threading.Lock()
+        self._verdicts: "OrderedDict[Tuple[str, str, str], Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+        self._profiles: "OrderedDict[str, _ContentProfile]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._build_index()
+    
+    def _build_index(self):
+        with self._lock:
+            self._index = _ExemptionIndex(self.exemptions, self._is_exemption_valid)
+            self._verdicts.clear()
+            self._profiles.clear()
+    
+    def reload(self, exemptions: Optional[Dict[str, Any]] = None):
+        """Recompile the index, optionally from a new exemption mapping"""
+        if exemptions is not None:
+            self.exemptions = exemptions
+        self._build_index()
+    
     def _load_exemptions(self, exemption_file: Optional[str]) -> Dict[str, Any]:
         """Load exemption configuration"""
         if not exemption_file:
@@ -106,6 +239,7 @@ class ExemptionManager:
             },
             'file_exemptions': [],
             'class_exemptions': [],
+            'function_exemptions': [],
             'context_exemptions': [],
             'temporary_exemptions': []
         }
@@ -126,79 +260,106 @@ class ExemptionManager:
         @param language Programming language
         @returns (is_exempt, reason)
         """
-        # Check cache first
-        cache_key = f"{pattern}:{file_path}:{language}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
-        # 1. Check global safe patterns for language
-        safe_patterns = self.exemptions.get('global_safe_patterns', {}).get(language, [])
-        for safe_pattern in safe_patterns:
-            if safe_pattern.lower() in pattern.lower():
-                result = (True, f"Globally safe pattern for {language}: {safe_pattern}")
-                self._cache[cache_key] = result
-                return result
-        
-        # 2. Check file-specific exemptions
-        for exemption in self.exemptions.get('file_exemptions', []):
-            if self._matches_file_pattern(file_path, exemption['path']):
-                if pattern in exemption.get('patterns', []):
-                    # Check expiration
-                    if self._is_exemption_valid(exemption):
-                        result = (True, f"File exemption: {exemption.get('reason', 'No reason provided')}")
-                        self._cache[cache_key] = result
-                        return result
-        
-        # 3. Check class-specific exemptions
-        for exemption in self.exemptions.get('class_exemptions', []):
-            class_name = exemption['name']
-            if f"class {class_name}" in content:
-                if pattern in exemption.get('patterns', []):
-                    result = (True, f"Class exemption for {class_name}: {exemption.get('reason', 'No reason provided')}")
-                    self._cache[cache_key] = result
-                    return result
-        
-        # 4. Check context-based exemptions
-        for exemption in self.exemptions.get('context_exemptions', []):
-            context_pattern = exemption['context']
-            if context_pattern in file_path or context_pattern in content:
-                if pattern in exemption.get('patterns', []):
+        index = self._index
+        if index.valid_until is not None and time.time() >= index.valid_until:
+            # An exemption expired since the index was built
+            self._build_index()
+            index = self._index
+        
+        # 1, 2 and 5 depend only on the path: global safe, file and temporary exemptions
+        before_content, after_content = self._path_verdict(index, pattern, file_path, language)
+        if before_content:
+            return True, before_content
+        
+        if pattern in index.classes or pattern in index.functions or pattern in index.contexts:
+            profile = self._content_profile(index, content)
+            
+            # 3. Check class-specific (and function-specific) exemptions
+            for exemption in index.classes.get(pattern, ()):
+                if exemption['name'] in profile.classes:
+                    return True, f"Class exemption for {exemption['name']}: {_reason(exemption)}"
+            for exemption in index.functions.get(pattern, ()):
+                if exemption['name'] in profile.functions:
+                    return True, f"Function exemption for {exemption['name']}: {_reason(exemption)}"
+            
+            # 4. Check context-based exemptions
+            for exemption in index.contexts.get(pattern, ()):
+                context_pattern = exemption['context']
+                if context_pattern in file_path or context_pattern in profile.present:
                     # Check additional requirements
                     requires = exemption.get('requires')
-                    if requires and requires not in content:
+                    if requires and requires not in profile.present:
                         continue
-                    result = (True, f"Context exemption: {exemption.get('reason', 'No reason provided')}")
-                    self._cache[cache_key] = result
-                    return result
-        
-        # 5. Check temporary exemptions
-        for exemption in self.exemptions.get('temporary_exemptions', []):
-            if self._matches_file_pattern(file_path, exemption['path']):
-                if pattern in exemption.get('patterns', []):
-                    if self._is_exemption_valid(exemption):
-                        result = (True, f"Temporary exemption (expires {exemption.get('expires', 'unknown')}): {exemption.get('reason', 'No reason provided')}")
-                        self._cache[cache_key] = result
-                        return result
-        
-        result = (False, None)
-        self._cache[cache_key] = result
-        return result
-    
-    def _matches_file_pattern(self, file_path: str, pattern: str) -> bool:
-        """Check if file path matches pattern (supports glob)"""
-        # Normalize paths
-        file_path = Path(file_path).as_posix()
-        pattern = pattern.replace('\\', '/')
-        
-        # Direct match
-        if pattern in file_path:
-            return True
+                    return True, f"Context exemption: {_reason(exemption)}"
         
-        # Glob match
-        if '*' in pattern or '?' in pattern:
-            return fnmatch.fnmatch(file_path, pattern)
-        
-        return False
+        if after_content:
+            return True, after_content
+        return False, None
+    
+    def _path_verdict(
+        self,
+        index: _ExemptionIndex,
+        pattern: str,
+        file_path: str,
+        language: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Reasons from path-only exemptions: (global or file, temporary)"""
+        key = (pattern, file_path, language)
+        with self._lock:
+            verdict = self._verdicts.get(key)
+            if verdict is not None:
+                self._verdicts.move_to_end(key)
+                self.cache_hits += 1
+                return verdict
+        self.cache_misses += 1
+        
+        verdict = (None, None)
+        lowered = pattern.lower()
+        for safe_lower, safe_pattern in index.safe_patterns.get(language, ()):
+            if safe_lower in lowered:
+                verdict = (f"Globally safe pattern for {language}: {safe_pattern}", None)
+                break
+        else:
+            posix_path = Path(file_path).as_posix()
+            matcher = index.file.get(pattern)
+            exemption = matcher.match(posix_path) if matcher else None
+            if exemption:
+                verdict = (f"File exemption: {_reason(exemption)}", None)
+            else:
+                matcher = index.temporary.get(pattern)
+                exemption = matcher.match(posix_path) if matcher else None
+                if exemption:
+                    verdict = (None, f"Temporary exemption (expires {exemption.get('expires', 'unknown')}): "
+                                     f"{_reason(exemption)}")
+        
+        with self._lock:
+            self._verdicts[key] = verdict
+            if len(self._verdicts) > self.VERDICT_CACHE_SIZE:
+                self._verdicts.popitem(last=False)
+        return verdict
+    
+    def _content_profile(self, index: _ExemptionIndex, content: str) -> _ContentProfile:
+        """Class/function definitions and context strings of content, cached per content"""
+        with self._lock:
+            profile = self._profiles.get(content)
+            if profile is not None:
+                self._profiles.move_to_end(content)
+                return profile
+        
+        classes, functions = set(), set()
+        for keyword, name in _DEFINITION.findall(content):
+            (classes if keyword == 'class' else functions).add(name)
+        profile = _ContentProfile(
+            classes=classes,
+            functions=functions,
+            present={value for value in index.context_strings if value in content}
+        )
+        
+        with self._lock:
+            self._profiles[content] = profile
+            if len(self._profiles) > self.PROFILE_CACHE_SIZE:
+                self._profiles.popitem(last=False)
+        return profile
     
     def _is_exemption_valid(self, exemption: Dict[str, Any]) -> bool:
         """Check if exemption is still valid (not expired)"""
@@ -222,7 +383,7 @@ class ExemptionManager:
         }
         
         # Count exemptions by type
-        for exemption_type in ['file_exemptions', 'class_exemptions', 
+        for exemption_type in ['file_exemptions', 'class_exemptions', 'function_exemptions',
                                'context_exemptions', 'temporary_exemptions']:
             exemptions = self.exemptions.get(exemption_type, [])
             stats['by_type'][exemption_type] = len(exemptions)
@@ -255,6 +416,75 @@ class ExemptionManager:
         return stats
 
 
+class PatternHit(NamedTuple):
+    """One pattern match with its offsets in the scanned content"""
+    name: str
+    kind: str  # 'dangerous', 'context_dependent' or 'secret'
+    start: int
+    end: int
+
+
+_GLOBAL_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+
+class PatternScanner:
+    """
+    @class PatternScanner
+    @description All rule patterns compiled into one alternation of named groups
+    @architecture_role Single-pass content scanning for SmartRules
+    @business_logic Report exactly what searching each pattern separately would, in one pass
+    
+    Every branch sits inside one lookahead, so the scan is zero-width and
+    overlapping matches are kept. Where a branch matches, the branches after
+    it are tried at the same offset; a pattern's leftmost match always starts
+    at some hit offset, so no pattern is missed. Patterns must not use
+    numbered backreferences or their own named groups.
+    """
+    
+    def __init__(self, patterns: Tuple[Tuple[str, str, str], ...]):
+        """
+        @param patterns (kind, name, regex) triples, in reporting order
+        """
+        self._entries: List[Tuple[str, str, "re.Pattern[str]"]] = []
+        self._groups: Dict[str, int] = {}
+        branches = []
+        for index, (kind, name, regex) in enumerate(patterns):
+            group = f"p{index}"
+            self._groups[group] = index
+            self._entries.append((kind, name, re.compile(regex)))
+            branches.append(f"(?P<{group}>{self._scope_flags(regex)})")
+        self._combined = re.compile("(?=" + "|".join(branches) + ")") if branches else None
+    
+    @staticmethod
+    def _scope_flags(regex: str) -> str:
+        """Inline global flags like (?i) are only legal at the start; scope them to the branch"""
+        flags = _GLOBAL_FLAGS.match(regex)
+        if not flags:
+            return regex
+        return f"(?{flags.group(1)}:{regex[flags.end():]})"
+    
+    def scan(self, content: str) -> Tuple[PatternHit, ...]:
+        """Every hit of every pattern, ordered by offset then pattern order"""
+        if self._combined is None:
+            return ()
+        hits = []
+        for match in self._combined.finditer(content):
+            position = match.start()
+            first = self._groups[match.lastgroup]
+            kind, name, _ = self._entries[first]
+            hits.append(PatternHit(name, kind, *match.span(match.lastgroup)))
+            for kind, name, compiled in self._entries[first + 1:]:
+                other = compiled.match(content, position)
+                if other:
+                    hits.append(PatternHit(name, kind, *other.span()))
+        return tuple(hits)
+
+
+@lru_cache(maxsize=16)
+def _compiled_scanner(patterns: Tuple[Tuple[str, str, str], ...]) -> PatternScanner:
+    """Instances with the same patterns (the common case) share one compiled scanner"""
+    return PatternScanner(patterns)
+
+
 class SmartRules:
     """
     @class SmartRules
@@ -313,6 +543,41 @@ class SmartRules:
             'delattr': r'delattr\s*\(',
             'getattr': r'getattr\s*\('
         }
+        
+        # Scan results per content, shared by apply_rules/validate_file/get_dangerous_patterns
+        self._scan_cache: "OrderedDict[str, Tuple[PatternScanner, Tuple[PatternHit, ...]]]" = OrderedDict()
+        self._scan_lock = threading.Lock()
+    
+    SCAN_CACHE_SIZE = 32
+    
+    def _scanner(self) -> PatternScanner:
+        """Scanner for the current pattern attributes (rebuilt if they are changed)"""
+        patterns = tuple(
+            [('dangerous', name, regex) for name, regex in self.dangerous_pattern_dict.items()]
+            + [('context_dependent', name, regex) for name, regex in self.context_dependent_patterns.items()]
+            + [('secret', f'secret_{index}', regex) for index, regex in enumerate(self.secret_patterns)]
+        )
+        return _compiled_scanner(patterns)
+    
+    def scan(self, content: str) -> Tuple[PatternHit, ...]:
+        """
+        All dangerous, context-dependent and secret pattern hits with offsets
+        
+        @param content Content to scan
+        @returns Hits ordered by offset; repeated calls with the same content reuse the scan
+        """
+        scanner = self._scanner()
+        with self._scan_lock:
+            cached = self._scan_cache.get(content)
+            if cached is not None and cached[0] is scanner:
+                self._scan_cache.move_to_end(content)
+                return cached[1]
+        hits = scanner.scan(content)
+        with self._scan_lock:
+            self._scan_cache[content] = (scanner, hits)
+            if len(self._scan_cache) > self.SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+        return hits
     
     @staticmethod
     def is_risky_time() -> bool:
@@ -379,11 +644,10 @@ class SmartRules:
         content = context.get('content', '')
         
         # Check for hardcoded secrets
-        for pattern in self.secret_patterns:
-            if re.search(pattern, content):
-                # Allow environment variable usage
-                if 'os.environ' not in content and 'process.env' not in content:
-                    return True
+        if any(hit.kind == 'secret' for hit in self.scan(content)):
+            # Allow environment variable usage
+            if 'os.environ' not in content and 'process.env' not in content:
+                return True
         
         return False
     
@@ -602,10 +866,11 @@ class SmartRules:
         dangerous = []
         exemptions = []
         language = self._detect_language(file_path)
+        found = {hit.name for hit in self.scan(content) if hit.kind != 'secret'}
         
         # Check truly dangerous patterns
-        for pattern_name, pattern_regex in self.dangerous_pattern_dict.items():
-            if re.search(pattern_regex, content):
+        for pattern_name in self.dangerous_pattern_dict:
+            if pattern_name in found:
                 is_exempt, reason = self.exemption_manager.is_pattern_exempt(
                     pattern_name, file_path, content, language
                 )
@@ -616,8 +881,8 @@ class SmartRules:
                     exemptions.append(f"{pattern_name}: {reason}")
         
         # Check context-dependent patterns
-        for pattern_name, pattern_regex in self.context_dependent_patterns.items():
-            if re.search(pattern_regex, content):
+        for pattern_name in self.context_dependent_patterns:
+            if pattern_name in found:
                 is_exempt, reason = self.exemption_manager.is_pattern_exempt(
                     pattern_name, file_path, content, language
                 )
@@ -683,7 +948,8 @@ class SmartRules:
             'errors': errors,
             'warnings': warnings,
             'exemptions': exemptions,
-            'dangerous_patterns': dangerous
+            'dangerous_patterns': dangerous,
+            'pattern_hits': [hit._asdict() for hit in self.scan(content)]
         }
     
     def check_for_hallucinations(self, context: Dict[str, Any]) -> Dict[str, Any]:
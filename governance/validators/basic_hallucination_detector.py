@@ -227,6 +227,27 @@ class BasicHallucinationDetector:
                 'has_hallucinations': False
             }
     
+    def check_content(self, content: str) -> Dict[str, Any]:
+        """
+        Check in-memory content such as an AI response
+        
+        @param content Text to check
+        @returns Summary; ERROR and CRITICAL findings count as a hallucination
+        
+        Plain data in and out so it can run in a worker process.
+        """
+        findings = self.detect(content)
+        blocking = [
+            f for f in findings
+            if f.severity in (HallucinationSeverity.ERROR, HallucinationSeverity.CRITICAL)
+        ]
+        return {
+            'is_hallucination': bool(blocking),
+            'reason': ', '.join(sorted({f.pattern_name for f in blocking})) or None,
+            'severity_score': self.get_severity_score(findings),
+            'findings': [f.to_dict() for f in findings]
+        }
+    
     def get_severity_score(self, findings: List[HallucinationFinding]) -> float:
         """
         Calculate overall severity score
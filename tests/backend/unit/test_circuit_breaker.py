@@ -0,0 +1,208 @@
+"""
+@fileoverview Unit tests for the sliding-window circuit breaker and dependency registry
+@author Dr. Sarah Chen v1.0 - 2025-09-03
+@architecture Backend - Resilience pattern testing
+@responsibility Verify failure-rate and slow-call tripping, single-probe half-open and metrics export
+@dependencies pytest, pytest-asyncio
+@integration_points CircuitBreaker, CircuitBreakerRegistry, DatabaseService
+@testing_strategy Deterministic clock via monkeypatch, no real dependencies
+@governance A recovering dependency must never receive more than one probe at a time
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai-assistant" / "backend"))
+
+import circuit_breaker
+from circuit_breaker import (
+    CircuitBreaker, CircuitBreakerOpenError, CircuitBreakerRegistry, CircuitState
+)
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(circuit_breaker.time, "time", fake.time)
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def _fail():
+    raise RuntimeError("down")
+
+
+def test_consecutive_failures_open_circuit(clock):
+    """Three straight failures still open the circuit with default settings"""
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitBreakerOpenError):
+        breaker.call(lambda: "ok")
+    assert breaker.get_state()["rejected_calls"] == 1
+
+
+def test_failure_rate_below_threshold_keeps_circuit_closed(clock):
+    """Occasional failures among many successes do not trip the breaker"""
+    breaker = CircuitBreaker(failure_threshold=3, failure_rate_threshold=0.5)
+    for i in range(20):
+        if i % 4 == 0:
+            with pytest.raises(RuntimeError):
+                breaker.call(_fail)
+        else:
+            breaker.call(lambda: "ok")
+
+    state = breaker.get_state()
+    assert breaker.state == CircuitState.CLOSED
+    assert state["failure_count"] == 5 and state["failure_rate"] == 0.25
+
+
+def test_window_expires_old_outcomes(clock):
+    """Failures older than the window no longer count"""
+    breaker = CircuitBreaker(failure_threshold=3, window_seconds=10)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(_fail)
+
+    clock.now += 11
+    with pytest.raises(RuntimeError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_state()["failure_count"] == 1
+
+
+def test_slow_calls_open_circuit(clock):
+    """Calls slower than slow_call_duration count towards the slow-call rate"""
+    breaker = CircuitBreaker(failure_threshold=2, slow_call_duration=1.0)
+
+    def slow():
+        clock.now += 2
+        return "ok"
+
+    breaker.call(slow)
+    assert breaker.state == CircuitState.CLOSED
+    breaker.call(slow)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_state()["slow_calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_untimed_calls_are_never_slow(clock):
+    """call_async_untimed records outcomes but not duration"""
+    breaker = CircuitBreaker(failure_threshold=2, slow_call_duration=1.0)
+
+    async def slow():
+        clock.now += 5
+        return "ok"
+
+    async def failing():
+        raise RuntimeError("down")
+
+    for _ in range(3):
+        await breaker.call_async_untimed(slow)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_state()["slow_calls"] == 0 and breaker.get_state()["calls_in_window"] == 3
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await breaker.call_async_untimed(failing)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_failure_result_predicate(clock):
+    """Returned values can be classified as failures"""
+    breaker = CircuitBreaker(failure_threshold=2,
+                             failure_result=lambda r: not r["success"])
+    breaker.call(lambda: {"success": False})
+    breaker.call(lambda: {"success": False})
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_single_probe(clock):
+    """Only one caller probes a recovering dependency; others fail fast"""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    with pytest.raises(RuntimeError):
+        breaker.call(_fail)
+    clock.now += 31
+
+    release = asyncio.Event()
+    probes = []
+
+    async def probe():
+        probes.append(1)
+        await release.wait()
+        return "ok"
+
+    first = asyncio.create_task(breaker.call_async(probe))
+    await asyncio.sleep(0)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.get_state()["probe_in_flight"] is True
+
+    for _ in range(5):
+        with pytest.raises(CircuitBreakerOpenError):
+            await breaker.call_async(probe)
+
+    release.set()
+    assert await first == "ok"
+    assert probes == [1]
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens(clock):
+    """A failing probe reopens the circuit and restarts the recovery timeout"""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    with pytest.raises(RuntimeError):
+        breaker.call(_fail)
+    clock.now += 31
+
+    async def failing():
+        raise RuntimeError("still down")
+
+    with pytest.raises(RuntimeError):
+        await breaker.call_async(failing)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_state()["time_until_retry"] == 30
+
+
+def test_registry_shares_breakers_and_exports_metrics(clock):
+    """Each dependency has one breaker and its state is exported as gauges"""
+    registry = CircuitBreakerRegistry()
+    claude = registry.get("claude", failure_threshold=1)
+    assert registry.get("claude") is claude
+    registry.register("database", CircuitBreaker())
+
+    with pytest.raises(RuntimeError):
+        claude.call(_fail)
+
+    metrics = registry.get_metrics()
+    assert metrics["claude"]["state"] == 2
+    assert metrics["database"]["state"] == 0
+    assert registry.get_states()["claude"]["name"] == "claude"
+
+    registry.reset()
+    assert claude.state == CircuitState.CLOSED
+
+
+def test_database_breaker_registered():
+    """The global database service registers its breaker"""
+    from database_service import db_service
+    assert circuit_breaker.circuit_breakers.get("database") is db_service.circuit_breaker
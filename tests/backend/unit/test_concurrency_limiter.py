@@ -0,0 +1,122 @@
+"""
+@fileoverview Unit tests for the adaptive upstream concurrency limiter
+@author Dr. Sarah Chen v1.0 - 2025-09-03
+@architecture Backend - Bulkhead testing
+@responsibility Verify admission, bounded queueing, load shedding and limit adaptation
+@dependencies pytest, pytest-asyncio
+@integration_points AdaptiveConcurrencyLimiter, /ai/execute, /ai/orchestrated
+@testing_strategy Event-driven fake upstream calls, no network
+@governance Overload must be shed quickly rather than slowing every request
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai-assistant" / "backend"))
+
+from concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+
+
+async def _hold(limiter, release, started=None):
+    async with limiter.acquire():
+        if started is not None:
+            started.append(1)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_excess_calls_queue_then_run_in_order():
+    """Calls beyond the limit wait and are admitted as slots free up"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_queue=5)
+    release = asyncio.Event()
+    started = []
+    tasks = [asyncio.create_task(_hold(limiter, release, started)) for _ in range(4)]
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 2 and limiter.queue_depth == 2
+    assert len(started) == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    metrics = limiter.get_metrics()
+    assert metrics["in_flight"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["accepted"] == metrics["completed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_shed_with_429():
+    """Once the wait queue is full, new calls fail fast"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue=1)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(_hold(limiter, release)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConcurrencyLimitExceeded) as error:
+        async with limiter.acquire():
+            pass
+    assert error.value.status_code == 429
+    assert error.value.retry_after > 0
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert limiter.get_metrics()["rejected"]["queue_full"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_shed_with_503():
+    """Waiting longer than queue_timeout sheds the call and frees its queue slot"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue=5, queue_timeout=0.01)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(limiter, release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConcurrencyLimitExceeded) as error:
+        async with limiter.acquire():
+            pass
+    assert error.value.status_code == 503
+    assert limiter.queue_depth == 0
+
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_under_steady_latency_and_backs_off_on_drops():
+    """Saturated calls at baseline latency raise the limit; timeouts cut it"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=50)
+    for _ in range(20):
+        limiter._on_sample(0.2, in_flight=limiter.limit)
+    grown = limiter.limit
+    assert grown > 4
+
+    async def timeout():
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await limiter.run(timeout)
+    assert limiter.get_metrics()["estimated_limit"] < grown
+    assert limiter.get_metrics()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rising_latency_shrinks_limit():
+    """A latency gradient above baseline pulls the limit down"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=20, smoothing=0.5)
+    for _ in range(20):
+        limiter._on_sample(0.1, in_flight=20)
+    before = limiter._limit
+    for _ in range(20):
+        limiter._on_sample(1.0, in_flight=20)
+    assert limiter._limit < before
+
+
+@pytest.mark.asyncio
+async def test_idle_service_does_not_inflate_limit():
+    """The limit does not grow while less than half of it is in use"""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    for _ in range(50):
+        await limiter.run(asyncio.sleep, 0)
+    assert limiter.limit == 10
@@ -0,0 +1,585 @@
+"""
+@fileoverview Unit tests for DatabaseService behaviour that does not need a live PostgreSQL
+@author Dr. Sarah Chen v1.0 - 2025-09-03
+@architecture Backend - Database service testing
+@responsibility Verify offline fallbacks, statistics caching and keyset pagination and bulk upserts
+@dependencies pytest, pytest-asyncio, asyncpg (import only)
+@integration_points DatabaseService, updated_api_endpoints stats routes
+@testing_strategy Disconnected-mode unit tests, no database server required
+@governance Statistics must stay consistent with the rows they summarize
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import asyncpg
+import pytest
+from asyncpg.exceptions._base import DataError as ClientDataError
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai-assistant" / "backend"))
+
+import database_service
+from database_service import DatabaseService, encode_cursor, decode_cursor
+
+
+SEED_RULES = [
+    {"rule_id": "SEC-001", "category": "security", "title": "Never commit secrets",
+     "description": "API keys must never be committed", "severity": "critical",
+     "enforcement": "mandatory", "examples": ["Use environment variables"]},
+    {"rule_id": "ARCH-001", "category": "architecture", "title": "Separation of concerns",
+     "description": "One responsibility per module", "severity": "high",
+     "enforcement": "mandatory"},
+]
+SEED_PRACTICES = [
+    {"practice_id": "BP-001", "title": "Use meaningful variable names",
+     "description": "Names should state their purpose", "is_required": True},
+]
+SEED_TEMPLATES = [
+    {"template_id": "TMPL-001", "name": "Basic Template",
+     "template_content": "Hello {{NAME}}", "variables": ["NAME"]},
+]
+
+
+async def _offline_service(**kwargs):
+    """Disconnected service backed by an in-memory SQLite store with seed rows"""
+    db = DatabaseService(offline_path=':memory:', **kwargs)
+    await db.bulk_upsert('rules', SEED_RULES)
+    await db.bulk_upsert('practices', SEED_PRACTICES)
+    await db.bulk_upsert('templates', SEED_TEMPLATES)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_rules_statistics_offline():
+    """Rule statistics are computed by the offline store when disconnected"""
+    db = await _offline_service()
+    stats = await db.get_rules_statistics()
+
+    assert stats["total_rules"] == 2
+    assert stats["active_rules"] == 2
+    assert stats["inactive_rules"] == 0
+    assert stats["by_category"] == {"security": 1, "architecture": 1}
+    assert stats["by_severity"] == {"critical": 1, "high": 1}
+    assert stats["mandatory_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_practices_and_templates_statistics_offline():
+    """Practice and template statistics expose the same counters as before"""
+    db = await _offline_service()
+    practices = await db.get_practices_statistics()
+    templates = await db.get_templates_statistics()
+
+    assert practices["total_practices"] == 1
+    assert practices["required_practices"] == 1
+    assert practices["by_category"] == {"general": 1}
+    assert practices["by_priority"] == {"None": 1}
+    assert templates["total_templates"] == 1
+    assert templates["most_used"] == [{"name": "Basic Template", "usage_count": 0}]
+
+
+@pytest.mark.asyncio
+async def test_statistics_cache_ttl_and_invalidation():
+    """Cached statistics are reused until invalidated"""
+    db = await _offline_service(stats_cache_ttl=60)
+    first = await db.get_rules_statistics()
+    assert await db.get_rules_statistics() is first
+
+    db._invalidate_stats('rules')
+    assert await db.get_rules_statistics() is not first
+    assert await db.get_rules_statistics(use_cache=False) is not first
+
+
+@pytest.mark.asyncio
+async def test_statistics_cache_disabled():
+    """A zero TTL disables statistics caching"""
+    db = await _offline_service(stats_cache_ttl=0)
+    first = await db.get_templates_statistics()
+    assert await db.get_templates_statistics() is not first
+
+
+def test_cursor_round_trip():
+    """Cursors decode back to typed sort key values"""
+    values = [-1, datetime(2025, 9, 1, 12, 30), "SEC-001"]
+    cursor = encode_cursor(values)
+    assert decode_cursor(cursor, ['int', 'timestamp', 'text']) == values
+
+    numeric = decode_cursor(encode_cursor([Decimal("0.85")]), ['numeric'])
+    assert numeric == [Decimal("0.85")]
+
+    # asyncpg decodes the '-infinity' NULL sort key as datetime.min
+    assert decode_cursor(encode_cursor([datetime.min]), ['timestamp']) == [database_service.NO_TIMESTAMP]
+
+
+def test_invalid_cursor_rejected():
+    """Malformed or mismatched cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", ['int'])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1, 2]), ['int'])
+
+
+@pytest.mark.asyncio
+async def test_page_projection_and_limit_offline():
+    """Projection keeps the identifier and limit caps the page"""
+    db = await _offline_service()
+    page = await db.get_rules_page(limit=1, fields=['title'])
+
+    assert page['items'] == [{"rule_id": "SEC-001", "title": "Never commit secrets"}]
+    assert page['next_cursor'] is not None
+
+    with pytest.raises(ValueError):
+        await db.get_templates_page(fields=['template_content; DROP TABLE templates'])
+
+
+def test_select_list_quotes_projected_columns():
+    """Projected columns are whitelisted and quoted"""
+    db = DatabaseService()
+    assert db._select_list('practices', ['references']) == 'p."practice_id", p."references"'
+    assert db._select_list('templates', None) == 't.*, t.category as category_name'
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeConnection:
+    """Records calls and rejects rows whose id is listed in reject (or invalid, client-side)"""
+
+    def __init__(self, reject=(), rows=None, down=False, invalid=()):
+        self.reject = set(reject)
+        self.invalid = set(invalid)
+        self.rows = rows or {}
+        self.calls = []
+        self.down = down
+
+    def transaction(self, **kwargs):
+        return _FakeTransaction()
+
+    async def execute(self, query, *args):
+        self.calls.append(('execute', query, args))
+        if self.down:
+            raise ConnectionResetError("server closed the connection")
+        if args and args[0] in self.invalid:
+            raise ClientDataError("invalid input for query argument $12: 'high' (an integer is required)")
+        if args and args[0] in self.reject:
+            raise asyncpg.exceptions.CheckViolationError("bad row")
+
+    async def executemany(self, query, rows):
+        self.calls.append(('executemany', query, rows))
+        if self.down:
+            raise ConnectionResetError("server closed the connection")
+        if any(row[0] in self.invalid for row in rows):
+            raise ClientDataError("invalid input for query argument $12: 'high' (an integer is required)")
+        if any(row[0] in self.reject for row in rows):
+            raise asyncpg.exceptions.CheckViolationError("bad batch")
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.calls.append(('copy', table, records, columns))
+
+    async def fetchval(self, query, *args):
+        self.calls.append(('fetchval', query, args))
+        if self.down:
+            raise ConnectionResetError("server closed the connection")
+        if args[0] in self.invalid:
+            raise ClientDataError("invalid input for query argument $12: 'high' (an integer is required)")
+        if args[0] in self.reject:
+            raise asyncpg.exceptions.UniqueViolationError("duplicate key")
+        return args[0]
+
+    async def fetch(self, query, *args):
+        self.calls.append(('fetch', query, args))
+        return []
+
+    async def cursor(self, query, *args, prefetch=None):
+        for table, rows in self.rows.items():
+            if f"FROM {table} " in query:
+                for row in rows:
+                    yield row
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Acquire:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def _connected_service(conn):
+    db = DatabaseService(offline_path=':memory:')
+    db.is_connected = True
+    db.pool = _FakePool(conn)
+    return db
+
+
+def _rule(rule_id, **overrides):
+    rule = {"rule_id": rule_id, "title": "t", "description": "d",
+            "severity": "high", "enforcement": "mandatory"}
+    rule.update(overrides)
+    return rule
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_small_batch_uses_executemany():
+    """Small batches upsert with executemany and report validation errors per row"""
+    conn = _FakeConnection()
+    db = _connected_service(conn)
+    result = await db.bulk_upsert('rules', [_rule("R-1"), {"rule_id": "R-2"}, _rule("R-1", title="new")])
+
+    assert result["method"] == "executemany"
+    assert result["upserted"] == 1
+    assert [e["index"] for e in result["errors"]] == [1]
+    assert result["duplicates"] == [{"index": 0, "id": "R-1", "superseded_by": 2}]
+    kind, query, rows = conn.calls[0]
+    assert kind == 'executemany' and 'ON CONFLICT ("rule_id")' in query
+    assert rows[0][2] == "new"
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_large_batch_uses_copy():
+    """Large batches are copied into a staging table and upserted once"""
+    conn = _FakeConnection()
+    db = _connected_service(conn)
+    result = await db.bulk_upsert('rules', [_rule(f"R-{i}") for i in range(5)], copy_threshold=5)
+
+    assert result["method"] == "copy"
+    assert result["upserted"] == 5
+    assert [c[0] for c in conn.calls] == ['execute', 'copy', 'execute']
+    assert 'SELECT' in conn.calls[2][1] and '_bulk_rules' in conn.calls[2][1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_falls_back_to_row_by_row():
+    """A rejected batch is retried per row so only the bad row fails"""
+    conn = _FakeConnection(reject={"R-2"})
+    db = _connected_service(conn)
+    result = await db.bulk_upsert('rules', [_rule("R-1"), _rule("R-2"), _rule("R-3")])
+
+    assert result["method"] == "row_by_row"
+    assert result["upserted"] == 2
+    assert result["errors"] == [{"index": 1, "id": "R-2", "error": "bad row"}]
+
+
+@pytest.mark.asyncio
+async def test_iter_rules_offline_streams_projected_rows():
+    """iter_rules yields rows one at a time with the requested projection"""
+    db = await _offline_service()
+    rows = [row async for row in db.iter_rules(fields=['severity'])]
+    assert rows == [
+        {"rule_id": "ARCH-001", "severity": "high"},
+        {"rule_id": "SEC-001", "severity": "critical"},
+    ]
+
+
+def test_jsonb_codec_round_trip():
+    """jsonb values are encoded with the version byte and decoded back to Python objects"""
+    value = {"examples": ["a", "b"], "nested": {"n": 1}}
+    encoded = database_service._jsonb_encode(value)
+
+    assert encoded[:1] == b'\x01'
+    assert database_service._jsonb_decode(encoded) == value
+    assert database_service._json_decode(database_service._json_encode([1, "x"])) == [1, "x"]
+
+
+def test_practice_write_rows_keep_priority():
+    """Bulk-upserted practices carry their priority column"""
+    db = DatabaseService()
+    row = db._to_write_row('practices', {"practice_id": "P-1", "title": "t",
+                                         "description": "d", "priority": "P0-CRITICAL"})
+    assert row[-1] == "P0-CRITICAL"
+    assert "priority" in db._upsert_sql('practices')
+
+
+def test_write_rows_pass_python_objects():
+    """Bulk rows carry JSONB values as Python objects for the native codec"""
+    db = DatabaseService()
+    row = db._to_write_row('rules', _rule("R-1", examples=["use env vars"]))
+    assert row[6] == ["use env vars"]
+    assert row[7] == []
+
+
+@pytest.mark.asyncio
+async def test_null_created_at_cursor_compares_as_negative_infinity():
+    """A page ending on a NULL created_at continues below '-infinity', not 0001-01-01"""
+    conn = _FakeConnection()
+    db = _connected_service(conn)
+    await db.get_rules_page(limit=2, cursor=encode_cursor([-3, datetime.min, "R-5"]))
+
+    _, query, args = conn.calls[-1]
+    assert "'-infinity'::timestamp" in query
+    assert datetime.min not in args and "R-5" in args
+
+
+@pytest.mark.asyncio
+async def test_offline_pages_chain_across_null_created_at():
+    """Offline cursors use the same NULL timestamp token and neither repeat nor skip rows"""
+    db = DatabaseService(offline_path=':memory:')
+    await db.offline.replace_mirror('rules', [
+        _rule(f"R-{n}", created_at=None if n % 2 else datetime(2025, 9, 1, n)) for n in range(6)
+    ])
+
+    seen, boundaries, cursor = [], [], None
+    while True:
+        page = await db.get_rules_page(active_only=False, limit=2, cursor=cursor)
+        seen.extend(item["rule_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        boundaries.append(decode_cursor(cursor, ['int', 'timestamp', 'text'])[1])
+
+    assert seen == ["R-4", "R-2", "R-0", "R-5", "R-3", "R-1"]
+    assert boundaries == [datetime(2025, 9, 1, 2), database_service.NO_TIMESTAMP]
+
+
+@pytest.mark.asyncio
+async def test_offline_keyset_pages_follow_postgres_order():
+    """Offline pages use the severity/created_at/id order and chain via cursors"""
+    db = await _offline_service()
+    await db.bulk_upsert('rules', [
+        {**SEED_RULES[1], "rule_id": f"LOW-{i}", "severity": "info"} for i in range(3)
+    ])
+
+    seen, cursor = [], None
+    while True:
+        page = await db.get_rules_page(limit=2, cursor=cursor, fields=['severity'])
+        seen.extend(item["rule_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen[0] == "SEC-001"
+    assert set(seen[1:4]) == {"LOW-0", "LOW-1", "LOW-2"}
+    assert seen[-1] == "ARCH-001"
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_offline_rows_keep_python_types():
+    """JSON, boolean and timestamp columns come back as Python objects"""
+    db = await _offline_service()
+    rule = (await db.get_rules(category="security"))[0]
+
+    assert rule["examples"] == ["Use environment variables"]
+    assert rule["anti_patterns"] == []
+    assert rule["active"] is True
+    assert isinstance(rule["created_at"], datetime)
+    assert rule["category_name"] == "security"
+
+
+@pytest.mark.asyncio
+async def test_offline_writes_are_journalled():
+    """Creates, updates and bulk upserts made offline are queued for replay"""
+    db = DatabaseService(offline_path=':memory:')
+    assert await db.create_rule(_rule("R-1")) == "R-1"
+    assert await db.update_rule("R-1", {"title": "renamed"}) is True
+    assert await db.update_rule("R-404", {"title": "x"}) is False
+    await db.bulk_upsert('rules', [_rule("R-2")])
+
+    journal = await db.offline.pending_journal()
+    assert [(e["operation"], e["kind"]) for e in journal] == [
+        ("create", "rules"), ("update", "rules"), ("upsert", "rules")
+    ]
+    assert journal[1]["payload"] == {"id": "R-1", "updates": {"title": "renamed"}}
+    assert db.get_connection_status()["offline_store"]["pending_journal_entries"] == 3
+    assert (await db.get_rules())[1]["title"] == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_offline_store_uses_wal(tmp_path):
+    """The SQLite file is created on first use in WAL mode"""
+    path = tmp_path / "offline" / "catalog.db"
+    db = DatabaseService(offline_path=str(path))
+    assert not path.exists()
+
+    await db.get_rules()
+    mode = await db.offline._run(lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0])
+    assert path.exists() and mode == "wal"
+    db.offline.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_replays_journal_in_order_and_refreshes_mirror():
+    """Reconnecting replays offline writes to PostgreSQL, then mirrors PostgreSQL locally"""
+    db = DatabaseService(offline_path=':memory:')
+    await db.create_rule(_rule("R-1"))
+    await db.update_rule("R-1", {"title": "renamed"})
+    await db.create_rule(_rule("R-DUP"))
+
+    conn = _FakeConnection(reject={"R-DUP"}, rows={"rules": [_rule("R-9", status="ACTIVE")]})
+    db.is_connected = True
+    db.pool = _FakePool(conn)
+    result = await db.sync_offline_store()
+
+    assert result == {"replayed": 2, "failed": 1, "mirrored": 1}
+    assert [c[0] for c in conn.calls] == ['fetchval', 'execute', 'fetchval']
+    assert conn.calls[1][2] == ("renamed", "R-1")
+    assert await db.offline.pending_journal() == []
+    assert [e["payload"]["rule_id"] for e in await db.offline.failed_journal()] == ["R-DUP"]
+
+    db.is_connected = False
+    assert [r["rule_id"] for r in await db.get_rules()] == ["R-9"]
+
+
+@pytest.mark.asyncio
+async def test_sync_waits_for_closed_breaker():
+    """Nothing is replayed while disconnected or while the breaker is not CLOSED"""
+    db = DatabaseService(offline_path=':memory:')
+    await db.create_rule(_rule("R-1"))
+    assert (await db.sync_offline_store())["replayed"] == 0
+
+    db.is_connected = True
+    db.pool = _FakePool(_FakeConnection())
+    db.circuit_breaker.state = database_service.CircuitState.OPEN
+    assert (await db.sync_offline_store())["replayed"] == 0
+    assert len(await db.offline.pending_journal()) == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_fall_back_to_journal_when_postgres_drops_mid_run():
+    """A connection error on a write trips the breaker, flips offline and journals the write"""
+    conn = _FakeConnection(down=True)
+    db = _connected_service(conn)
+    db.reconnect_interval = 3600
+
+    assert await db.create_rule(_rule("R-1")) == "R-1"
+    assert db.is_connected is False
+    assert db.circuit_breaker.get_state()["failure_count"] == 1
+
+    result = await db.bulk_upsert('rules', [_rule("R-2")])
+    assert result["method"] == "offline" and result["upserted"] == 1
+    journal = await db.offline.pending_journal()
+    assert [(e["operation"], e["kind"]) for e in journal] == [("create", "rules"), ("upsert", "rules")]
+    db._recovery_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_query_errors_do_not_trip_the_breaker():
+    """Constraint violations are raised to the caller without counting as breaker failures"""
+    db = _connected_service(_FakeConnection(reject={"R-1"}))
+    with pytest.raises(asyncpg.exceptions.UniqueViolationError):
+        await db.create_rule(_rule("R-1"))
+    assert db.is_connected is True
+    assert db.circuit_breaker.get_state()["failure_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_mistyped_fields_are_rejected_without_going_offline():
+    """asyncpg's client-side DataError is a bad row, not an outage: no breaker failure, no journal"""
+    db = _connected_service(_FakeConnection(invalid={"R-1", "R-3"}))
+    with pytest.raises(ClientDataError):
+        await db.create_rule(_rule("R-1", priority="high"))
+
+    result = await db.bulk_upsert('rules', [_rule("R-2"), _rule("R-3", priority="high")])
+    assert (result["method"], result["upserted"], result["failed"]) == ("row_by_row", 1, 1)
+    assert result["errors"][0]["id"] == "R-3"
+    assert result["errors"][0]["error"].startswith("Invalid field value")
+
+    assert db.is_connected is True
+    assert db.circuit_breaker.get_state()["failure_count"] == 0
+    assert await db.offline.pending_journal() == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upserts_never_count_as_slow_calls():
+    """Long bulk loads on a healthy server do not push the breaker towards OPEN"""
+    db = _connected_service(_FakeConnection())
+    db.circuit_breaker.slow_call_duration = -1  # Every timed call counts as slow
+    for n in range(5):
+        await db.bulk_upsert('rules', [_rule(f"R-{n}")])
+    assert db.circuit_breaker.get_state()["slow_calls"] == 0
+
+    await db.create_rule(_rule("R-9"))
+    assert db.circuit_breaker.get_state()["slow_calls"] == 1
+    assert db.circuit_breaker.state == database_service.CircuitState.CLOSED
+
+
+class _StalePool:
+    def __init__(self, busy):
+        self.busy = busy
+        self.closed = self.terminated = False
+
+    async def close(self):
+        if self.busy:
+            await asyncio.sleep(3600)
+        self.closed = True
+
+    def terminate(self):
+        self.terminated = True
+
+
+@pytest.mark.asyncio
+async def test_reconnect_closes_the_stale_pool_before_terminating(monkeypatch):
+    """Queries on the old pool get _POOL_CLOSE_TIMEOUT to finish; only a hung pool is terminated"""
+    async def unreachable(*args, **kwargs):
+        raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(database_service.asyncpg, "create_pool", unreachable)
+    monkeypatch.setattr(database_service, "_POOL_CLOSE_TIMEOUT", 0.01)
+    db = DatabaseService(offline_path=':memory:', reconnect_interval=3600)
+
+    for busy in (False, True):
+        stale = db.pool = _StalePool(busy)
+        await db.connect("postgresql://unused")
+        assert (stale.closed, stale.terminated) == (not busy, busy)
+        assert db.pool is None and db.is_connected is False
+    db._recovery_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_replayed_upsert_with_rejected_rows_is_kept():
+    """An upsert entry with rows PostgreSQL rejects is marked failed, not acknowledged"""
+    db = DatabaseService(offline_path=':memory:')
+    await db.bulk_upsert('rules', [_rule("R-1"), _rule("R-BAD")])
+
+    conn = _FakeConnection(reject={"R-BAD"})
+    db.is_connected = True
+    db.pool = _FakePool(conn)
+    result = await db.sync_offline_store()
+
+    assert (result["replayed"], result["failed"]) == (0, 1)
+    failed = await db.offline.failed_journal()
+    assert [r["rule_id"] for r in failed[0]["payload"]] == ["R-1", "R-BAD"]
+    assert "R-BAD" in failed[0]["error"]
+
+
+@pytest.mark.asyncio
+async def test_recovery_keeps_retrying_after_unexpected_errors(monkeypatch):
+    """An unexpected error during recovery is logged and retried, not fatal"""
+    db = DatabaseService(offline_path=':memory:', reconnect_interval=0)
+    attempts = []
+
+    async def connect(url=None):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        db.is_connected = True
+
+    async def sync():
+        return {"replayed": 0}
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(db, "connect", connect)
+    monkeypatch.setattr(db, "sync_offline_store", sync)
+    monkeypatch.setattr(database_service.asyncio, "sleep", no_sleep)
+    await db._recover()
+
+    assert len(attempts) == 2 and db.is_connected
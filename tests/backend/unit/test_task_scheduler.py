@@ -0,0 +1,189 @@
+"""
+@fileoverview Unit tests for the priority-aware orchestrated task scheduler
+@author Dr. Sarah Chen v1.0 - 2025-09-03
+@architecture Backend - Scheduler testing
+@responsibility Verify priority ordering, weighted fairness, token budget admission and submit/poll/stream
+@dependencies pytest, pytest-asyncio
+@integration_points PriorityTaskScheduler, /ai/orchestrated endpoints
+@testing_strategy Fake task coroutines gated by events, no upstream calls
+@governance Token spend must stay within resource_limits["max_tokens_per_minute"]
+"""
+
+import asyncio
+import sys
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai-assistant" / "backend"))
+
+from task_scheduler import PriorityTaskScheduler, SchedulerFullError
+
+
+class Priority(Enum):
+    HIGH = 1
+    MEDIUM = 2
+    LOW = 3
+
+
+def _job(order, name, result=None):
+    async def run():
+        order.append(name)
+        return result if result is not None else name
+    return run
+
+
+async def _drain(scheduler, tasks):
+    for task in tasks:
+        await scheduler.wait(task.task_id, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first():
+    """Queued interactive work is dispatched ahead of batch work"""
+    scheduler = PriorityTaskScheduler(token_limit=lambda: 10_000, max_concurrent=1)
+    order = []
+    tasks = [scheduler.submit(_job(order, f"low{i}"), Priority.LOW, 100) for i in range(3)]
+    tasks.append(scheduler.submit(_job(order, "high"), Priority.HIGH, 100))
+
+    await _drain(scheduler, tasks)
+    assert order[0] == "high"
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_low_priority_gets_weighted_share():
+    """Low priority keeps progressing in proportion to its weight"""
+    scheduler = PriorityTaskScheduler(
+        token_limit=lambda: 1_000_000, max_concurrent=1, weights={"high": 4, "low": 1}
+    )
+    order = []
+    tasks = [scheduler.submit(_job(order, "high"), "high", 100) for _ in range(20)]
+    tasks += [scheduler.submit(_job(order, "low"), "low", 100) for _ in range(5)]
+
+    await _drain(scheduler, tasks)
+    first_ten = order[:10]
+    assert first_ten.count("low") == 2
+    assert scheduler.get_metrics()["started_by_priority"] == {"high": 20, "low": 5}
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_token_budget_holds_tasks_until_window_frees():
+    """Tasks beyond the rolling token budget wait; the limit is read live"""
+    limits = {"max_tokens_per_minute": 1000}
+    scheduler = PriorityTaskScheduler(
+        token_limit=lambda: limits["max_tokens_per_minute"], max_concurrent=10
+    )
+    order = []
+    first = scheduler.submit(_job(order, "a"), "medium", 800)
+    second = scheduler.submit(_job(order, "b"), "medium", 800)
+    await scheduler.wait(first.task_id, timeout=1)
+    await asyncio.sleep(0.01)
+
+    assert second.status == "queued"
+    assert scheduler.get_metrics()["tokens_used_in_window"] == 800
+
+    limits["max_tokens_per_minute"] = 2000
+    scheduler._wakeup.set()
+    await scheduler.wait(second.task_id, timeout=1)
+    assert order == ["a", "b"]
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_actual_usage_settles_estimate():
+    """Reported tokens_used replaces the estimate in the budget"""
+    scheduler = PriorityTaskScheduler(token_limit=lambda: 10_000)
+    task = scheduler.submit(_job([], "x", {"tokens_used": 300}), "medium", 1000)
+    await scheduler.wait(task.task_id, timeout=1)
+
+    assert task.tokens_used == 300
+    assert scheduler.budget.used() == 300
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_refund_returns_the_reservation_once():
+    """A task rejected before calling upstream hands its estimate back to the budget"""
+    scheduler = PriorityTaskScheduler(token_limit=lambda: 10_000)
+    refunds = []
+
+    async def rejected():
+        refunds.append(scheduler.refund(task.task_id))
+        refunds.append(scheduler.refund(task.task_id))
+        raise RuntimeError("rate limited")
+
+    task = scheduler.submit(rejected, "medium", 1000)
+    await scheduler.wait(task.task_id, timeout=1)
+
+    assert refunds == [True, False]
+    assert task.status == "failed" and task.tokens_used == 0
+    assert scheduler.budget.used() == 0
+    assert scheduler.refund(task.task_id) is False
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_and_poll_report_lifecycle():
+    """Streaming yields each status change and polling returns the result"""
+    scheduler = PriorityTaskScheduler(token_limit=lambda: 10_000)
+    release = asyncio.Event()
+
+    async def run():
+        await release.wait()
+        return {"response": "done"}
+
+    task = scheduler.submit(run, "high", 10)
+    statuses = []
+
+    async def consume():
+        async for event in scheduler.stream(task.task_id):
+            statuses.append(event["status"])
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(consumer, 1)
+
+    assert statuses[-2:] == ["running", "completed"]
+    snapshot = scheduler.get(task.task_id).to_dict()
+    assert snapshot["result"] == {"response": "done"}
+    assert snapshot["queue_wait_ms"] is not None
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_failures_cancellation_and_full_queue():
+    """Failed tasks keep their error, queued tasks can be cancelled, full queues reject"""
+    scheduler = PriorityTaskScheduler(
+        token_limit=lambda: 10_000, max_concurrent=1, max_queued_per_priority=2
+    )
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    async def failing():
+        raise RuntimeError("upstream down")
+
+    running = scheduler.submit(blocked, "medium", 10)
+    await asyncio.sleep(0)
+    queued = scheduler.submit(failing, "medium", 10)
+    scheduler.submit(failing, "medium", 10)
+    with pytest.raises(SchedulerFullError):
+        scheduler.submit(failing, "medium", 10)
+    with pytest.raises(ValueError):
+        scheduler.submit(failing, "urgent", 10)
+
+    assert scheduler.queue_position(queued.task_id) == 0
+    assert await scheduler.cancel(queued.task_id) is True
+    assert queued.status == "cancelled"
+
+    release.set()
+    await scheduler.wait(running.task_id, timeout=1)
+    await asyncio.sleep(0.01)
+    metrics = scheduler.get_metrics()
+    assert metrics["failed"] == 1 and metrics["cancelled"] == 1 and metrics["rejected"] == 1
+    await scheduler.stop()
@@ -0,0 +1,71 @@
+"""
+@fileoverview Unit tests for catalog API helpers (bulk import and NDJSON export)
+@author Dr. Sarah Chen v1.0 - 2025-09-03
+@architecture Backend - API endpoint testing
+@responsibility Verify per-row bulk error reporting and streaming export encoding
+@dependencies pytest, pytest-asyncio, fastapi, pydantic
+@integration_points updated_api_endpoints, DatabaseService
+@testing_strategy Helper-level unit tests with fake upsert callables, no database required
+@governance Bulk imports must never silently drop rows
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "ai-assistant" / "backend"))
+
+from updated_api_endpoints import RuleCreate, bulk_import, ndjson_stream
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_plain_and_gzip():
+    """Rows are encoded one per line, with or without gzip"""
+    rows = [{"id": i, "at": datetime(2025, 9, 1), "score": Decimal("0.5")} for i in range(250)]
+
+    plain = await _collect(ndjson_stream(_rows(rows)))
+    lines = plain.decode().splitlines()
+    assert len(lines) == 250
+    assert json.loads(lines[0]) == {"id": 0, "at": "2025-09-01T00:00:00", "score": 0.5}
+
+    compressed = await _collect(ndjson_stream(_rows(rows), compress=True))
+    assert gzip.decompress(compressed) == plain
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_maps_errors_to_request_indexes():
+    """Validation and database errors are reported against the original positions"""
+    async def fake_upsert(valid):
+        # Reject the second valid record
+        return {
+            "upserted": len(valid) - 1,
+            "method": "executemany",
+            "errors": [{"index": 1, "id": valid[1]["rule_id"], "error": "bad row"}],
+            "duplicates": [{"index": 0, "id": "R-1", "superseded_by": 1}],
+        }
+
+    good = {"rule_id": "R-1", "title": "t", "description": "d",
+            "severity": "high", "enforcement": "mandatory"}
+    records = [good, {"rule_id": "R-2"}, dict(good, rule_id="R-3")]
+
+    result = await bulk_import(RuleCreate, 'rule_id', records, fake_upsert)
+
+    assert result["success"] is False
+    assert result["upserted"] == 1
+    assert [(e["index"], e["id"]) for e in result["errors"]] == [(1, "R-2"), (2, "R-3")]
+    assert result["superseded"] == 1
+    assert result["duplicates"] == [{"index": 0, "id": "R-1", "superseded_by": 2}]
@@ -0,0 +1,68 @@
+"""
+@fileoverview Throughput benchmark for the compiled governance rule table
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance rule evaluation benchmarking
+@responsibility Compare indexed RuleTable dispatch with a linear priority-ordered scan
+@dependencies governance.core.rule_table, governance.core.context
+@integration_points RuleTable.match
+@testing_strategy Standalone script, not collected by pytest: python tests/performance/bench_rule_table.py
+@governance Correctness is covered by tests/unit/governance/test_rule_table.py; this only reports speed
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.context import GovernanceContext
+from governance.core.rule_table import RuleTable, compile_rule
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--types", type=int, default=500)
+    parser.add_argument("--evaluations", type=int, default=20000)
+    parser.add_argument("--linear-sample", type=int, default=500,
+                        help="Evaluations timed for the linear scan (extrapolated)")
+    args = parser.parse_args()
+
+    specs = [
+        {"id": f"r{n}", "operation_type": f"op_{n % args.types}",
+         "when": [{"field": "payload.level", "equals": n}], "decision": "review", "priority": n % 7}
+        for n in range(args.rules)
+    ]
+    specs.append({"id": "default", "operation_type": "*", "decision": "approved", "priority": -1000})
+    table = RuleTable(compile_rule(spec, order) for order, spec in enumerate(specs))
+    ordered = sorted(table.rules, key=lambda r: (-r.priority, r.order))
+    contexts = [GovernanceContext(operation_type=f"op_{n % args.types}",
+                                  payload={"level": n % (args.rules + 1000)})
+                for n in range(args.evaluations)]
+
+    def linear(context):
+        for rule in ordered:
+            if (context.operation_type in rule.operation_types or "*" in rule.operation_types) \
+                    and rule.matches(context):
+                return rule
+
+    started = time.perf_counter()
+    for context in contexts:
+        table.match(context)
+    indexed_s = time.perf_counter() - started
+
+    sample = contexts[:args.linear_sample]
+    started = time.perf_counter()
+    for context in sample:
+        linear(context)
+    linear_s = (time.perf_counter() - started) * len(contexts) / len(sample)
+
+    print(f"rule table ({len(table)} rules, {args.types} types): "
+          f"{len(contexts) / indexed_s:,.0f} evals/s indexed, "
+          f"{len(contexts) / linear_s:,.0f} evals/s linear, "
+          f"{linear_s / indexed_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+@fileoverview Unit tests for the batched runtime governance audit pipeline
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance audit testing
+@responsibility Verify the bounded ring, indexed filters, batched JSONL segments and rotation
+@dependencies pytest, pytest-asyncio, governance.core.runtime_governance, governance.core.audit_writer
+@integration_points RuntimeGovernanceSystem._audit_log_event, get_audit_log, AuditSegmentWriter
+@testing_strategy Temp directories for segments; events generated directly
+@governance Audit events must reach disk in order and remain queryable in memory
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.audit_writer import AuditSegmentWriter
+from governance.core.runtime_governance import RuntimeGovernanceSystem, HookType
+
+
+def _read_segments(directory):
+    return [
+        json.loads(line)
+        for segment in sorted(Path(directory).glob("runtime_audit_*.jsonl"))
+        for line in segment.read_text().splitlines()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_to_jsonl_and_hooks_run(tmp_path):
+    """One writer persists queued events in order and runs AUDIT_LOG hooks"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_dir=tmp_path,
+                                         audit_batch_size=50, audit_flush_interval=0.05)
+    seen = []
+
+    async def hook(event):
+        seen.append(event["n"])
+
+    governance.register_hook(HookType.AUDIT_LOG, hook)
+    for n in range(120):
+        governance._audit_log_event({"event": "test", "n": n})
+    await governance.flush_audit_log()
+
+    assert [e["n"] for e in _read_segments(tmp_path)] == list(range(120))
+    assert sorted(seen) == list(range(120))
+    assert governance.audit_writer.batches_written == 3
+    await governance.close_audit_log()
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_bounds_memory_and_keeps_indexes_consistent():
+    """Old events fall out of the ring and out of the filter indexes"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_memory_size=100,
+                                         audit_flush_interval=0.01)
+    for n in range(250):
+        governance._audit_log_event({"event": f"type_{n % 2}", "agent_id": f"agent_{n % 5}", "n": n})
+
+    assert len(governance.audit_log) == 100
+    assert governance.audit_log[0]["n"] == 150
+    assert sum(len(entries) for entries in governance._audit_by_agent.values()) == 100
+    assert sum(len(entries) for entries in governance._audit_by_event.values()) == 100
+
+    recent = governance.get_audit_log(limit=3, agent_id="agent_1")
+    assert [e["n"] for e in recent] == [236, 241, 246]
+
+    both = governance.get_audit_log(limit=1000, agent_id="agent_1", event_type="type_0")
+    assert all(e["n"] % 10 == 6 for e in both) and len(both) == 10
+    await governance.close_audit_log()
+
+
+@pytest.mark.asyncio
+async def test_time_range_filter():
+    """since/until filter by ingestion time and accept datetimes or ISO strings"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_flush_interval=0.01)
+    governance._audit_log_event({"event": "old"})
+    time.sleep(0.02)
+    boundary = datetime.now()
+    time.sleep(0.02)
+    governance._audit_log_event({"event": "new"})
+
+    assert [e["event"] for e in governance.get_audit_log(since=boundary)] == ["new"]
+    assert [e["event"] for e in governance.get_audit_log(until=boundary.isoformat())] == ["old"]
+    await governance.close_audit_log()
+
+
+@pytest.mark.asyncio
+async def test_time_range_bisects_with_filters_and_limit():
+    """since/until bound the indexed and unfiltered reads; limit keeps the newest"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_memory_size=50,
+                                         audit_flush_interval=0.01)
+    for n in range(80):
+        governance._audit_log_event({"event": f"type_{n % 2}", "agent_id": f"agent_{n % 4}", "n": n})
+    # Distinct ingestion times: the ring holds n = 30..79 logged at time n
+    governance._audit_times = deque((float(n) for n in range(30, 80)), maxlen=50)
+    since, until = 40, 60
+
+    assert [e["n"] for e in governance.get_audit_log(limit=5, since=since, until=until)] == [56, 57, 58, 59, 60]
+    filtered = governance.get_audit_log(limit=100, agent_id="agent_2", since=since, until=until)
+    assert [e["n"] for e in filtered] == [n for n in range(40, 61) if n % 4 == 2]
+    assert governance.get_audit_log(limit=0) == []
+    await governance.close_audit_log()
+
+
+@pytest.mark.asyncio
+async def test_write_errors_do_not_stop_the_writer(tmp_path):
+    """A failing batch is logged and counted; later events still reach disk and flush returns"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_dir=tmp_path,
+                                         audit_batch_size=1, audit_flush_interval=0.01)
+    write_batch = governance.audit_writer.write_batch
+    calls = []
+
+    def flaky(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return write_batch(batch)
+
+    governance.audit_writer.write_batch = flaky
+    governance._audit_log_event({"event": "lost"})
+    await asyncio.wait_for(governance.flush_audit_log(), timeout=1)
+    circular = {"event": "circular"}
+    circular["self"] = circular
+    governance._audit_log_event(circular)
+    governance._audit_log_event({"event": "kept"})
+    await asyncio.wait_for(governance.flush_audit_log(), timeout=1)
+
+    assert [e["event"] for e in _read_segments(tmp_path)] == ["kept"]
+    assert governance.get_metrics()["audit_write_errors"] == 1
+    assert governance.audit_writer.write_errors == 1
+    await governance.close_audit_log()
+
+
+def test_writer_rotates_and_enforces_retention(tmp_path):
+    """Segments rotate at max_segment_bytes and only the newest are kept"""
+    writer = AuditSegmentWriter(tmp_path, max_segment_bytes=200, max_segments=3)
+    for n in range(20):
+        writer.write_batch([{"event": "x", "payload": "y" * 100, "n": n}])
+    writer.close()
+
+    assert len(writer.segments()) == 3
+    assert writer.rotations >= 3
+    assert [e["n"] for e in _read_segments(tmp_path)][-1] == 19
+
+
+def test_without_event_loop_events_write_through(tmp_path):
+    """Synchronous callers (no loop) still persist audit events"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, audit_dir=tmp_path)
+    governance.update_resource_limits({"max_agents": 3})
+    governance.audit_writer.close()
+
+    assert _read_segments(tmp_path)[0]["event"] == "resource_limits_updated"
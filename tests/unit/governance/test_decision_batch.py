@@ -0,0 +1,80 @@
+"""
+@fileoverview Unit tests for batch AI decision validation
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance middleware testing
+@responsibility Verify ordering, deduplication, shared context fingerprints and parity with single calls
+@dependencies pytest, pytest-asyncio, governance.middleware.ai_decision_injector
+@integration_points AIDecisionInjector.intercept_decisions, DecisionRequest
+@testing_strategy Mixed batches with repeated outputs and shared contexts
+@governance A batch must decide exactly what the same decisions decide one by one
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.middleware.ai_decision_injector import (
+    AIDecisionInjector,
+    DecisionRequest,
+    DecisionType
+)
+
+
+def _batch():
+    shared = {"task": "refactor", "files": ["a.py", "b.py"]}
+    return [
+        DecisionRequest("agent", DecisionType.CODE_GENERATION, shared, "x = 1"),
+        DecisionRequest("agent", DecisionType.SECURITY, shared, "os.system('rm -rf /')"),
+        DecisionRequest("agent", DecisionType.CODE_GENERATION, shared, "x = 1"),
+        {"agent_id": "agent", "decision_type": "deployment", "input_context": shared,
+         "proposed_output": "deploy with rollback and health checks"},
+        DecisionRequest("agent", DecisionType.CODE_GENERATION, shared, "x = 1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_calls_in_order():
+    batched = await AIDecisionInjector().intercept_decisions(_batch())
+
+    single = AIDecisionInjector()
+    expected = []
+    for item in _batch():
+        request = item if isinstance(item, DecisionRequest) else DecisionRequest.from_dict(item)
+        expected.append(await single.intercept_decision(
+            request.agent_id, request.decision_type, request.input_context, request.proposed_output
+        ))
+
+    assert [v.decision_id for v in batched] == [v.decision_id for v in expected]
+    assert [v.approved for v in batched] == [v.approved for v in expected]
+    assert [v.warnings for v in batched] == [v.warnings for v in expected]
+
+
+@pytest.mark.asyncio
+async def test_identical_decisions_are_validated_once():
+    injector = AIDecisionInjector()
+    results = await injector.intercept_decisions(_batch())
+
+    assert results[0] is results[2] is results[4]
+    assert not results[1].approved
+    metrics = injector.get_metrics()
+    assert metrics["decisions_processed"] == 3
+    assert metrics["batch_items"] == 5 and metrics["batch_duplicates"] == 2
+    assert metrics["validators"]["Dr. Sarah Chen"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_ids_share_the_decision_cache():
+    """A decision validated singly is a cache hit inside a later batch"""
+    injector = AIDecisionInjector()
+    context = {"task": "x"}
+    await injector.intercept_decision("agent", DecisionType.TESTING, context, "assert ok")
+    await injector.intercept_decisions([DecisionRequest("agent", DecisionType.TESTING, dict(context), "assert ok")])
+    assert injector.get_metrics()["cache"]["hits"] == 1
+
+
+def test_unknown_decision_type_is_rejected():
+    with pytest.raises(ValueError):
+        DecisionRequest.from_dict({"agent_id": "a", "decision_type": "telepathy"})
@@ -0,0 +1,94 @@
+"""
+@fileoverview Unit tests for the AIDecisionInjector TTL/LRU decision cache
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance middleware testing
+@responsibility Verify LRU eviction, TTL expiry, counters and invalidation on configuration changes
+@dependencies pytest, pytest-asyncio, governance.middleware.ai_decision_injector
+@integration_points DecisionCache, AIDecisionInjector.intercept_decision, get_metrics
+@testing_strategy Small caches and short TTLs; configuration changed between identical decisions
+@governance A cached approval must never outlive the rules that produced it
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.middleware.ai_decision_injector import (
+    AIDecisionInjector,
+    DecisionCache,
+    DecisionType,
+    DecisionValidation,
+    RiskLevel
+)
+
+
+def _validation(decision_id):
+    return DecisionValidation(decision_id=decision_id, approved=True, risk_level=RiskLevel.LOW,
+                              confidence_score=1.0, personas_consulted=[])
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = DecisionCache(max_size=3)
+    for key in "abc":
+        cache.put(key, _validation(key))
+    assert cache.get("a") is not None  # a becomes most recent
+    cache.put("d", _validation("d"))
+
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 1 and stats["size"] == 3
+
+
+def test_entries_expire_after_ttl():
+    cache = DecisionCache(ttl_seconds=0.02)
+    cache.put("a", _validation("a"))
+    time.sleep(0.03)
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert stats["expirations"] == 1 and stats["misses"] == 1 and stats["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_decision_is_served_from_cache():
+    injector = AIDecisionInjector()
+    first = await injector.intercept_decision("agent", DecisionType.SECURITY, {"q": 1}, "print('ok')")
+    second = await injector.intercept_decision("agent", DecisionType.SECURITY, {"q": 1}, "print('ok')")
+
+    assert second is first
+    cache = injector.get_metrics()["cache"]
+    assert cache["hits"] == 1 and cache["misses"] == 1
+    assert injector.metrics["decisions_processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_configuration_changes_invalidate_cached_decisions():
+    """New dangerous patterns and decision configs apply to previously cached outputs"""
+    injector = AIDecisionInjector()
+    injector.update_decision_config(DecisionType.CODE_REVIEW, required_personas=["Jordan Chen"], risk_threshold=0.9)
+    output = "chmod 777 /srv/app"
+    assert (await injector.intercept_decision("agent", DecisionType.CODE_REVIEW, {}, output)).approved
+
+    injector.add_dangerous_pattern(r"chmod\s+777")
+    assert not (await injector.intercept_decision("agent", DecisionType.CODE_REVIEW, {}, output)).approved
+
+    injector.update_decision_config(DecisionType.CODE_REVIEW, required_personas=[])
+    assert (await injector.intercept_decision("agent", DecisionType.CODE_REVIEW, {}, output)).approved
+    assert injector.get_metrics()["cache"]["invalidations"] == 2
+
+
+def test_in_place_configuration_edits_fail_loudly():
+    """Configs are read-only views, so edits that would skip invalidation raise"""
+    injector = AIDecisionInjector()
+    with pytest.raises(TypeError):
+        injector.decision_configs[DecisionType.SECURITY]["risk_threshold"] = 0.9
+    with pytest.raises(TypeError):
+        injector.decision_configs[DecisionType.DEPLOYMENT] = {}
+    with pytest.raises(AttributeError):
+        injector.decision_configs[DecisionType.SECURITY]["required_personas"].append("Alex Novak")
+    with pytest.raises(AttributeError):
+        injector.dangerous_patterns.append(r"chmod\s+777")
@@ -0,0 +1,67 @@
+"""
+@fileoverview Unit tests for streaming blake2b decision fingerprints
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance middleware testing
+@responsibility Verify fingerprint stability, sensitivity and the bounded large-string memo
+@dependencies pytest, governance.middleware.ai_decision_injector
+@integration_points DecisionFingerprinter, AIDecisionInjector._generate_decision_id
+@testing_strategy Equal/unequal inputs and a tiny memo budget
+@governance Distinct decisions must never share a cache key
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.middleware.ai_decision_injector import DecisionFingerprinter, DecisionType
+
+
+def _id(fingerprinter, context, output="out", agent="agent", decision_type=DecisionType.CODE_REVIEW):
+    return fingerprinter.decision_id(agent, decision_type, context, output)
+
+
+def test_stable_across_key_order_and_sensitive_to_values():
+    fp = DecisionFingerprinter()
+    base = _id(fp, {"a": 1, "b": {"x": [1, 2]}})
+    assert base == _id(fp, {"b": {"x": [1, 2]}, "a": 1})
+    assert len(base) == 16
+
+    variants = [
+        _id(fp, {"a": True, "b": {"x": [1, 2]}}),
+        _id(fp, {"a": "1", "b": {"x": [1, 2]}}),
+        _id(fp, {"a": 1, "b": {"x": [2, 1]}}),
+        _id(fp, {"a": 1, "b": {"x": [1, 2]}}, output="other"),
+        _id(fp, {"a": 1, "b": {"x": [1, 2]}}, agent="agent-2"),
+        _id(fp, {"a": 1, "b": {"x": [1, 2]}}, decision_type=DecisionType.TESTING),
+        _id(fp, {"ab": 1, "b": {"x": [1, 2]}}),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_large_strings_are_memoized_but_mutable_contexts_are_not():
+    fp = DecisionFingerprinter(memo_min_chars=50)
+    output = "y" * 1000
+    context = {"history": "h" * 500}
+    first = _id(fp, context, output)
+    assert _id(fp, context, output) == first
+    assert fp.memo_hits == 2 and fp.memo_misses == 2
+
+    # Equal content in a new string object (as every backend request builds) hits the memo
+    assert _id(fp, {"history": "".join(["h"] * 500)}, "".join(["y"] * 1000)) == first
+    assert fp.memo_hits == 4 and fp.memo_misses == 2
+
+    context["extra"] = 1
+    assert _id(fp, context, output) != first
+
+
+def test_memo_is_bounded_by_total_size():
+    fp = DecisionFingerprinter(memo_min_chars=50, memo_max_chars=250)
+    strings = [str(n) * 100 for n in range(1, 6)]
+    for text in strings:
+        _id(fp, {}, text)
+    stats = fp.get_stats()
+    assert stats["memo_entries"] == 2 and stats["memo_chars"] == 200
+
+    _id(fp, {}, strings[-1])
+    assert fp.memo_hits == 1
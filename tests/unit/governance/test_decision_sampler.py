@@ -0,0 +1,94 @@
+"""
+@fileoverview Unit tests for MONITOR-level decision sampling
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance observability testing
+@responsibility Verify the sampled fraction, forced high-risk types, reservoirs and extrapolated counts
+@dependencies pytest, pytest-asyncio, governance.core.decision_sampler
+@integration_points DecisionSampler, RuntimeGovernanceSystem.validate_ai_decision, AIDecisionInjector.intercept_decision
+@testing_strategy Seeded sampler; governance level switched between MONITOR and STRICT
+@governance Sampling must only apply in MONITOR mode and never to high-risk types
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.decision_sampler import DecisionSampler
+from governance.core.runtime_governance import RuntimeGovernanceSystem, GovernanceLevel
+from governance.middleware.ai_decision_injector import AIDecisionInjector, DecisionType
+
+
+def test_fraction_forced_types_and_estimates():
+    """Roughly rate of routine decisions are validated; security always is; estimates scale up"""
+    sampler = DecisionSampler(rate=0.2, reservoir_size=10, seed=7)
+    validated = 0
+    for _ in range(5000):
+        if sampler.should_validate("agent", "code_review"):
+            validated += 1
+            sampler.record("agent", "code_review", approved=False)
+    assert 900 < validated < 1100
+
+    assert all(sampler.should_validate("agent", DecisionType.SECURITY) for _ in range(20))
+
+    status = sampler.get_status()
+    assert status["seen"] == 5020
+    assert status["validated"] == validated + 20
+    assert status["estimated"]["rejected"] == 5000
+    assert len(sampler.reservoir("agent")) == 10
+
+
+def test_reservoir_is_uniform_over_validated_outcomes():
+    """Early and late outcomes are equally likely to stay in the reservoir"""
+    sampler = DecisionSampler(rate=1.0, reservoir_size=100, seed=1)
+    for n in range(2000):
+        sampler.should_validate("agent", "testing")
+        sampler.record("agent", "testing", approved=n < 1000)
+    kept_early = sum(outcome["approved"] for outcome in sampler.reservoir("agent"))
+    assert 30 < kept_early < 70
+
+
+def test_inactive_sampler_validates_everything_without_counting():
+    sampler = DecisionSampler(rate=0.0, enabled=lambda: False)
+    assert sampler.should_validate("agent", "code_review")
+    assert sampler.get_status()["seen"] == 0
+    with pytest.raises(ValueError):
+        sampler.rate = 1.5
+
+
+@pytest.mark.asyncio
+async def test_runtime_governance_samples_only_in_monitor_mode():
+    """MONITOR skips unsampled decisions; STRICT validates all of them"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, monitor_sample_rate=0.0)
+    governance.set_governance_level(GovernanceLevel.MONITOR)
+    result = await governance.validate_ai_decision("agent", "response", {}, "fine")
+    assert result.approved and result.metadata["sampled"] is False
+    assert governance.metrics["decisions_validated"] == 0
+
+    await governance.validate_ai_decision("agent", "security", {}, "fine")
+    assert governance.metrics["decisions_validated"] == 1
+    assert governance.get_metrics()["sampling"]["skipped"] == 1
+
+    governance.set_governance_level(GovernanceLevel.STRICT)
+    await governance.validate_ai_decision("agent", "response", {}, "fine")
+    assert governance.metrics["decisions_validated"] == 2
+    assert governance.metrics["decisions_sampled_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_injector_skips_persona_work_for_unsampled_decisions():
+    """Sampled-out decisions pass through; forced types still get full validation"""
+    injector = AIDecisionInjector(sampler=DecisionSampler(rate=0.0))
+    skipped = await injector.intercept_decision("agent", DecisionType.CODE_GENERATION, {}, "eval(x)")
+    assert skipped.approved and skipped.personas_consulted == []
+    assert skipped.audit_trail[0]["event"] == "validation_skipped"
+
+    forced = await injector.intercept_decision("agent", DecisionType.SECURITY, {}, "eval(x)")
+    assert not forced.approved
+
+    metrics = injector.get_metrics()
+    assert metrics["decisions_sampled_out"] == 1
+    assert metrics["decisions_processed"] == 1
+    assert metrics["sampling"]["estimated"]["rejected"] == 1
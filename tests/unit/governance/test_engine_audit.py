@@ -0,0 +1,126 @@
+"""
+@fileoverview Unit tests for the buffered GovernanceEngine audit writer
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance audit testing
+@responsibility Verify queued writes, the fsync policy, shared writers and flush on close
+@dependencies pytest, governance.core.audit_writer, governance.core.engine
+@integration_points BufferedAuditWriter, shared_audit_writer, GovernanceEngine._audit_log
+@testing_strategy Temp directories for segments; fsync counted through the segment writer
+@governance Every evaluation must reach the audit trail, in order, by shutdown
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.audit_writer import AuditSegmentWriter, BufferedAuditWriter, shared_audit_writer
+from governance.core.context import GovernanceContext
+from governance.core.engine import GovernanceEngine
+
+
+def _read(directory, prefix="engine_audit"):
+    return [
+        json.loads(line)
+        for segment in sorted(Path(directory).glob(f"{prefix}_*.jsonl"))
+        for line in segment.read_text().splitlines()
+    ]
+
+
+class CountingWriter(AuditSegmentWriter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.syncs = 0
+
+    def sync(self):
+        self.syncs += 1
+        super().sync()
+
+
+def test_engine_evaluations_are_queued_and_flushed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = GovernanceEngine(config_path=tmp_path / "definitions", audit_dir=tmp_path / "audit")
+    contexts = [GovernanceContext(operation_type=f"op_{n}", actor="dev") for n in range(50)]
+    engine.evaluate_many(contexts)
+    engine.flush_audit_log()
+
+    entries = _read(tmp_path / "audit")
+    assert len(entries) == 100
+    assert [e["event_type"] for e in entries[:2]] == ["evaluation_start", "evaluation_complete"]
+    assert [e["operation_type"] for e in entries[1::2]] == [f"op_{n}" for n in range(50)]
+    assert engine.get_metrics()["audit"]["events_queued"] == 100
+
+    # Engines on the same directory share one writer and one flush thread
+    other = GovernanceEngine(config_path=tmp_path / "definitions", audit_dir=tmp_path / "audit")
+    assert other.audit_writer is engine.audit_writer
+    engine.close()
+
+
+def test_fsync_every_n_events(tmp_path):
+    segments = CountingWriter(tmp_path, prefix="engine_audit")
+    writer = BufferedAuditWriter(segments, batch_size=10, fsync_every=25, fsync_interval=0)
+    for n in range(100):
+        writer.write({"n": n})
+    writer.flush()
+
+    assert 3 <= segments.syncs <= 4  # Every 25 events, checked per 10-event batch
+    writer.close()
+    assert [e["n"] for e in _read(tmp_path)] == list(range(100))
+
+
+def test_fsync_interval_syncs_idle_writes(tmp_path):
+    segments = CountingWriter(tmp_path, prefix="engine_audit")
+    writer = BufferedAuditWriter(segments, flush_interval=0.01, fsync_every=0, fsync_interval=0.05)
+    writer.write({"n": 1})
+    writer.flush()
+    deadline = time.monotonic() + 2
+    while segments.syncs == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert segments.syncs == 1 and writer.fsyncs == 1
+    writer.close()
+
+
+def test_close_drains_queue_and_writer_restarts(tmp_path):
+    writer = shared_audit_writer(tmp_path, prefix="close_test", fsync_every=0, fsync_interval=0)
+    for n in range(500):
+        writer.write({"n": n})
+    writer.close()
+    assert [e["n"] for e in _read(tmp_path, "close_test")] == list(range(500))
+    assert writer.fsyncs == 1 and not writer.get_status()["running"]
+
+    writer.write({"n": 500})
+    writer.close()
+    assert _read(tmp_path, "close_test")[-1] == {"n": 500}
+
+
+def test_retention_leaves_files_it_did_not_write(tmp_path):
+    legacy = [tmp_path / "audit_20250101.jsonl", tmp_path / "engine_audit_notes.jsonl"]
+    for path in legacy:
+        path.write_text("{}\n")
+    segments = AuditSegmentWriter(tmp_path, prefix="engine_audit", max_segment_bytes=1, max_segments=2)
+    for n in range(5):
+        segments.write_batch([{"n": n}])
+    segments.close()
+
+    assert all(path.exists() for path in legacy)
+    assert len(segments.segments()) == 2
+    assert [e["n"] for e in _read(tmp_path) if "n" in e] == [3, 4]
+
+
+def test_engine_keeps_every_segment_and_names_carry_the_pid(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = GovernanceEngine(config_path=tmp_path / "definitions", audit_dir=tmp_path / "engine_keep")
+    segments = engine.audit_writer.writer
+    assert segments.max_segments is None
+
+    segments.max_segment_bytes = 1
+    for n in range(30):
+        segments.write_batch([{"n": n}])
+    engine.close()
+
+    names = [path.name for path in segments.segments()]
+    assert len(names) == 30
+    assert all(f"_{os.getpid()}_" in name for name in names)
@@ -0,0 +1,100 @@
+"""
+@fileoverview Unit tests for GovernanceEngine evaluation memoization
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance rule evaluation testing
+@responsibility Verify fingerprint keys, version invalidation, bypass_cache and batch dedupe
+@dependencies pytest, governance.core.engine, governance.core.rule_table
+@integration_points GovernanceEngine.evaluate, evaluate_many, MatchCache
+@testing_strategy Engines over temp definition directories; cache counters read from get_metrics
+@governance A cached decision must never outlive the rule table that produced it
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.context import GovernanceContext
+from governance.core.engine import GovernanceEngine
+from governance.core.rule_table import context_fingerprint
+
+
+@pytest.fixture
+def definitions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Engine audit files land in the temp dir
+    directory = tmp_path / "definitions"
+    directory.mkdir()
+    (directory / "deploy.json").write_text(json.dumps({"rules": [
+        {"id": "prod", "operation_type": "deploy", "decision": "review",
+         "when": [{"field": "payload.env", "equals": "prod"}]}
+    ]}))
+    return directory
+
+
+def test_cache_keys_only_on_fields_rules_read(definitions):
+    engine = GovernanceEngine(config_path=definitions)
+    first = engine.evaluate(GovernanceContext(operation_type="deploy", actor="a",
+                                              payload={"env": "prod", "notes": "x"}))
+    second = engine.evaluate(GovernanceContext(operation_type="deploy", actor="a",
+                                               payload={"env": "prod", "notes": "y"}))
+    third = engine.evaluate(GovernanceContext(operation_type="deploy", actor="a",
+                                              payload={"env": "dev"}))
+
+    assert first.decision == second.decision == "review" and third.decision == "approved"
+    assert first is not second and first.context_id != second.context_id
+    cache = engine.get_metrics()["cache"]
+    assert (cache["hits"], cache["misses"]) == (1, 2)
+
+    # 1 and True compare equal but must not share a cache entry
+    fields = ("payload.flag",)
+    assert context_fingerprint(GovernanceContext(payload={"flag": 1}), fields) != \
+        context_fingerprint(GovernanceContext(payload={"flag": True}), fields)
+
+
+def test_rule_changes_invalidate_cached_matches(definitions):
+    engine = GovernanceEngine(config_path=definitions, reload_interval=0)
+    context = GovernanceContext(operation_type="deploy", payload={"env": "prod"})
+    assert engine.evaluate(context).decision == "review"
+
+    engine.add_rule("dangerous_operations", "deploy")
+    assert engine.evaluate(context).decision == "rejected"
+
+    engine.remove_rule("dangerous_operations", "deploy")
+    (definitions / "deploy.json").write_text(json.dumps({"rules": []}))
+    os.utime(definitions / "deploy.json", ns=(5_000_000_000, 5_000_000_000))
+    assert engine.evaluate(context).decision == "approved"
+    assert engine.get_metrics()["cache"]["invalidations"] >= 2
+
+
+def test_bypass_cache_forces_a_fresh_match(definitions):
+    engine = GovernanceEngine(config_path=definitions)
+    for _ in range(3):
+        engine.evaluate(GovernanceContext(operation_type="deploy", bypass_cache=True))
+    cache = engine.get_metrics()["cache"]
+    assert cache["bypasses"] == 3 and cache["hits"] == cache["misses"] == 0
+
+
+def test_evaluate_many_dedupes_and_keeps_order(definitions):
+    engine = GovernanceEngine(config_path=definitions, cache_size=0)
+    contexts = [GovernanceContext(operation_type="deploy", payload={"env": env})
+                for env in ["prod", "dev", "prod", "prod", "dev"]]
+    results = engine.evaluate_many(contexts)
+
+    assert [r.decision for r in results] == ["review", "approved", "review", "review", "approved"]
+    assert [r.context_id for r in results] == [c.operation_id for c in contexts]
+    assert engine.get_metrics()["total_decisions"] == 5
+    # cache_size=0 disables the cross-call cache but not the batch memo
+    cache = engine.get_metrics()["cache"]
+    assert cache["batch_duplicates"] == 3 and cache["hits"] == cache["misses"] == 0
+
+    engine = GovernanceEngine(config_path=definitions)
+    engine.evaluate_many(contexts)
+    cache = engine.get_metrics()["cache"]
+    assert cache["batch_duplicates"] == 3 and cache["misses"] == 2
+
+    engine.evaluate_many([GovernanceContext(operation_type="deploy", bypass_cache=True)] * 2)
+    assert engine.get_metrics()["cache"]["bypasses"] == 2
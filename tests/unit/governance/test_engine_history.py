@@ -0,0 +1,61 @@
+"""
+@fileoverview Unit tests for GovernanceEngine decision history and rollups
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance metrics testing
+@responsibility Verify the bounded history ring, running counters and sliding decision windows
+@dependencies pytest, governance.core.engine
+@integration_points GovernanceEngine.evaluate, get_metrics, DecisionWindow
+@testing_strategy Explicit timestamps for windows; engines over temp directories for counters
+@governance Metrics must keep counting after old history entries are dropped
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.context import GovernanceContext
+from governance.core.engine import DecisionWindow, GovernanceEngine
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Engine audit files land in the temp dir
+    return GovernanceEngine(config_path=tmp_path / "definitions", history_size=10)
+
+
+def test_history_is_bounded_but_counters_cover_everything(engine):
+    for n in range(25):
+        engine.evaluate(GovernanceContext(operation_type="drop_database" if n % 5 == 0 else f"op_{n}"))
+
+    metrics = engine.get_metrics()
+    assert len(engine.decision_history) == metrics["recent_decisions"] == 10
+    assert engine.decision_history[-1]["operation_type"] == "op_24"
+    assert metrics["total_decisions"] == 25
+    assert metrics["decisions_by_type"] == {"rejected": 5, "approved": 20}
+    assert metrics["approval_rate"] == pytest.approx(0.8)
+    assert metrics["decisions_per_minute"] == metrics["decisions_per_hour"] == 25
+
+
+def test_decision_window_slides_and_expires():
+    window = DecisionWindow(window_seconds=60, bucket_seconds=1)
+    for second in range(30):
+        window.record(1000.0 + second, approved=second % 3 != 0)
+    assert window.snapshot(1029.5) == {"decisions": 30, "approvals": 20,
+                                       "approval_rate": pytest.approx(2 / 3)}
+
+    # The window is (now - 60, now]: at t=1079 seconds 1000-1019 have left it
+    assert window.snapshot(1079.0)["decisions"] == 10
+    assert window.snapshot(2000.0)["decisions"] == 0
+    assert len(window._buckets) == 0
+
+
+def test_hourly_window_uses_minute_buckets():
+    window = DecisionWindow(window_seconds=3600, bucket_seconds=60)
+    for n in range(600):
+        window.record(7200.0 + n * 6, approved=True)  # One decision every 6s for an hour
+    assert len(window._buckets) == 60
+    assert window.snapshot(7200.0 + 3599)["decisions"] == 600
+    assert window.snapshot(7200.0 + 3600 + 1799)["decisions"] == 300
@@ -0,0 +1,129 @@
+"""
+@fileoverview Unit tests for concurrent, time-bounded governance hook execution
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance hook system testing
+@responsibility Verify concurrency, thread offloading, deadlines per GovernanceLevel and latency histograms
+@dependencies pytest, pytest-asyncio, governance.core.runtime_governance
+@integration_points RuntimeGovernanceSystem.trigger_hook, register_hook, get_hook_metrics
+@testing_strategy Sleep-based hooks with short deadlines
+@governance A slow hook must not silently approve in STRICT mode
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.runtime_governance import RuntimeGovernanceSystem, GovernanceLevel, HookType
+
+
+def _governance(level=GovernanceLevel.STRICT, hook_timeout=1.0):
+    governance = RuntimeGovernanceSystem(enable_monitor=False, hook_timeout=hook_timeout)
+    governance.governance_level = level
+    return governance
+
+
+@pytest.mark.asyncio
+async def test_hooks_run_concurrently_in_registration_order():
+    """Total latency is the slowest hook, not the sum; results keep order"""
+    governance = _governance()
+
+    def make(value):
+        async def hook(context):
+            await asyncio.sleep(0.1)
+            return value
+        return hook
+
+    for value in range(3):
+        governance.register_hook(HookType.PRE_DECISION, make(value))
+
+    started = time.perf_counter()
+    results = await governance.trigger_hook(HookType.PRE_DECISION, {})
+    assert results == [0, 1, 2]
+    assert time.perf_counter() - started < 0.25
+
+
+@pytest.mark.asyncio
+async def test_sync_hooks_run_off_the_event_loop():
+    """Blocking sync hooks run in the thread pool"""
+    governance = _governance()
+    threads = []
+
+    def blocking(context):
+        threads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return {"approved": True}
+
+    governance.register_hook(HookType.PRE_AGENT_EXECUTE, blocking)
+    assert await governance.trigger_hook(HookType.PRE_AGENT_EXECUTE, {}) == [{"approved": True}]
+    assert threads[0].startswith("governance-hook")
+
+
+@pytest.mark.asyncio
+async def test_timeout_vetoes_in_strict_and_is_dropped_otherwise():
+    """A hook missing its deadline vetoes in STRICT and is skipped in WARNING"""
+    async def slow(context):
+        await asyncio.sleep(1)
+        return {"approved": True}
+
+    strict = _governance(GovernanceLevel.STRICT)
+    strict.register_hook(HookType.PRE_DECISION, slow, timeout=0.01)
+    results = await strict.trigger_hook(HookType.PRE_DECISION, {})
+    assert results[0]["approved"] is False and "timed out" in results[0]["reason"]
+
+    warning = _governance(GovernanceLevel.WARNING, hook_timeout=0.01)
+    warning.register_hook(HookType.PRE_DECISION, slow)
+    assert await warning.trigger_hook(HookType.PRE_DECISION, {}) == []
+
+
+@pytest.mark.asyncio
+async def test_strict_reraises_after_all_hooks_finish():
+    """In STRICT a failing hook raises, but the other hooks still run"""
+    governance = _governance()
+    ran = []
+
+    async def failing(context):
+        raise RuntimeError("hook broke")
+
+    async def other(context):
+        await asyncio.sleep(0.01)
+        ran.append(True)
+
+    governance.register_hook(HookType.PRE_DECISION, failing)
+    governance.register_hook(HookType.PRE_DECISION, other)
+    with pytest.raises(RuntimeError):
+        await governance.trigger_hook(HookType.PRE_DECISION, {})
+    assert ran == [True]
+
+    governance.governance_level = GovernanceLevel.MONITOR
+    assert await governance.trigger_hook(HookType.PRE_DECISION, {}) == [None]
+
+
+@pytest.mark.asyncio
+async def test_hook_latency_histograms():
+    """Each hook gets its own histogram with outcome counts"""
+    governance = _governance(GovernanceLevel.WARNING)
+
+    async def fast(context):
+        return None
+
+    async def slow(context):
+        await asyncio.sleep(1)
+
+    governance.register_hook(HookType.PRE_DECISION, fast)
+    governance.register_hook(HookType.PRE_DECISION, slow, timeout=0.02)
+    for _ in range(3):
+        await governance.trigger_hook(HookType.PRE_DECISION, {})
+
+    metrics = governance.get_hook_metrics()
+    fast_metrics = next(v for k, v in metrics.items() if k.endswith("fast"))
+    slow_metrics = next(v for k, v in metrics.items() if k.endswith("slow"))
+    assert fast_metrics["count"] == 3 and fast_metrics["ok"] == 3
+    assert fast_metrics["p95_ms"] <= 5
+    assert slow_metrics["timeout"] == 3 and slow_metrics["mean_ms"] >= 20
+    assert sum(slow_metrics["buckets_ms"].values()) == 3
@@ -0,0 +1,104 @@
+"""
+@fileoverview Unit tests for concurrent, deadline-bounded persona consultation
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance middleware testing
+@responsibility Verify concurrency, result order, timeout fallbacks and per-validator histograms
+@dependencies pytest, pytest-asyncio, governance.middleware.ai_decision_injector
+@integration_points AIDecisionInjector.intercept_decision, persona_validators, get_metrics
+@testing_strategy Sleep-based persona validators registered over the built-in ones
+@governance A slow persona must not silently approve unless configured to
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.middleware.ai_decision_injector import (
+    AIDecisionInjector,
+    DecisionType,
+    PersonaConsultation
+)
+
+
+def _slow_persona(name, delay, approved=True):
+    async def validator(decision_type, context, output):
+        await asyncio.sleep(delay)
+        return PersonaConsultation(persona_name=name, approved=approved, confidence=0.9)
+    return validator
+
+
+def _injector(**kwargs):
+    injector = AIDecisionInjector(**kwargs)
+    injector.update_decision_config(
+        DecisionType.ARCHITECTURE,
+        required_personas=["Dr. Sarah Chen", "Alex Novak"],
+        risk_threshold=1.0,
+        validation_rules=[]
+    )
+    return injector
+
+
+@pytest.mark.asyncio
+async def test_personas_are_consulted_concurrently_in_order():
+    injector = _injector()
+    arrived, everyone_arrived = [], asyncio.Event()
+
+    def _barrier_persona(name, linger):
+        async def validator(decision_type, context, output):
+            # Only returns if both validators are running at the same time
+            arrived.append(name)
+            if len(arrived) == 2:
+                everyone_arrived.set()
+            await asyncio.wait_for(everyone_arrived.wait(), 1)
+            await asyncio.sleep(linger)
+            return PersonaConsultation(persona_name=name, approved=True, confidence=0.9)
+        return validator
+
+    # The first-listed persona finishes last; results still follow the config order
+    injector.persona_validators["Dr. Sarah Chen"] = _barrier_persona("Dr. Sarah Chen", 0.02)
+    injector.persona_validators["Alex Novak"] = _barrier_persona("Alex Novak", 0)
+
+    validation = await injector.intercept_decision("agent", DecisionType.ARCHITECTURE, {}, "design")
+    assert sorted(arrived) == ["Alex Novak", "Dr. Sarah Chen"]
+    assert [c.persona_name for c in validation.personas_consulted] == ["Dr. Sarah Chen", "Alex Novak"]
+    assert validation.approved
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fallback, approved, consulted", [
+    ("reject", False, 2),
+    ("approve", True, 2),
+    ("skip", True, 1),
+])
+async def test_timeout_fallbacks(fallback, approved, consulted):
+    injector = _injector(consultation_timeout=0.05, timeout_fallback=fallback)
+    injector.persona_validators["Dr. Sarah Chen"] = _slow_persona("Dr. Sarah Chen", 1)
+    injector.persona_validators["Alex Novak"] = _slow_persona("Alex Novak", 0)
+
+    validation = await injector.intercept_decision("agent", DecisionType.ARCHITECTURE, {}, "design")
+    assert validation.approved is approved
+    assert len(validation.personas_consulted) == consulted
+    if fallback == "reject":
+        assert any("timed out" in warning for warning in validation.warnings)
+
+
+def test_unknown_fallback_is_rejected():
+    with pytest.raises(ValueError):
+        AIDecisionInjector(timeout_fallback="ignore")
+
+
+@pytest.mark.asyncio
+async def test_each_validator_and_rule_has_a_histogram():
+    injector = AIDecisionInjector(consultation_timeout=0.05)
+    injector.persona_validators["Alex Novak"] = _slow_persona("Alex Novak", 1)
+    for n in range(3):
+        await injector.intercept_decision("agent", DecisionType.CODE_GENERATION, {"n": n}, "x = 1")
+
+    validators = injector.get_metrics()["validators"]
+    assert set(validators) == {"Dr. Sarah Chen", "Alex Novak", "rule:no_dangerous_patterns", "rule:follows_standards"}
+    assert validators["Dr. Sarah Chen"]["ok"] == 3
+    assert validators["Alex Novak"]["timeout"] == 3 and validators["Alex Novak"]["mean_ms"] >= 50
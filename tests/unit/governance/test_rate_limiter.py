@@ -0,0 +1,127 @@
+"""
+@fileoverview Unit tests for token-bucket rate limiting in runtime governance
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance rate limit testing
+@responsibility Verify refill, all-or-nothing debits, wait hints, settlement and hot updates
+@dependencies pytest, pytest-asyncio, governance.core.rate_limiter
+@integration_points RateLimiter, RuntimeGovernanceSystem.validate_agent_execution
+@testing_strategy Deterministic clock via monkeypatch, no real waiting
+@governance Token and API call limits in resource_limits must actually be enforced
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core import rate_limiter
+from governance.core.rate_limiter import RateLimiter
+from governance.core.runtime_governance import RuntimeGovernanceSystem, GovernanceLevel
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    return fake
+
+
+LIMITS = {
+    "max_tokens_per_minute": 600,
+    "max_api_calls_per_minute": 60,
+    "max_tokens_per_agent_per_minute": 300,
+    "max_api_calls_per_agent_per_minute": 6,
+}
+
+
+def test_global_tokens_limit_with_wait_hint(clock):
+    """Exhausting the global token bucket rejects with the time to refill"""
+    limiter = RateLimiter(LIMITS)
+    assert limiter.acquire(tokens=500).allowed
+
+    decision = limiter.acquire(tokens=200)
+    assert not decision.allowed
+    assert decision.limit == "max_tokens_per_minute" and decision.scope == "global"
+    assert decision.retry_after == pytest.approx(10.0)  # 100 tokens at 10 tokens/s
+
+    clock.now += 10
+    assert limiter.acquire(tokens=200).allowed
+
+
+def test_agent_limit_rejects_without_debiting_global(clock):
+    """A rejected call debits no bucket at all"""
+    limiter = RateLimiter(LIMITS)
+    for _ in range(6):
+        assert limiter.acquire("agent-a").allowed
+
+    decision = limiter.acquire("agent-a")
+    assert not decision.allowed and decision.limit == "max_api_calls_per_agent_per_minute"
+    assert limiter.get_status()["global_available"]["api_calls"] == 54
+
+    # Other agents have their own budget
+    assert limiter.acquire("agent-b").allowed
+
+
+def test_oversized_request_allowed_into_full_bucket(clock):
+    """A request larger than the capacity is not rejected forever"""
+    limiter = RateLimiter({"max_tokens_per_minute": 100})
+    assert limiter.acquire(tokens=250).allowed
+    assert not limiter.acquire(tokens=1).allowed
+
+
+def test_settle_refunds_overestimate(clock):
+    """Actual usage below the estimate is credited back"""
+    limiter = RateLimiter(LIMITS)
+    limiter.acquire("agent-a", tokens=300)
+    limiter.settle("agent-a", estimated_tokens=300, actual_tokens=100)
+
+    status = limiter.get_status("agent-a")
+    assert status["global_available"]["tokens"] == 500
+    assert status["agent_available"]["tokens"] == 200
+
+
+@pytest.mark.asyncio
+async def test_update_resource_limits_reconfigures_buckets(clock):
+    """Limits changed through update_resource_limits apply immediately"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False)
+    governance.update_resource_limits({"max_api_calls_per_minute": 2})
+    assert governance.acquire_rate_limit().allowed
+    assert governance.acquire_rate_limit().allowed
+    assert not governance.acquire_rate_limit().allowed
+    assert governance.metrics["resource_limits_hit"] == 1
+
+    governance.set_governance_level(GovernanceLevel.BYPASS)
+    assert governance.acquire_rate_limit().allowed
+
+
+@pytest.mark.asyncio
+async def test_agent_execution_is_rate_limited(clock):
+    """validate_agent_execution rejects over-budget agents in STRICT mode with a retry hint"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False)
+    governance.update_resource_limits({"max_tokens_per_agent_per_minute": 1000})
+    await governance.register_agent("agent-1", "assistant", "Helper")
+
+    first = await governance.validate_agent_execution("agent-1", "echo hi", {"estimated_tokens": 800})
+    assert first.approved
+
+    second = await governance.validate_agent_execution("agent-1", "echo hi", {"estimated_tokens": 800})
+    assert not second.approved
+    assert second.metadata["retry_after"] > 0
+    assert governance.active_agents["agent-1"].violations[-1]["type"] == "rate_limit"
+
+    governance.set_governance_level(GovernanceLevel.WARNING)
+    third = await governance.validate_agent_execution("agent-1", "echo hi", {"estimated_tokens": 800})
+    assert third.approved and third.risk_level == "MEDIUM"
+
+    await governance.terminate_agent("agent-1")
+    assert governance.rate_limiter.get_status()["tracked_agents"] == 0
@@ -0,0 +1,107 @@
+"""
+@fileoverview Unit tests for the shared agent resource sampler and per-agent limit enforcement
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance resource monitoring testing
+@responsibility Verify real RSS/CPU readings, rolling windows and memory/CPU limit enforcement
+@dependencies pytest, pytest-asyncio, psutil, governance.core.resource_sampler
+@integration_points AgentResourceSampler, RuntimeGovernanceSystem.register_agent
+@testing_strategy Sample the test process itself; feed synthetic readings for enforcement
+@governance Agents over max_memory_per_agent or max_cpu_per_agent must be caught
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.resource_sampler import AgentResourceSampler, ResourceSample, PSUTIL_AVAILABLE
+from governance.core.runtime_governance import RuntimeGovernanceSystem, GovernanceLevel, HookType
+
+MB = 1024 * 1024
+
+
+def _sample(rss_mb=100, cpu=5.0):
+    return ResourceSample(timestamp=time.time(), rss_bytes=int(rss_mb * MB), cpu_percent=cpu, process_count=1)
+
+
+async def _feed(governance, agent_id, sample):
+    """Push a synthetic reading through the same path as a sampler pass"""
+    governance.resource_sampler._samples.setdefault(agent_id, deque(maxlen=6)).append(sample)
+    await governance._on_resource_sample({agent_id: sample})
+
+
+@pytest.mark.skipif(not PSUTIL_AVAILABLE, reason="psutil not installed")
+@pytest.mark.asyncio
+async def test_sampler_reads_real_process_in_one_pass():
+    """One pass reads actual RSS for every tracked agent"""
+    passes = []
+    sampler = AgentResourceSampler(passes.append, interval=3600, window=3)
+    sampler.track("self-1", os.getpid())
+    sampler.track("self-2", os.getpid())
+    sampler.track("gone", 2 ** 22 + 12345)
+
+    readings = await sampler.sample_once()
+    assert len(passes[-1]) == 3
+    assert readings["self-1"].rss_bytes > 10 * MB
+    assert readings["gone"] is None
+
+    for _ in range(4):
+        await sampler.sample_once()
+    assert len(sampler.samples("self-1")) == 3
+    await sampler.stop()
+
+
+@pytest.mark.skipif(not PSUTIL_AVAILABLE, reason="psutil not installed")
+@pytest.mark.asyncio
+async def test_registered_agent_usage_comes_from_its_process():
+    """register_agent with a pid is sampled by the shared task; no per-agent loop remains"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False, resource_sample_interval=3600)
+    await governance.register_agent("agent-1", "assistant", "Helper", pid=os.getpid())
+    await governance.resource_sampler.sample_once()
+
+    usage = governance.active_agents["agent-1"].resource_usage
+    assert usage["memory_mb"] > 10 and usage["process_alive"] is True
+    assert not hasattr(governance, "_monitor_agent")
+
+    await governance.terminate_agent("agent-1")
+    assert governance.resource_sampler.get_status()["tracked_agents"] == 0
+    await governance.resource_sampler.stop()
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_terminates_in_strict_mode():
+    """Exceeding max_memory_per_agent terminates the agent and fires the hook"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False)
+    events = []
+    governance.register_hook(HookType.RESOURCE_LIMIT_EXCEEDED, lambda event: events.append(event))
+    await governance.register_agent("agent-1", "assistant", "Helper")
+
+    await _feed(governance, "agent-1", _sample(rss_mb=600))
+
+    assert "agent-1" not in governance.active_agents
+    assert events[0]["action"] == "terminate"
+    assert events[0]["violation"]["type"] == "memory_limit"
+    assert governance.metrics["resource_limits_hit"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cpu_limit_uses_window_average_and_records_once():
+    """A single CPU spike is tolerated; a sustained breach is recorded once in WARNING mode"""
+    governance = RuntimeGovernanceSystem(enable_monitor=False)
+    governance.set_governance_level(GovernanceLevel.WARNING)
+    await governance.register_agent("agent-1", "assistant", "Helper")
+    agent = governance.active_agents["agent-1"]
+
+    await _feed(governance, "agent-1", _sample(cpu=90))
+    assert agent.violations == []
+
+    for _ in range(4):
+        await _feed(governance, "agent-1", _sample(cpu=90))
+    assert [v["type"] for v in agent.violations] == ["cpu_limit"]
+    assert agent.resource_usage["cpu_percent_avg"] == 90
+    assert "agent-1" in governance.active_agents
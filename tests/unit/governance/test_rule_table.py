@@ -0,0 +1,169 @@
+"""
+@fileoverview Unit tests for the compiled governance rule table
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance rule evaluation testing
+@responsibility Verify predicate compilation, dispatch precedence, hot reload and indexed/linear parity
+@dependencies pytest, governance.core.rule_table, governance.core.engine
+@integration_points RuleTable, RuleTableLoader, GovernanceEngine.evaluate
+@testing_strategy Definition files in temp directories; throughput is in tests/performance/bench_rule_table.py
+@governance Built-in engine decisions must not change when no definition files exist
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.context import GovernanceContext
+from governance.core.engine import GovernanceEngine
+from governance.core.exceptions import ConfigurationError
+from governance.core.rule_table import RuleTable, RuleTableLoader, compile_rule
+
+
+def _write(directory, name, rules, mtime=None):
+    path = Path(directory) / name
+    path.write_text(json.dumps({"rules": rules}))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def engine_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Engine audit files land in the temp dir
+    definitions = tmp_path / "definitions"
+    definitions.mkdir()
+    return definitions
+
+
+def test_builtin_rules_keep_engine_decisions(engine_dir):
+    engine = GovernanceEngine(config_path=engine_dir)
+    expected = {
+        "drop_database": ("rejected", 1.0),
+        "security_change": ("review", 0.8),
+        "typo_fix": ("approved", 1.0),
+        "unit_TEST_run": ("approved", 0.7),
+        "anything_else": ("approved", 0.5),
+    }
+    for operation, (decision, confidence) in expected.items():
+        result = engine.evaluate(GovernanceContext(operation_type=operation, actor="dev"))
+        assert (result.decision, result.confidence) == (decision, confidence), operation
+    result = engine.evaluate(GovernanceContext(operation_type="drop_database"))
+    assert result.reason == "Operation 'drop_database' is marked as dangerous"
+
+    engine.add_rule("requires_review", "deploy")
+    assert engine.evaluate(GovernanceContext(operation_type="deploy")).decision == "review"
+    engine.remove_rule("requires_review", "deploy")
+    assert engine.evaluate(GovernanceContext(operation_type="deploy")).decision == "approved"
+
+
+def test_predicates_subtypes_and_priority():
+    rules = [
+        compile_rule({"id": "any-push", "operation_type": "git_push", "decision": "approved"}, 0),
+        compile_rule({"id": "force", "operation_type": "git_push", "operation_subtype": "force",
+                      "when": [{"field": "payload.branch", "in": ["main", "master"]}],
+                      "decision": "rejected", "reason": "{actor} force-pushed", "priority": 10}, 1),
+        compile_rule({"id": "big", "operation_type": ["git_push", "git_commit"],
+                      "when": [{"field": "payload.files", "gt": 100},
+                               {"field": "metadata.reviewed", "exists": False}],
+                      "decision": "review", "priority": 5}, 2),
+    ]
+    table = RuleTable(rules)
+
+    def match(**kwargs):
+        return table.match(GovernanceContext(**kwargs)).rule_id
+
+    assert match(operation_type="git_push", operation_subtype="force", payload={"branch": "main"}) == "force"
+    assert match(operation_type="git_push", operation_subtype="force", payload={"branch": "dev"}) == "any-push"
+    assert match(operation_type="git_commit", payload={"files": 500}) == "big"
+    assert table.match(GovernanceContext(operation_type="git_commit", payload={"files": 500},
+                                         metadata={"reviewed": True})) is None
+    assert table.match(GovernanceContext(operation_type="git_commit", payload={"files": "many"})) is None
+
+    result = rules[1].to_result(GovernanceContext(operation_type="git_push", actor="sam"))
+    assert result.reason == "sam force-pushed"
+    assert "payload.branch" in table.fields_read and "metadata.reviewed" in table.fields_read
+
+
+@pytest.mark.parametrize("spec", [
+    {"operation_type": "x", "decision": "maybe"},
+    {"decision": "approved"},
+    {"operation_type": "x", "decision": "approved", "when": [{"field": "a", "like": 1}]},
+    {"operation_type": "x", "decision": "approved", "when": [{"field": "a", "matches": "("}]},
+    ["not", "a", "mapping"],
+    {"operation_type": "x", "decision": "approved", "priority": [1]},
+    {"operation_type": "x", "decision": "approved", "priority": "500"},
+    {"operation_type": "x", "decision": "approved", "confidence": None},
+    {"operation_type": 5, "decision": "approved"},
+    {"operation_type": "x", "operation_subtype": 3, "decision": "approved"},
+    {"operation_type": "x", "decision": "approved", "evidence": [{"a": 1}]},
+    {"operation_type": "x", "decision": "approved", "when": {"field": "a", "equals": 1}},
+    {"operation_type": "x", "decision": "approved", "when": ["payload.a"]},
+    {"operation_type": "x", "decision": "approved", "when": [{"field": "a", "in": 5}]},
+    {"operation_type": "x", "decision": "approved", "when": [{"field": "a", "matches": 5}]},
+    {"operation_type": "x", "decision": "approved", "when": [{"field": "a", "gt": "10"}]},
+    {"operation_type": "x", "decision": "approved", "reason": "blocked {payload}"},
+    {"operation_type": "x", "decision": "approved", "reason": "blocked {}"},
+    {"operation_type": "x", "decision": "approved", "reason": "blocked {actor"},
+    {"operation_type": "x", "decision": "approved", "reason": "blocked {actor.name}"},
+    {"operation_type": "x", "decision": "approved", "evidence": ["by {actor:>10}"]},
+])
+def test_invalid_definitions_raise_configuration_error(spec):
+    with pytest.raises(ConfigurationError):
+        compile_rule(spec, 0)
+
+
+def test_definition_files_hot_reload_and_survive_bad_edits(tmp_path):
+    loader = RuleTableLoader(tmp_path, lambda: [], poll_interval=0)
+    path = _write(tmp_path, "deploy.json", [{"id": "deploy", "operation_type": "deploy", "decision": "review"}],
+                  mtime=1_000_000_000)
+    table = loader.maybe_reload()
+    assert table.match(GovernanceContext(operation_type="deploy")).decision == "review"
+    assert loader.maybe_reload() is table  # Unchanged files keep the same table
+
+    _write(tmp_path, "deploy.json", [{"id": "deploy", "operation_type": "deploy", "decision": "approved"}],
+           mtime=2_000_000_000)
+    assert loader.maybe_reload().match(GovernanceContext(operation_type="deploy")).decision == "approved"
+
+    path.write_text("rules: [unbalanced")
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    broken = loader.maybe_reload()
+    assert broken.match(GovernanceContext(operation_type="deploy")).decision == "approved"
+    assert loader.get_status()["reload_errors"] == 1 and loader.get_status()["last_error"]
+
+    _write(tmp_path, "deploy.json", [{"id": "deploy", "operation_type": "deploy", "decision": "review",
+                                      "priority": [1]}], mtime=4_000_000_000)
+    assert loader.maybe_reload().match(GovernanceContext(operation_type="deploy")).decision == "approved"
+    assert loader.get_status()["reload_errors"] == 2 and "priority" in loader.get_status()["last_error"]
+
+    path.unlink()
+    assert loader.maybe_reload().match(GovernanceContext(operation_type="deploy")) is None
+    assert loader.get_status()["last_error"] is None
+
+
+def test_indexed_dispatch_matches_a_linear_scan():
+    """5000 rules over 500 operation types pick the same rule as scanning in priority order"""
+    specs = [
+        {"id": f"r{n}", "operation_type": f"op_{n % 500}",
+         "when": [{"field": "payload.level", "equals": n}], "decision": "review", "priority": n % 7}
+        for n in range(5000)
+    ]
+    specs.append({"id": "default", "operation_type": "*", "decision": "approved", "priority": -1000})
+    table = RuleTable(compile_rule(spec, order) for order, spec in enumerate(specs))
+    ordered = sorted(table.rules, key=lambda r: (-r.priority, r.order))
+    contexts = [GovernanceContext(operation_type=f"op_{n % 500}", payload={"level": n * 7 % 6000})
+                for n in range(1000)]
+
+    def linear(context):
+        for rule in ordered:
+            if (context.operation_type in rule.operation_types or "*" in rule.operation_types) \
+                    and rule.matches(context):
+                return rule
+
+    indexed_ids = [table.match(c).rule_id for c in contexts]
+    assert indexed_ids == [linear(c).rule_id for c in contexts]
+    assert "default" in indexed_ids and len(set(indexed_ids)) > 1
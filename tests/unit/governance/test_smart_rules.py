@@ -24,12 +24,15 @@ import pytest
 import unittest
 from unittest.mock import Mock, patch
 from pathlib import Path
+from datetime import datetime
+import random
+import re
 import sys
 
 # Add governance module to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from governance.rules.smart_rules import SmartRules, RuleEnhancer
+from governance.rules.smart_rules import ExemptionManager, PatternScanner, SmartRules, RuleEnhancer
 
 
 class TestSmartRules(unittest.TestCase):
@@ -224,6 +227,107 @@ def safe_function():
         self.assertFalse(results['secrets_detected'])
         self.assertFalse(results['high_complexity'])
         self.assertIsNone(results['documentation_issues'])
+    
+    def test_scan_reports_every_hit_with_offsets(self):
+        """One pass finds overlapping and repeated hits of all pattern kinds"""
+        content = 'x = eval(a)\ny = eval (b)\napi_key = "k"\nsetattr(o, "n", 1)'
+        hits = self.smart_rules.scan(content)
+        
+        self.assertEqual([h.name for h in hits], ['eval', 'eval', 'secret_0', 'setattr'])
+        self.assertEqual(content[hits[1].start:hits[1].end], 'eval (')
+        self.assertEqual([h.kind for h in hits[2:]], ['secret', 'context_dependent'])
+        result = self.smart_rules.validate_file('code.py', content)
+        self.assertEqual(len(result['pattern_hits']), 4)
+    
+    def test_scan_matches_separate_searches(self):
+        """The combined scan finds exactly the patterns a per-pattern search would"""
+        scanner = self.smart_rules._scanner()
+        patterns = {name: re.compile(regex) for name, regex in {
+            **self.smart_rules.dangerous_pattern_dict,
+            **self.smart_rules.context_dependent_patterns,
+            **{f'secret_{i}': r for i, r in enumerate(self.smart_rules.secret_patterns)}
+        }.items()}
+        tokens = ['eval(', 'exec (', '__import__(', 'globals()', 'locals()', 'getattr(',
+                  'compile(', 'API_KEY = "x"', 'Bearer a.b', 'aws_secret_key="k"',
+                  'ev', 'al(', ' ', '\n', "'", 'token: ']
+        rng = random.Random(7)
+        for _ in range(500):
+            content = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 25)))
+            expected = {name for name, pattern in patterns.items() if pattern.search(content)}
+            self.assertEqual({h.name for h in scanner.scan(content)}, expected, content)
+    
+    def test_scan_is_shared_across_checks_and_tracks_pattern_changes(self):
+        """apply_rules, validate_file and get_dangerous_patterns scan the content once"""
+        context = {'content': 'eval(x)', 'path': 'a.py'}
+        with patch.object(PatternScanner, 'scan', autospec=True,
+                          side_effect=PatternScanner.scan) as scan:
+            self.smart_rules.apply_rules(context)
+            self.smart_rules.validate_file('a.py', context['content'])
+            self.smart_rules.get_dangerous_patterns(context)
+            self.assertEqual(scan.call_count, 1)
+            
+            self.smart_rules.dangerous_pattern_dict['pickle'] = r'pickle\.loads\s*\('
+            self.assertIn('pickle', self.smart_rules.get_dangerous_patterns(
+                {'content': 'pickle.loads(b)', 'path': 'a.py'}))
+
+
+class TestExemptionManager(unittest.TestCase):
+    """
+    @class TestExemptionManager
+    @description Test the compiled exemption index
+    @architecture_role Validate exemption precedence and caching
+    @business_logic Exemptions apply exactly where configured, no wider
+    """
+    
+    def setUp(self):
+        """Set up a manager with one exemption of each kind"""
+        self.manager = ExemptionManager()
+        self.manager.reload({
+            'global_safe_patterns': {'python': ['re.compile']},
+            'file_exemptions': [
+                {'path': 'governance/hooks/', 'patterns': ['eval'], 'reason': 'hook lists'},
+                {'path': 'docs/**/*.md', 'patterns': ['eval', 'exec'], 'reason': 'docs'},
+                {'path': 'old.py', 'patterns': ['eval'], 'reason': 'expired', 'expires': '2000-01-01'},
+            ],
+            'class_exemptions': [{'name': 'TodoTracker', 'patterns': ['compile'], 'reason': 'regex'}],
+            'function_exemptions': [{'name': 'load_plugin', 'patterns': ['__import__'], 'reason': 'plugins'}],
+            'context_exemptions': [
+                {'context': 'test_', 'patterns': ['exec'], 'requires': '@testing_strategy', 'reason': 'tests'}
+            ],
+            'temporary_exemptions': [
+                {'path': 'legacy/*.py', 'patterns': ['exec'], 'reason': 'migration', 'expires': '2999-01-01'}
+            ]
+        })
+    
+    def test_path_exemptions_keep_precedence(self):
+        """Substring and glob paths match; expired entries never do"""
+        exempt = self.manager.is_pattern_exempt
+        self.assertEqual(exempt('eval', 'governance/hooks/pre_commit.py', ''), (True, 'File exemption: hook lists'))
+        self.assertEqual(exempt('exec', 'docs/guide/intro.md', ''), (True, 'File exemption: docs'))
+        self.assertEqual(exempt('re.compile', 'anything.py', ''),
+                         (True, 'Globally safe pattern for python: re.compile'))
+        self.assertEqual(exempt('eval', 'old.py', ''), (False, None))
+        self.assertEqual(exempt('exec', 'legacy/db.py', ''),
+                         (True, 'Temporary exemption (expires 2999-01-01): migration'))
+        self.assertEqual(self.manager._index.valid_until, datetime(2999, 1, 1).timestamp())
+    
+    def test_definitions_are_matched_by_name(self):
+        """Class and function exemptions need the exact definition in the content"""
+        exempt = self.manager.is_pattern_exempt
+        self.assertTrue(exempt('compile', 'a.py', 'class TodoTracker:\n    pass')[0])
+        self.assertFalse(exempt('compile', 'a.py', 'class TodoTrackerV2:\n    pass')[0])
+        self.assertTrue(exempt('__import__', 'a.py', 'def load_plugin(name):')[0])
+        self.assertTrue(exempt('__import__', 'a.ts', 'function load_plugin(name) {', 'typescript')[0])
+    
+    def test_verdicts_are_cached_by_path_but_content_is_rechecked(self):
+        """The same path with different content gets a fresh content verdict"""
+        exempt = self.manager.is_pattern_exempt
+        self.assertTrue(exempt('exec', 'test_x.py', '"""@testing_strategy"""')[0])
+        self.assertFalse(exempt('exec', 'test_x.py', 'no header')[0])
+        self.assertEqual(self.manager.cache_hits, 1)
+        
+        self.manager.reload({'file_exemptions': [{'path': 'test_x.py', 'patterns': ['exec']}]})
+        self.assertEqual(exempt('exec', 'test_x.py', 'no header'), (True, 'File exemption: No reason provided'))
 
 
 class TestRuleEnhancer(unittest.TestCase):
@@ -0,0 +1,138 @@
+"""
+@fileoverview Unit tests for offloading CPU-heavy governance validation to a process pool
+@author Dr. Sarah Chen v1.0 - 2025-08-29
+@architecture Backend - Governance validation testing
+@responsibility Verify the inline threshold, identical offloaded results, backpressure and fallbacks
+@dependencies pytest, pytest-asyncio, governance.core.validation_pool, governance.middleware.ai_decision_injector
+@integration_points ValidationPool, RuntimeGovernanceSystem.validate_ai_decision, AIDecisionInjector.intercept_decision
+@testing_strategy Real worker processes with small thresholds; sleep jobs for queueing
+@governance Where validation runs must never change what it decides
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from governance.core.validation_pool import ValidationPool
+from governance.core.runtime_governance import RuntimeGovernanceSystem, GovernanceLevel
+from governance.middleware.ai_decision_injector import AIDecisionInjector, DecisionType
+
+RISKY_CODE = "async function load() {\n  eval(input);\n  el.addEventListener('click', f);\n}\n" + "x" * 130
+
+
+def _sleep_job(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _failing_job(text):
+    raise ValueError(f"bad payload of {len(text)} characters")
+
+
+@pytest.mark.asyncio
+async def test_small_payloads_stay_inline():
+    """Below the threshold no worker process is started"""
+    pool = ValidationPool(max_workers=2, inline_threshold=1000)
+    assert await pool.run(_sleep_job, 0, size=10) == 0
+
+    status = pool.get_status()
+    assert status["running"] is False
+    assert status["jobs"]["_sleep_job"]["inline"] == 1
+
+
+@pytest.mark.asyncio
+async def test_offloaded_review_matches_inline():
+    """Built-in persona reviews and rules decide the same in a worker process"""
+    inline = AIDecisionInjector(validation_pool=ValidationPool(max_workers=0))
+    pooled = AIDecisionInjector(validation_pool=ValidationPool(max_workers=1, inline_threshold=10))
+
+    expected = await inline.intercept_decision("agent", DecisionType.CODE_GENERATION, {}, RISKY_CODE)
+    actual = await pooled.intercept_decision("agent", DecisionType.CODE_GENERATION, {}, RISKY_CODE)
+
+    assert actual.approved == expected.approved
+    assert actual.warnings == expected.warnings
+    assert actual.personas_consulted == expected.personas_consulted
+    assert actual.modifications == expected.modifications
+    jobs = pooled.get_metrics()["validation_pool"]["jobs"]
+    assert jobs["_sarah_chen_review"]["offloaded"] == 1
+    assert jobs["_check_validation_rule"]["offloaded"] == 2
+    assert jobs["_alex_novak_review"]["run"]["mean_ms"] is not None
+    pooled.validation_pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hallucination_scan_rejects_in_strict_either_way():
+    """validate_ai_decision flags fabricated claims inline and in the pool"""
+    text = "A 2031 study found that 87.5% of developers prefer Python 5.0."
+    for pool in (ValidationPool(max_workers=0), ValidationPool(max_workers=1, inline_threshold=10)):
+        governance = RuntimeGovernanceSystem(enable_monitor=False, validation_pool=pool)
+        governance.governance_level = GovernanceLevel.STRICT
+        result = await governance.validate_ai_decision("agent", "response", {}, text)
+        assert result.approved is False
+        assert "future_date" in result.reason
+        assert governance.metrics["hallucinations_caught"] == 1
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pending_jobs_are_bounded():
+    """Jobs past max_pending wait for a slot and show up in queue depth"""
+    pool = ValidationPool(max_workers=1, inline_threshold=0, max_pending=1)
+    jobs = [asyncio.create_task(pool.run(_sleep_job, 0.2, size=1)) for _ in range(3)]
+    await asyncio.sleep(0.1)
+    assert pool.in_flight == 1
+    assert pool.waiting == 2 and pool.queue_depth == 2
+
+    assert await asyncio.gather(*jobs) == [0.2, 0.2, 0.2]
+    timings = pool.get_status()["jobs"]["_sleep_job"]
+    assert timings["offloaded"] == 3
+    assert timings["queue"]["max_ms"] >= 300
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_jobs_keep_their_slot_until_done():
+    """A caller's deadline does not free the slot while the worker still runs the job"""
+    pool = ValidationPool(max_workers=1, inline_threshold=0, max_pending=1)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(pool.run(_sleep_job, 0.3, size=1), 0.05)
+    assert pool.in_flight == 1
+
+    second = asyncio.create_task(pool.run(_sleep_job, 0, size=1))
+    await asyncio.sleep(0.05)
+    assert pool.waiting == 1 and pool.queue_depth == 1
+
+    assert await second == 0
+    assert pool.in_flight == 0 and pool.waiting == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_arguments_fall_back_inline():
+    """A job that cannot be sent to a worker still runs"""
+    pool = ValidationPool(max_workers=1, inline_threshold=10)
+    assert await pool.run(len, [lambda: None], size=100) == 1
+
+    status = pool.get_status()
+    assert status["fallbacks"] == 1
+    assert status["jobs"]["len"]["inline"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_job_errors_propagate_without_an_inline_rerun():
+    """An exception raised by the job in a worker reaches the caller; the loop never re-runs it"""
+    pool = ValidationPool(max_workers=1, inline_threshold=10)
+    with pytest.raises(ValueError, match="bad payload of 100 characters"):
+        await pool.run(_failing_job, "x" * 100, size=100)
+
+    status = pool.get_status()
+    assert status["fallbacks"] == 0
+    assert status["jobs"]["_failing_job"]["inline"] == 0
+    assert status["in_flight"] == 0
+    pool.shutdown()